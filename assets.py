@@ -0,0 +1,95 @@
+"""Decoded image and font cache for the renderers.
+
+Banner and marks-board renders used to re-open, decode, convert and resize the
+same handful of files from ``resources/`` on every call, and build a fresh
+``ImageFont.truetype`` for every size they tried. ``AssetRegistry`` does that
+work once per file and variant and hands back the result:
+
+* ``image()`` returns the shared, decoded image — paste from it, never draw on
+  it. ``canvas()`` returns a private copy to draw on.
+* ``font()`` returns a shared ``FreeTypeFont`` per (path, size).
+
+Each entry remembers the file's mtime and size; a lookup ``stat``s the file
+and reloads it if either changed, so swapping art in ``resources/`` needs no
+restart. Render workers are forked from the bot process, so whatever the bot
+warmed before the first render is inherited by every worker.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable
+
+from PIL import Image, ImageFont
+
+
+Resample = Image.Resampling.LANCZOS
+
+
+def _signature(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class AssetRegistry:
+    def __init__(self):
+        # key -> (file signature, decoded value)
+        self._entries: dict[tuple, tuple[tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def _get(self, key: tuple, path: str, loader: Callable[[], Any]) -> Any:
+        signature = _signature(path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            value = loader()
+            self._entries[key] = (signature, value)
+            self.loads += 1
+            return value
+
+    def image(
+        self,
+        path: str,
+        *,
+        mode: str = "RGBA",
+        resize: tuple[int, int] | None = None,
+        thumbnail: tuple[int, int] | None = None,
+    ) -> Image.Image:
+        """Decoded (and optionally resized) image, shared between callers — treat as read-only."""
+        def load() -> Image.Image:
+            with Image.open(path) as source:
+                image = source.convert(mode)
+            if resize is not None:
+                image = image.resize(resize, Resample)
+            if thumbnail is not None:
+                image.thumbnail(thumbnail)
+            # Mostly-paste sources: make sure pixel data is loaded before sharing.
+            image.load()
+            return image
+
+        return self._get(("image", path, mode, resize, thumbnail), path, load)
+
+    def canvas(self, path: str, *, mode: str = "RGBA") -> Image.Image:
+        """Private copy of an image, safe to draw on."""
+        return self.image(path, mode=mode).copy()
+
+    def font(self, path: str, size: int) -> ImageFont.FreeTypeFont:
+        return self._get(("font", path, size), path, lambda: ImageFont.truetype(path, size))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+assets = AssetRegistry()
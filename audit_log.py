@@ -0,0 +1,184 @@
+"""Buffered writer for the ``logs`` audit table.
+
+``log_command`` used to cost one write transaction (and one commit) per
+audited action. It now only appends a row to an in-memory queue;
+``AuditLog`` drains the queue in a background task every
+``AUDIT_FLUSH_INTERVAL_SECONDS`` (sooner once ``AUDIT_BATCH_SIZE`` rows are
+waiting) and inserts each batch with one ``executemany`` in one transaction.
+
+The queue holds at most ``AUDIT_QUEUE_MAX`` rows. When it is full,
+``AUDIT_OVERFLOW`` decides what is lost: ``drop_oldest`` (the default)
+discards the oldest queued row, ``drop_newest`` discards the incoming one.
+Either way ``dropped`` counts it, so audit loss is visible rather than
+silent. A failed flush puts its rows back at the front of the queue.
+
+``close()`` stops the task and flushes whatever is left; the bot awaits it on
+shutdown. Set ``AUDIT_LOG_DB`` to a separate file so audit inserts never wait
+behind gameplay writes; by default the rows go to the main database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+from collections import deque
+from typing import Any
+
+from database import DB_PATH, Database, get_database
+
+
+AUDIT_LOG_DB = os.getenv("AUDIT_LOG_DB", DB_PATH)
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "2"))
+AUDIT_OVERFLOW = os.getenv("AUDIT_OVERFLOW", "drop_oldest")
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+# user, command, game_name, user_id, location, extra
+AuditRow = tuple[str, str, str | None, str, str, str | None]
+
+INSERT_SQL = """
+    INSERT INTO logs (user, command, game_name, user_id, location, extra)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def create_audit_log_table(conn: sqlite3.Connection) -> None:
+    """The ``logs`` table as it looks after migration 3; used by init_schema and for a standalone log file."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user TEXT NOT NULL,
+            command TEXT NOT NULL,
+            game_name TEXT,
+            user_id TEXT,
+            location TEXT,
+            extra TEXT
+        )
+    """)
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: list[AuditRow]) -> None:
+    conn.executemany(INSERT_SQL, rows)
+
+
+class AuditLog:
+    def __init__(
+        self,
+        db: Database,
+        *,
+        max_queue: int = AUDIT_QUEUE_MAX,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        overflow: str = AUDIT_OVERFLOW,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"AUDIT_OVERFLOW must be one of {OVERFLOW_POLICIES}, not {overflow!r}")
+        self.db = db
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self._queue: deque[AuditRow] = deque()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._closing = False
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    def record(self, *row: Any) -> None:
+        """Queue one row (see ``AuditRow``); never blocks and never touches the database."""
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            self._queue.popleft()
+        self._queue.append(row)
+        if self._wakeup is not None and len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the background flusher on the running loop (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="audit-log-flusher")
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Audit log flush failed ({len(self._queue)} rows queued): {e!r}")
+
+    async def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            written = 0
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                try:
+                    await self.db.write(_insert_rows, batch)
+                except Exception:
+                    # The write rolled back, so the batch can be retried.
+                    self.failed_flushes += 1
+                    self._requeue(batch)
+                    raise
+                written += len(batch)
+            self.written += written
+            return written
+
+    def _requeue(self, batch: list[AuditRow]) -> None:
+        # Put the batch back in order, ahead of anything recorded since, and
+        # re-apply the capacity limit with the same policy.
+        self._queue.extendleft(reversed(batch))
+        while len(self._queue) > self.max_queue:
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                self._queue.pop()
+            else:
+                self._queue.popleft()
+
+    async def close(self) -> None:
+        """Stop the flusher and write out the remaining rows."""
+        # Not cancelled: a cancelled flush could not stop its write in the
+        # db thread, and requeueing that batch would log it twice.
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+_audit_log: AuditLog | None = None
+
+
+def get_audit_log() -> AuditLog:
+    global _audit_log
+    if _audit_log is None:
+        db = get_database(AUDIT_LOG_DB)
+        if os.path.abspath(AUDIT_LOG_DB) != os.path.abspath(DB_PATH):
+            db.write_sync(create_audit_log_table)
+        _audit_log = AuditLog(db)
+    return _audit_log
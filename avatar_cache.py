@@ -0,0 +1,153 @@
+"""Cache of users' banner avatars, keyed by Discord avatar hash.
+
+Every /generatecard used to download the full avatar, decode it, resize it
+and mask it into a circle. A Discord avatar URL names the image by its hash
+(``/avatars/{user_id}/{hash}.png``, or the guild-avatar equivalent), so the
+same URL path always means the same picture and a changed avatar means a new
+key. ``AvatarCache`` keeps the finished product — the circular AVATAR_SIZE
+RGBA as PNG bytes, ready for the renderer:
+
+* an in-memory LRU of the most recent ``AVATAR_CACHE_MAX_ENTRIES`` avatars;
+* behind it, one small PNG per key under ``AVATAR_CACHE_DIR``, pruned to the
+  newest ``AVATAR_DISK_MAX_FILES``.
+
+Misses are fetched asynchronously, and concurrent cards for the same avatar
+share a single download.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from banner import prepare_avatar
+from singleflight import SingleFlight
+from web_client import fetch_bytes
+
+
+AVATAR_CACHE_DIR = os.getenv("AVATAR_CACHE_DIR", os.path.join("cache", "avatars"))
+AVATAR_CACHE_MAX_ENTRIES = int(os.getenv("AVATAR_CACHE_MAX_ENTRIES", "512"))
+AVATAR_DISK_MAX_FILES = int(os.getenv("AVATAR_DISK_MAX_FILES", "5000"))
+PRUNE_EVERY = 100
+
+
+def avatar_key(avatar_url: str) -> str:
+    """The URL path without extension: user (and guild) id plus avatar hash."""
+    path = urlsplit(avatar_url).path
+    return os.path.splitext(path)[0].strip("/")
+
+
+def _encode_avatar(raw: bytes) -> bytes:
+    buf = io.BytesIO()
+    prepare_avatar(raw).save(buf, "PNG")
+    return buf.getvalue()
+
+
+class AvatarCache:
+    def __init__(
+        self,
+        directory: str = AVATAR_CACHE_DIR,
+        *,
+        max_entries: int = AVATAR_CACHE_MAX_ENTRIES,
+        max_files: int = AVATAR_DISK_MAX_FILES,
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._inflight = SingleFlight()
+        self._writes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".png")
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return None
+        # mtime doubles as "last used" for pruning.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+        self._writes += 1
+        if self._writes % PRUNE_EVERY == 0:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".png"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        pass
+        if len(entries) <= self.max_files:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    async def get(self, avatar_url: str) -> bytes | None:
+        """Circular AVATAR_SIZE avatar as PNG bytes, or None if it could not be downloaded."""
+        key = avatar_key(avatar_url)
+        data = self._memory.get(key)
+        if data is not None:
+            self.memory_hits += 1
+            self._memory.move_to_end(key)
+            return data
+        return await self._inflight.run(key, self._load, key, avatar_url)
+
+    async def _load(self, key: str, avatar_url: str) -> bytes | None:
+        data = await asyncio.to_thread(self._read_disk, key)
+        if data is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            raw = await fetch_bytes(avatar_url)
+            if raw is None:
+                return None
+            data = await asyncio.to_thread(_encode_avatar, raw)
+            await asyncio.to_thread(self._write_disk, key, data)
+        self._remember(key, data)
+        return data
+
+
+_avatar_cache: AvatarCache | None = None
+
+
+def get_avatar_cache() -> AvatarCache:
+    global _avatar_cache
+    if _avatar_cache is None:
+        _avatar_cache = AvatarCache()
+    return _avatar_cache
@@ -0,0 +1,63 @@
+"""A–Z hunt list candidate selection.
+
+Filling an A–Z list used to reselect the user's whole eligible backlog once
+per letter. ``az_candidates`` reads it once and buckets every title by the
+first letter of its normalised form; ``pick_az_games`` then fills any set of
+letters from those buckets in one pass.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import string
+from typing import Iterable
+
+
+LETTERS = string.ascii_uppercase
+
+
+def normalise_title_for_az(title: str) -> str:
+    """
+    Normalises a game title for A–Z challenges by removing common
+    leading articles like 'The ' and 'A '.
+    """
+    if not title:
+        return title
+
+    t = title.strip()
+
+    for prefix in ("the ", "a "):
+        if t.lower().startswith(prefix):
+            return t[len(prefix):].lstrip()
+
+    return t
+
+
+def bucket_by_letter(game_names: Iterable[str]) -> dict[str, list[str]]:
+    buckets: dict[str, list[str]] = {}
+    for game_name in game_names:
+        normalised = normalise_title_for_az(game_name)
+        if normalised:
+            buckets.setdefault(normalised[0].upper(), []).append(game_name)
+    return buckets
+
+
+def az_candidates(conn: sqlite3.Connection, user_id: str) -> dict[str, list[str]]:
+    """Eligible (not started / in progress) backlog titles, bucketed by A–Z letter."""
+    rows = conn.execute('''
+        SELECT game_name
+        FROM solo_backlogs
+        WHERE user_id = ?
+          AND status IN ("not started", "in progress")
+    ''', (user_id,))
+    return bucket_by_letter(row[0] for row in rows)
+
+
+def pick_az_games(buckets: dict[str, list[str]], letters: Iterable[str] = LETTERS) -> dict[str, str | None]:
+    """One random candidate per letter, or None (NA) when the bucket is empty."""
+    picks = {}
+    for letter in letters:
+        candidates = buckets.get(letter.upper())
+        picks[letter] = random.choice(candidates) if candidates else None
+    return picks
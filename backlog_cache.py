@@ -0,0 +1,160 @@
+"""Per-user cache of ``solo_backlogs`` rows.
+
+The solo-hunt autocompletes and the Next10 / A–Z renderers ask about the same
+user's backlog many times within a few seconds. The cache loads a user's rows
+once into a ``UserBacklog`` (names grouped by status plus a lookup by the
+stored ``normalized_game_name`` key, see backlog_keys) and answers from memory until a write path calls
+``invalidate`` for that user.
+
+Entries are evicted least-recently-used once either the user count or the
+estimated memory footprint goes over its cap.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+
+from backlog_keys import normalize_game_name
+from database import Database, get_database
+
+
+MAX_USERS = int(os.getenv("BACKLOG_CACHE_MAX_USERS", "2000"))
+MAX_BYTES = int(os.getenv("BACKLOG_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+AUTOCOMPLETE_LIMIT = 25
+
+# Rough per-row overhead (tuple, dict slot, list slot) on top of the strings.
+_ROW_OVERHEAD = 200
+
+
+class UserBacklog:
+    __slots__ = ("by_status", "by_key", "completed_recent", "size")
+
+    def __init__(self, rows: list[tuple[str, str, str | None, str]]):
+        self.by_status: dict[str, list[str]] = {}
+        self.by_key: dict[str, tuple[str, str]] = {}
+        size = sys.getsizeof(self)
+        for name, status, _, key in rows:
+            self.by_status.setdefault(status, []).append(name)
+            # The key is unique per user, so each row has its own entry.
+            self.by_key[key] = (name, status)
+            size += _ROW_OVERHEAD + sys.getsizeof(name) + sys.getsizeof(key)
+        for names in self.by_status.values():
+            names.sort()
+        # Same order as the /generatecard picker: newest completion first.
+        completed = sorted(
+            ((name, done) for name, status, done, _ in rows if status == "completed"),
+            key=lambda row: row[0].casefold(),
+        )
+        completed.sort(key=lambda row: row[1] or "", reverse=True)
+        completed.sort(key=lambda row: row[1] is None)
+        self.completed_recent = [name for name, _ in completed]
+        self.size = size
+
+    def status_of(self, game_name: str) -> str | None:
+        row = self.by_key.get(normalize_game_name(game_name))
+        return row[1] if row else None
+
+    def has(self, game_name: str) -> bool:
+        return normalize_game_name(game_name) in self.by_key
+
+    def is_completed(self, game_name: str) -> bool:
+        return self.status_of(game_name) == "completed"
+
+    def names(self, status: str) -> list[str]:
+        return self.by_status.get(status, [])
+
+    def search(self, status: str, current: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+        """Names with ``status`` containing ``current`` (case-insensitive), in name order."""
+        return _filter(self.names(status), current, limit)
+
+    def search_completed(self, current: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+        return _filter(self.completed_recent, current, limit)
+
+
+def _filter(names: list[str], current: str, limit: int) -> list[str]:
+    needle = (current or "").casefold()
+    if not needle:
+        return names[:limit]
+    results = []
+    for name in names:
+        if needle in name.casefold():
+            results.append(name)
+            if len(results) == limit:
+                break
+    return results
+
+
+def _load_rows(conn: sqlite3.Connection, user_id: str) -> list[tuple[str, str, str | None, str]]:
+    return [
+        (row[0], row[1], row[2], row[3])
+        for row in conn.execute(
+            "SELECT game_name, status, completion_date, normalized_game_name FROM solo_backlogs WHERE user_id = ?",
+            (user_id,),
+        )
+    ]
+
+
+class BacklogCache:
+    def __init__(self, db: Database, *, max_users: int = MAX_USERS, max_bytes: int = MAX_BYTES):
+        self.db = db
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, UserBacklog] = OrderedDict()
+        self._bytes = 0
+        # Bumped by every invalidate so a load that raced a write is not stored.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, user_id: str | int) -> UserBacklog:
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        generation = self._generation
+        entry = UserBacklog(await self.db.read(_load_rows, key))
+        if generation == self._generation:
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key: str, entry: UserBacklog) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_users or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def invalidate(self, user_id: str | int) -> None:
+        self._generation += 1
+        entry = self._entries.pop(str(user_id), None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._bytes = 0
+
+
+_cache: BacklogCache | None = None
+
+
+def get_backlog_cache() -> BacklogCache:
+    """Return the process-wide cache over the shared database."""
+    global _cache
+    if _cache is None:
+        _cache = BacklogCache(get_database())
+    return _cache
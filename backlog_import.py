@@ -0,0 +1,106 @@
+"""Bulk solo-backlog import used by the /newmasshunts modal.
+
+Each pasted name is normalised once, and only the user's rows holding one
+of those keys are read, through the (user_id, normalized_game_name) unique
+index in chunks of ``LOOKUP_CHUNK`` — never the whole backlog. The paste is
+diffed against them in memory; new games are then inserted ``INSERT_CHUNK``
+rows per statement and status moves applied by id list, inside the caller's
+write transaction. A paste of a few hundred games therefore costs a handful
+of statements instead of two per game.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Iterable, NamedTuple
+
+from backlog_keys import normalize_game_name
+
+
+# Keys (or row ids) per lookup and move statement, and rows per insert
+# statement (five parameters each); all stay under SQLite's historical limit
+# of 999 bound parameters.
+LOOKUP_CHUNK = 500
+INSERT_CHUNK = 100
+
+
+class ImportReport(NamedTuple):
+    added_ns: list[str]
+    added_ip: list[str]
+    moved_to_ns: list[str]
+    moved_to_ip: list[str]
+    unchanged: list[str]
+
+
+def import_backlog(
+    conn: sqlite3.Connection,
+    user_id: str | int,
+    user_name: str,
+    not_started: Iterable[str],
+    in_progress: Iterable[str],
+) -> ImportReport:
+    """Add or move each game to its target status; callers dedupe the two lists first."""
+    pasted = [
+        (normalize_game_name(game_display), game_display, target_status)
+        for games, target_status in ((not_started, "not started"), (in_progress, "in progress"))
+        for game_display in games
+    ]
+
+    # name key -> (id, name, status) of the user's row, looked up by
+    # solo_backlogs.normalized_game_name for the pasted keys only.
+    existing: dict[str, tuple[int | None, str, str]] = {}
+    # Sorted, so each chunk walks the index in order.
+    keys = sorted({key for key, _, _ in pasted})
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        chunk = keys[start:start + LOOKUP_CHUNK]
+        for row_id, game_name, status, key in conn.execute(
+            f"""SELECT id, game_name, status, normalized_game_name FROM solo_backlogs
+                WHERE user_id = ? AND normalized_game_name IN ({", ".join("?" * len(chunk))})""",
+            (user_id, *chunk),
+        ):
+            existing[key] = (row_id, game_name, status)
+
+    report = ImportReport([], [], [], [], [])
+    inserts = []
+    moves: dict[str, list[int]] = {}
+
+    for key, game_display, target_status in pasted:
+        if target_status == "not started":
+            added_list, moved_list = report.added_ns, report.moved_to_ns
+        else:
+            added_list, moved_list = report.added_ip, report.moved_to_ip
+        row = existing.get(key)
+        if row is None:
+            inserts.append((user_id, user_name, game_display, key, target_status))
+            existing[key] = (None, game_display, target_status)
+            added_list.append(game_display)
+            continue
+
+        row_id, existing_name, existing_status = row
+        if existing_status != target_status:
+            if row_id is not None:
+                moves.setdefault(target_status, []).append(row_id)
+            existing[key] = (row_id, existing_name, target_status)
+            moved_list.append(existing_name)
+        else:
+            report.unchanged.append(existing_name)
+
+    # Multi-row statements rather than executemany: SQLite keeps the
+    # AUTOINCREMENT counter and the statement setup per statement, not per row.
+    for start in range(0, len(inserts), INSERT_CHUNK):
+        chunk = inserts[start:start + INSERT_CHUNK]
+        conn.execute(
+            f"""INSERT INTO solo_backlogs (user_id, user_name, game_name, normalized_game_name, status)
+                VALUES {", ".join(["(?, ?, ?, ?, ?)"] * len(chunk))}""",
+            [value for row in chunk for value in row],
+        )
+    for target_status, row_ids in moves.items():
+        row_ids.sort()
+        for start in range(0, len(row_ids), LOOKUP_CHUNK):
+            chunk = row_ids[start:start + LOOKUP_CHUNK]
+            conn.execute(
+                f"""UPDATE solo_backlogs SET status = ?, user_name = ?
+                    WHERE id IN ({", ".join("?" * len(chunk))})""",
+                (target_status, user_name, *chunk),
+            )
+    return report
@@ -0,0 +1,120 @@
+"""Normalised game-name key stored on ``solo_backlogs``.
+
+Goals match their items to a user's backlog by ``normalize_game_name``
+rather than by exact name, so "Spider-Man (PS5)" and "spider man (ps5)"
+are the same hunt. Doing that in Python meant loading and normalising the
+user's whole backlog on every goal view. Instead, each backlog row carries
+the key in ``normalized_game_name``, and a unique index on
+(user_id, normalized_game_name) turns the matching into an indexed join.
+
+Whatever writes ``solo_backlogs`` sets the key along with ``game_name``:
+/newhunt, the /newmasshunts import and the GoalSystem "add missing" button
+on insert. Any command that renames a backlog row must update both columns.
+The unique index also means a user can no longer hold two rows that differ
+only in case or punctuation: the writers dedupe on the key, and /newhunt
+lets the index turn a repeat into a no-op.
+
+``add_backlog_name_keys`` is the migration step: it adds the column, keys
+every row and builds the index. Files that already hold such
+near-duplicates have them merged first, in the same transaction, by
+``merge_backlog_name_duplicates``:
+
+* the row kept is the furthest along — completed before in progress before
+  not started — then the oldest;
+* the kept row takes completion_date, rating and comments from the others,
+  in that same order, where its own are empty;
+* goal items linked to a merged row, and Next10 / A–Z entries naming one,
+  are pointed at the kept row;
+* the other rows are deleted.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import unicodedata
+
+
+STATUS_PREFERENCE = {"completed": 0, "in progress": 1, "not started": 2}
+
+
+# Everything but word characters, whitespace and the parentheses around
+# platform labels; curly quotes and dashes go with the rest of the punctuation.
+_NOT_KEPT = re.compile(r"[^\w\s()]")
+
+
+def normalize_game_name(value: str) -> str:
+    """Return a conservative comparison key without losing platform labels."""
+    value = unicodedata.normalize("NFKC", value or "").casefold()
+    return " ".join(_NOT_KEPT.sub(" ", value).split())
+
+
+MERGED_COLUMNS = ("completion_date", "rating", "comments")
+
+
+def merge_backlog_name_duplicates(conn: sqlite3.Connection) -> int:
+    """Fold rows that share a user and key into one and key every row; returns rows merged away."""
+    groups: dict[tuple[str, str], list[tuple]] = {}
+    for row in conn.execute(
+        f"SELECT id, user_id, game_name, status, {', '.join(MERGED_COLUMNS)} FROM solo_backlogs"
+    ).fetchall():
+        groups.setdefault((row[1], normalize_game_name(row[2])), []).append(row)
+    # The list and goal tables may not exist yet in this file.
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    keys, merged = [], []
+    for (user_id, key), rows in groups.items():
+        rows.sort(key=lambda row: (STATUS_PREFERENCE.get(row[3], len(STATUS_PREFERENCE)), row[0]))
+        kept, others = rows[0], rows[1:]
+        keys.append((key, kept[0]))
+        if not others:
+            continue
+        fill = {}
+        for offset, column in enumerate(MERGED_COLUMNS, start=4):
+            if kept[offset] is None:
+                value = next((row[offset] for row in others if row[offset] is not None), None)
+                if value is not None:
+                    fill[column] = value
+        if fill:
+            conn.execute(
+                f"UPDATE solo_backlogs SET {', '.join(f'{column} = ?' for column in fill)} WHERE id = ?",
+                (*fill.values(), kept[0]),
+            )
+        for row_id, _, game_name, *_ in others:
+            if "user_goal_items" in tables:
+                conn.execute(
+                    "UPDATE user_goal_items SET linked_solo_backlog_id = ? WHERE linked_solo_backlog_id = ?",
+                    (kept[0], row_id),
+                )
+            if game_name != kept[2] and "next10_items" in tables:
+                # next10_items is unique per (user, name): an entry for the
+                # kept name already covers the merged one.
+                conn.execute(
+                    "UPDATE OR IGNORE next10_items SET game_name = ? WHERE user_id = ? AND game_name = ?",
+                    (kept[2], user_id, game_name),
+                )
+                conn.execute("DELETE FROM next10_items WHERE user_id = ? AND game_name = ?", (user_id, game_name))
+            if game_name != kept[2] and "az_items" in tables:
+                conn.execute(
+                    "UPDATE az_items SET game_name = ? WHERE user_id = ? AND game_name = ?",
+                    (kept[2], user_id, game_name),
+                )
+            merged.append((row_id,))
+
+    conn.executemany("DELETE FROM solo_backlogs WHERE id = ?", merged)
+    conn.executemany("UPDATE solo_backlogs SET normalized_game_name = ? WHERE id = ?", keys)
+    return len(merged)
+
+
+def add_backlog_name_keys(conn: sqlite3.Connection) -> None:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(solo_backlogs)")}
+    if not existing:
+        # No solo_backlogs table in this file.
+        return
+    if "normalized_game_name" not in existing:
+        conn.execute("ALTER TABLE solo_backlogs ADD COLUMN normalized_game_name TEXT")
+    merge_backlog_name_duplicates(conn)
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_solo_backlogs_user_name_key
+        ON solo_backlogs (user_id, normalized_game_name)
+    """)
@@ -0,0 +1,150 @@
+"""Completion banner rendering for /generatecard.
+
+Everything in here is plain, synchronous Pillow work with no Discord, database
+or network access, so ``render_completion_banner`` can run in a worker process
+(see ``render_pool``). The bot fetches the avatar and cover bytes up front and
+hands them over with the text to draw; the finished card comes back as
+encoded bytes (see ``image_encode``).
+"""
+
+from __future__ import annotations
+
+import io
+import os
+
+from PIL import Image, ImageDraw
+
+from assets import assets
+from image_encode import CARD_ENCODER, EncodedImage, EncoderSettings, encode_image
+from text_render import draw_outlined_text, fit_font
+
+
+# ==== Resource Paths ====
+RESOURCE_PATH = "resources/"
+DEFAULT_BACKGROUND = "background.jpg"
+FONT_PATH = os.path.join(RESOURCE_PATH, "MedievalSharp.ttf")
+
+# ==== Font Sizes ====
+GAME_NAME_FONT_SIZE = 72
+TEXT_FONT_SIZE = 48
+FOOTER_FONT_SIZE = 30
+
+# ==== Avatar Settings ====
+AVATAR_SIZE = (100, 100)
+AVATAR_POSITION = (100, 150)
+
+# Circular crop for the avatar, built once
+AVATAR_MASK = Image.new("L", AVATAR_SIZE, 0)
+ImageDraw.Draw(AVATAR_MASK).ellipse((0, 0, *AVATAR_SIZE), fill=255)
+
+# ==== Game Cover Settings ====
+COVER_SIZE = (345, 518)
+COVER_POSITION = (850, 110)
+
+# ==== Overlay Settings ====
+ICON_SIZE = (50, 50)
+COMP_BANNER_SIZE = (400, 70)
+
+
+def prepare_avatar(raw: bytes) -> Image.Image:
+    """Decode an avatar download into the AVATAR_SIZE circle the banner pastes."""
+    with Image.open(io.BytesIO(raw)) as source:
+        avatar = source.convert("RGBA").resize(AVATAR_SIZE, Image.LANCZOS)
+    # The mask replaces the avatar's own alpha, as pasting through it did.
+    avatar.putalpha(AVATAR_MASK)
+    return avatar
+
+
+def warm_banner_assets():
+    """Decode every banner asset up front so forked render workers inherit them."""
+    for name in sorted(os.listdir(RESOURCE_PATH)):
+        if name.startswith("background") and name.endswith(".jpg"):
+            assets.image(os.path.join(RESOURCE_PATH, name))
+    for name in ("xbox_logo.png", "calendar_icon.png"):
+        assets.image(os.path.join(RESOURCE_PATH, name), thumbnail=ICON_SIZE)
+    assets.image(os.path.join(RESOURCE_PATH, "completion_banner.png"), resize=COMP_BANNER_SIZE)
+    for size in (TEXT_FONT_SIZE, *range(GAME_NAME_FONT_SIZE, 39, -2)):
+        assets.font(FONT_PATH, size)
+
+
+# ==== Banner Generation ====
+def compose_completion_banner(
+    game_name: str,
+    user_name: str,
+    completion_date: str,
+    avatar_bytes: bytes,
+    cover_bytes: bytes | None,
+    genre: str | None,
+) -> Image.Image:
+    """Draw the banner; raises on failure."""
+    # Background image
+    background_file = f"background_{genre.lower()}.jpg" if genre else DEFAULT_BACKGROUND
+    background_path = os.path.join(RESOURCE_PATH, background_file)
+    if not os.path.exists(background_path):
+        background_path = os.path.join(RESOURCE_PATH, DEFAULT_BACKGROUND)
+
+    background = assets.canvas(background_path)
+
+    # Icons
+    xbox_logo = assets.image(os.path.join(RESOURCE_PATH, "xbox_logo.png"), thumbnail=ICON_SIZE)
+    calendar_icon = assets.image(os.path.join(RESOURCE_PATH, "calendar_icon.png"), thumbnail=ICON_SIZE)
+
+    # Avatar: normally already circular from the avatar cache
+    avatar = Image.open(io.BytesIO(avatar_bytes))
+    avatar = avatar.convert("RGBA") if avatar.size == AVATAR_SIZE else prepare_avatar(avatar_bytes)
+
+    # Game cover
+    game_cover = None
+    if cover_bytes:
+        game_cover = Image.open(io.BytesIO(cover_bytes)).convert("RGBA")
+        if game_cover.size != COVER_SIZE:
+            game_cover = game_cover.resize(COVER_SIZE, Image.LANCZOS)
+
+    # Completion ribbon
+    comp_banner = assets.image(os.path.join(RESOURCE_PATH, "completion_banner.png"), resize=COMP_BANNER_SIZE)
+
+    # Create drawing context
+    draw = ImageDraw.Draw(background)
+    text_font = assets.font(FONT_PATH, TEXT_FONT_SIZE)
+
+    # Get scaled game name font and its actual size
+    game_font, actual_font_size = fit_font(game_name, FONT_PATH, GAME_NAME_FONT_SIZE, 550)
+
+    # Define element positions
+    positions = {
+        "game_name": (215, 150 + actual_font_size // 2),  # Vertical adjustment for centering
+        "xbox_logo": (125, 280),
+        "user_name": (185, 275),
+        "calendar_icon": (125, 360),
+        "completion_date": (185, 355),
+        "comp_banner": (125, 425),
+    }
+
+    # Draw elements
+    draw_outlined_text(background, draw, positions["game_name"], game_name, game_font)
+    background.paste(xbox_logo, positions["xbox_logo"], xbox_logo)
+    draw_outlined_text(background, draw, positions["user_name"], user_name, text_font)
+    background.paste(calendar_icon, positions["calendar_icon"], calendar_icon)
+    draw_outlined_text(background, draw, positions["completion_date"], completion_date, text_font)
+    background.paste(comp_banner, positions["comp_banner"], comp_banner)
+    background.paste(avatar, AVATAR_POSITION, avatar)
+
+    # Paste game cover if available
+    if game_cover:
+        background.paste(game_cover, COVER_POSITION, game_cover)
+
+    return background
+
+
+def render_completion_banner(
+    game_name: str,
+    user_name: str,
+    completion_date: str,
+    avatar_bytes: bytes,
+    cover_bytes: bytes | None,
+    genre: str | None,
+    encoder: EncoderSettings = CARD_ENCODER,
+) -> EncodedImage:
+    """Draw the banner and encode it for upload; raises on failure."""
+    banner = compose_completion_banner(game_name, user_name, completion_date, avatar_bytes, cover_bytes, genre)
+    return encode_image(banner, encoder)
@@ -0,0 +1,114 @@
+"""Banner asset loading: decode per render vs the shared asset registry.
+
+Times, per /generatecard render:
+
+* decode — loading the background, icons, completion ribbon and fonts the
+  old way (``Image.open`` + convert + resize + ``truetype`` every call)
+  against ``assets`` lookups once warm;
+* render — the whole ``render_completion_banner`` with a cold registry
+  (cleared before every call, i.e. the old cost) against a warm one.
+
+Uses the real files in ``resources/`` and a synthetic avatar and cover.
+
+    python benchmarks/bench_assets.py [--iterations 30] [--genre rpg]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # RESOURCE_PATH is relative
+
+from PIL import Image, ImageFont  # noqa: E402
+
+from assets import assets  # noqa: E402
+from banner import (  # noqa: E402
+    COMP_BANNER_SIZE, FONT_PATH, GAME_NAME_FONT_SIZE, ICON_SIZE, RESOURCE_PATH, TEXT_FONT_SIZE,
+    render_completion_banner,
+)
+
+
+def legacy_decode(background_path: str) -> None:
+    Image.open(background_path).convert("RGBA")
+    for name in ("xbox_logo.png", "calendar_icon.png"):
+        Image.open(os.path.join(RESOURCE_PATH, name)).convert("RGBA").thumbnail(ICON_SIZE)
+    Image.open(os.path.join(RESOURCE_PATH, "completion_banner.png")).convert("RGBA").resize(
+        COMP_BANNER_SIZE, Image.LANCZOS
+    )
+    ImageFont.truetype(FONT_PATH, TEXT_FONT_SIZE)
+    ImageFont.truetype(FONT_PATH, GAME_NAME_FONT_SIZE)
+
+
+def registry_decode(background_path: str) -> None:
+    assets.canvas(background_path)
+    for name in ("xbox_logo.png", "calendar_icon.png"):
+        assets.image(os.path.join(RESOURCE_PATH, name), thumbnail=ICON_SIZE)
+    assets.image(os.path.join(RESOURCE_PATH, "completion_banner.png"), resize=COMP_BANNER_SIZE)
+    assets.font(FONT_PATH, TEXT_FONT_SIZE)
+    assets.font(FONT_PATH, GAME_NAME_FONT_SIZE)
+
+
+def timed(fn, iterations: int, before=None) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"  {label:<10} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--genre", default=None)
+    args = parser.parse_args()
+
+    background_path = os.path.join(RESOURCE_PATH, f"background_{args.genre}.jpg" if args.genre else "background.jpg")
+
+    def png_bytes(size, colour):
+        buf = io.BytesIO()
+        Image.new("RGB", size, colour).save(buf, "PNG")
+        return buf.getvalue()
+
+    avatar = png_bytes((256, 256), "steelblue")
+    cover = png_bytes((600, 900), "darkred")
+
+    print("decode only")
+    report("legacy", timed(lambda: legacy_decode(background_path), args.iterations))
+    registry_decode(background_path)
+    report("registry", timed(lambda: registry_decode(background_path), args.iterations))
+
+    def render():
+        return render_completion_banner(
+            "The Legend of Zelda: Tears of the Kingdom", "benchmark_user", "2025-01-01",
+            avatar, cover, args.genre,
+        )
+
+    print("full render")
+    report("cold", timed(render, args.iterations, before=assets.clear))
+    assets.clear()
+    cold_bytes = Image.open(io.BytesIO(render().data)).tobytes()
+    report("warm", timed(render, args.iterations))
+    warm_bytes = Image.open(io.BytesIO(render().data)).tobytes()
+
+    print(f"identical output: {cold_bytes == warm_bytes}")
+    print(f"registry: {len(assets)} entries, {assets.loads} loads, {assets.hits} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Cost of audit logging: one committed INSERT per action vs the buffered writer.
+
+Simulates ``--actions`` audited commands, each followed by a small gameplay
+write on the same database, and reports wall time plus how long the event
+loop spent awaiting the log call:
+
+* direct — the old ``log_command``: ``db.execute`` (one transaction and
+  commit per row on the shared writer);
+* buffered — ``audit_log.AuditLog.record`` with the background flusher,
+  including the final flush on close.
+
+    python benchmarks/bench_audit_log.py [--actions 5000] [--separate-db]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audit_log import INSERT_SQL, AuditLog, create_audit_log_table  # noqa: E402
+from database import Database  # noqa: E402
+
+
+def setup(conn: sqlite3.Connection) -> None:
+    create_audit_log_table(conn)
+    conn.execute("CREATE TABLE IF NOT EXISTS counters (id INTEGER PRIMARY KEY, n INTEGER)")
+    conn.execute("INSERT OR IGNORE INTO counters VALUES (1, 0)")
+
+
+def gameplay(conn: sqlite3.Connection) -> None:
+    conn.execute("UPDATE counters SET n = n + 1 WHERE id = 1")
+
+
+def row(i: int) -> tuple:
+    return ("bench#0001", "finishhunt", f"Game {i}", "1", "GUILD:1", None)
+
+
+async def direct(db: Database, log_db: Database, actions: int) -> tuple[float, float]:
+    logging = 0.0
+    start = time.perf_counter()
+    for i in range(actions):
+        t = time.perf_counter()
+        await log_db.execute(INSERT_SQL, row(i))
+        logging += time.perf_counter() - t
+        await db.write(gameplay)
+    return time.perf_counter() - start, logging
+
+
+async def buffered(db: Database, log_db: Database, actions: int) -> tuple[float, float]:
+    audit = AuditLog(log_db, flush_interval=0.5)
+    audit.start()
+    logging = 0.0
+    start = time.perf_counter()
+    for i in range(actions):
+        t = time.perf_counter()
+        audit.record(*row(i))
+        logging += time.perf_counter() - t
+        await db.write(gameplay)
+    await audit.close()
+    assert audit.written == actions
+    return time.perf_counter() - start, logging
+
+
+async def run(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn in (("direct", direct), ("buffered", buffered)):
+            db = Database(os.path.join(tmp, f"{label}.db"))
+            log_db = Database(os.path.join(tmp, f"{label}_audit.db")) if args.separate_db else db
+            db.write_sync(setup)
+            log_db.write_sync(setup)
+            elapsed, logging = await fn(db, log_db, args.actions)
+            print(f"  {label:<9} {elapsed * 1000:>9.1f} ms total  {logging * 1000:>9.1f} ms awaiting the log  "
+                  f"{args.actions / elapsed:>8,.0f} actions/s")
+            db.close()
+            if log_db is not db:
+                log_db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actions", type=int, default=5_000)
+    parser.add_argument("--separate-db", action="store_true", help="write the audit rows to their own file")
+    args = parser.parse_args()
+    print(f"{args.actions:,} audited actions")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
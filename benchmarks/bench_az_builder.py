@@ -0,0 +1,126 @@
+"""A–Z list generation: per-letter selection vs single-pass bucketing.
+
+Builds a user with a large solo backlog (5,000 games by default) and times
+generating a full 26-letter A–Z list both ways:
+
+* legacy — the old ``pick_game_for_letter`` loop: one backlog scan and one
+  INSERT per letter;
+* bucketed — ``az_candidates`` + ``pick_az_games`` and one ``executemany``.
+
+    python benchmarks/bench_az_builder.py [--games 5000] [--iterations 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from az_builder import LETTERS, az_candidates, normalise_title_for_az, pick_az_games  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+
+USER_ID = "1"
+WORDS = ("The", "A", "Dark", "Halo", "Legend", "Quest", "Zero", "Night", "Iron", "Void", "Echo", "Ultra")
+
+
+def legacy_pick_game_for_letter(conn: sqlite3.Connection, user_id: str, letter: str) -> str | None:
+    rows = conn.execute('''
+        SELECT game_name
+        FROM solo_backlogs
+        WHERE user_id = ?
+          AND status IN ("not started", "in progress")
+    ''', (user_id,)).fetchall()
+    candidates = []
+    for (game_name,) in rows:
+        normalised = normalise_title_for_az(game_name)
+        if normalised and normalised[0].upper() == letter:
+            candidates.append(game_name)
+    return random.choice(candidates) if candidates else None
+
+
+def legacy_build(conn: sqlite3.Connection) -> None:
+    for letter in LETTERS:
+        game = legacy_pick_game_for_letter(conn, USER_ID, letter)
+        conn.execute(
+            "INSERT OR REPLACE INTO az_items (user_id, letter, game_name) VALUES (?, ?, ?)",
+            (USER_ID, letter, game),
+        )
+    conn.commit()
+
+
+def bucketed_build(conn: sqlite3.Connection) -> None:
+    picks = pick_az_games(az_candidates(conn, USER_ID), LETTERS)
+    conn.executemany(
+        "INSERT OR REPLACE INTO az_items (user_id, letter, game_name) VALUES (?, ?, ?)",
+        [(USER_ID, letter, game) for letter, game in picks.items()],
+    )
+    conn.commit()
+
+
+def setup(games: int, others: int, seed: int) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, game_name TEXT UNIQUE, platform TEXT);
+        CREATE TABLE user_games (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, user_name TEXT,
+                                 game_id INTEGER, platform TEXT);
+        CREATE TABLE solo_backlogs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL, user_name TEXT NOT NULL, game_name TEXT NOT NULL,
+            status TEXT DEFAULT 'not started', completion_date DATE, rating INTEGER, comments TEXT
+        );
+        CREATE TABLE az_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, letter TEXT NOT NULL,
+            game_name TEXT, completed INTEGER DEFAULT 0, completed_at TIMESTAMP, UNIQUE(user_id, letter)
+        );
+    """)
+
+    def title() -> str:
+        return f"{rng.choice(WORDS)} {rng.choice(LETTERS)}{rng.choice(WORDS).lower()} {rng.randint(1, 999)}"
+
+    statuses = ("not started", "in progress", "completed")
+    rows = [(USER_ID, "bench", title(), rng.choice(statuses)) for _ in range(games)]
+    rows += [(str(2 + i % 500), "other", title(), rng.choice(statuses)) for i in range(others)]
+    conn.executemany("INSERT INTO solo_backlogs (user_id, user_name, game_name, status) VALUES (?, ?, ?, ?)", rows)
+    apply_migrations(conn)
+    conn.commit()
+    return conn
+
+
+def run(label: str, fn, conn: sqlite3.Connection, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(conn)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"  {label:<9} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms   ({iterations} runs)")
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=5_000, help="backlog size for the benchmarked user")
+    parser.add_argument("--others", type=int, default=50_000, help="rows belonging to other users")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    conn = setup(args.games, args.others, args.seed)
+    print(f"A–Z list generation, {args.games:,}-game backlog ({args.others:,} other rows)")
+    legacy = run("legacy", legacy_build, conn, args.iterations)
+    bucketed = run("bucketed", bucketed_build, conn, args.iterations)
+    print(f"  speed-up  {legacy / bucketed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
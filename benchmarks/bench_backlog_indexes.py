@@ -0,0 +1,187 @@
+"""Before/after benchmark for the hot-lookup index pack (migration 1).
+
+Builds a throwaway database with a synthetic community backlog (1M
+``solo_backlogs`` rows by default), then runs the lookups that the bot's
+hottest commands issue. It prints each query's EXPLAIN QUERY PLAN and its
+p50/p99 latency, first on the bare tables and again after
+``apply_migrations``.
+
+    python benchmarks/bench_backlog_indexes.py [--rows 1000000] [--iterations 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backlog_keys import normalize_game_name  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+
+STATUSES = ("not started", "in progress", "completed")
+
+# (label, sql, params builder) — the same shapes main.py sends.
+QUERIES = [
+    (
+        "join_hunt: already hunting?",
+        "SELECT 1 FROM user_games WHERE user_id = ? AND game_id = ?",
+        lambda ctx: (ctx.user(), ctx.game_id()),
+    ),
+    (
+        "whohunts: hunters of a game",
+        "SELECT user_name FROM user_games WHERE game_id = ?",
+        lambda ctx: (ctx.game_id(),),
+    ),
+    (
+        "generatecard: completed row by name key",
+        "SELECT completion_date FROM solo_backlogs WHERE user_id = ? AND normalized_game_name = ? "
+        "AND status = 'completed' LIMIT 1",
+        lambda ctx: (ctx.user(), normalize_game_name(ctx.game_name())),
+    ),
+    (
+        "pick_game_for_letter / next10 pool",
+        "SELECT game_name FROM solo_backlogs WHERE user_id = ? AND status IN ('not started', 'in progress')",
+        lambda ctx: (ctx.user(),),
+    ),
+    (
+        "generatecard autocomplete",
+        "SELECT game_name FROM solo_backlogs WHERE user_id = ? AND status = 'completed' "
+        "AND game_name LIKE ? COLLATE NOCASE "
+        "ORDER BY completion_date IS NULL, completion_date DESC, game_name COLLATE NOCASE ASC LIMIT 25",
+        lambda ctx: (ctx.user(), "%a%"),
+    ),
+    (
+        "synclists: backlog row exists?",
+        "SELECT 1 FROM solo_backlogs WHERE user_id = ? AND normalized_game_name = ? LIMIT 1",
+        lambda ctx: (ctx.user(), normalize_game_name(ctx.game_name())),
+    ),
+]
+
+
+class Context:
+    def __init__(self, users: int, games: int, seed: int):
+        self.users = users
+        self.games = games
+        self.rng = random.Random(seed)
+
+    def user(self) -> str:
+        return str(100000 + self.rng.randrange(self.users))
+
+    def game_id(self) -> int:
+        return 1 + self.rng.randrange(self.games)
+
+    def game_name(self) -> str:
+        return f"Game {self.rng.randrange(self.games):06d}".upper()
+
+
+def build(path: str, rows: int, users: int, games: int, links: int, seed: int) -> None:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.executescript("""
+        CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, game_name TEXT UNIQUE, platform TEXT);
+        CREATE TABLE user_games (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, user_name TEXT,
+            game_id INTEGER, platform TEXT, FOREIGN KEY (game_id) REFERENCES games(id)
+        );
+        CREATE TABLE solo_backlogs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL, user_name TEXT NOT NULL, game_name TEXT NOT NULL,
+            status TEXT CHECK(status IN ('not started', 'in progress', 'completed')) DEFAULT 'not started',
+            completion_date DATE, rating INTEGER CHECK(rating BETWEEN 1 AND 5), comments TEXT,
+            normalized_game_name TEXT
+        );
+    """)
+    conn.executemany(
+        "INSERT INTO games (game_name) VALUES (?)",
+        ((f"Game {i:06d}",) for i in range(games)),
+    )
+
+    def backlog():
+        for _ in range(rows):
+            uid = 100000 + rng.randrange(users)
+            status = rng.choice(STATUSES)
+            done = f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if status == "completed" else None
+            name = f"Game {rng.randrange(games):06d}"
+            yield (str(uid), f"user{uid}", name, status, done, normalize_game_name(name))
+
+    # Keyed as the bot stores them; migration 4 merges the repeats the
+    # random draw produces before it builds the unique index.
+    conn.executemany(
+        """INSERT INTO solo_backlogs (user_id, user_name, game_name, status, completion_date, normalized_game_name)
+           VALUES (?, ?, ?, ?, ?, ?)""",
+        backlog(),
+    )
+    conn.executemany(
+        "INSERT INTO user_games (user_id, user_name, game_id) VALUES (?, ?, ?)",
+        (
+            (str(uid), f"user{uid}", 1 + rng.randrange(games))
+            for uid in (100000 + rng.randrange(users) for _ in range(links))
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def plan(conn: sqlite3.Connection, sql: str, params: tuple) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def measure(conn: sqlite3.Connection, ctx: Context, iterations: int) -> None:
+    for label, sql, params_for in QUERIES:
+        print(f"\n  {label}")
+        for step in plan(conn, sql, params_for(ctx)):
+            print(f"    plan: {step}")
+        timings = []
+        for _ in range(iterations):
+            params = params_for(ctx)
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p50 = statistics.median(timings)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"    p50 {p50:8.3f} ms   p99 {p99:8.3f} ms   ({iterations} runs)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="solo_backlogs rows")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--games", type=int, default=50_000)
+    parser.add_argument("--links", type=int, default=200_000, help="user_games rows")
+    parser.add_argument("--iterations", type=int, default=200, help="runs per query and phase")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        build(path, args.rows, args.users, args.games, args.links, args.seed)
+        print(f"Built {args.rows:,} backlog rows / {args.links:,} hunt links in {time.perf_counter() - start:.1f}s")
+
+        conn = sqlite3.connect(path)
+        print("\n== Before (no indexes) ==")
+        measure(conn, Context(args.users, args.games, args.seed), args.iterations)
+
+        start = time.perf_counter()
+        version = apply_migrations(conn)
+        conn.commit()
+        print(f"\nMigrated to schema version {version} in {time.perf_counter() - start:.1f}s")
+
+        print("\n== After ==")
+        measure(conn, Context(args.users, args.games, args.seed), args.iterations)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
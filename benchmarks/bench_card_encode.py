@@ -0,0 +1,91 @@
+"""Card encoding: encode time against bytes uploaded.
+
+Renders one completion banner (real resources, synthetic noisy avatar and
+cover so the image compresses like a real one) and encodes it with each
+candidate setting, reporting median encode time and output size. The first
+row is the old pipeline: ``Image.save`` to a PNG file at Pillow's defaults,
+then reading it back for the upload.
+
+    python benchmarks/bench_card_encode.py [--iterations 10] [--genre rpg]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # RESOURCE_PATH is relative
+
+from PIL import Image  # noqa: E402
+
+from banner import compose_completion_banner  # noqa: E402
+from image_encode import EncoderSettings, encode_image  # noqa: E402
+
+
+SETTINGS = (
+    ("png level 1", EncoderSettings("png", png_compress_level=1)),
+    ("png level 3", EncoderSettings("png", png_compress_level=3)),
+    ("png level 6", EncoderSettings("png", png_compress_level=6)),
+    ("png level 9", EncoderSettings("png", png_compress_level=9)),
+    ("jpeg q95", EncoderSettings("jpeg", quality=95)),
+    ("jpeg q85", EncoderSettings("jpeg", quality=85)),
+    ("jpeg q75", EncoderSettings("jpeg", quality=75)),
+    ("webp q90", EncoderSettings("webp", quality=90)),
+    ("webp q80", EncoderSettings("webp", quality=80)),
+    ("png, 1 MiB budget", EncoderSettings("png", max_bytes=1024 * 1024)),
+)
+
+
+def noise_png(size) -> bytes:
+    buf = io.BytesIO()
+    Image.effect_noise(size, 60).convert("RGB").save(buf, "PNG")
+    return buf.getvalue()
+
+
+def median_ms(fn, iterations: int):
+    samples = []
+    result = None
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--genre", default=None)
+    args = parser.parse_args()
+
+    banner = compose_completion_banner(
+        "The Legend of Zelda: Tears of the Kingdom", "benchmark_user", "1 Jan 2025",
+        noise_png((256, 256)), noise_png((345, 518)), args.genre,
+    )
+
+    print(f"{'setting':<22} {'encode ms':>10} {'KiB':>9}  format")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "completion_user.png")
+
+        def legacy() -> bytes:
+            banner.save(path)
+            with open(path, "rb") as fh:
+                return fh.read()
+
+        ms, data = median_ms(legacy, args.iterations)
+        print(f"{'legacy save + re-read':<22} {ms:10.2f} {len(data) / 1024:9.1f}  png")
+
+    for label, settings in SETTINGS:
+        ms, encoded = median_ms(lambda: encode_image(banner, settings), args.iterations)
+        print(f"{label:<22} {ms:10.2f} {len(encoded.data) / 1024:9.1f}  {encoded.extension}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,541 @@
+"""Offline benchmark of the bot's command handlers on a synthetic community.
+
+Imports main.py against a fresh database in a temporary directory, loads the
+GoalSystem and CalendarInvite cogs, and fills the database with a
+``community.CommunitySpec``-sized community. Then it calls the real command
+and autocomplete handlers with ``fake_discord`` interactions. Arguments are
+drawn from what each user actually holds, so commands take their real path:
+finishing a game that is in progress, syncing a goal the user has, and so
+on. Each scenario runs ``--iterations`` times with random users and
+reports:
+
+* latency — handler wall time (p50/p95/p99/max) and time to first response;
+* queries — database calls awaited (``track_queries``; one unit of work is
+  one call) and SQL statements executed (``query_profiler``, COMMIT
+  included), per invocation;
+* memory — peak Python allocation per scenario, from a separate short
+  tracemalloc pass, plus the process's peak RSS. Render workers are
+  separate processes and not counted.
+
+Nothing touches the network. /generatecard uses covers and avatars
+pre-seeded into the temporary caches, and audit rows are flushed between
+scenarios, outside the timed region.
+
+``--save`` writes the results as JSON. ``--baseline`` compares this run
+against a saved one: it flags latency (p50/p95), query and memory growth
+beyond ``--threshold``, and new errors. It exits with status 1 if anything
+regressed. Compare runs on the same machine, with the same sizes and seed.
+
+    python benchmarks/bench_commands.py [--users 500] [--games 2000] [--backlog 40]
+        [--iterations 200] [--save results.json] [--baseline baseline.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, NamedTuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from PIL import Image  # noqa: E402
+from discord import app_commands  # noqa: E402
+
+from community import Community, CommunitySpec, populate  # noqa: E402
+from fake_discord import FakeGuild, FakeInteraction, FakeUser, bind  # noqa: E402
+
+
+QUANTILES = (50, 95, 99)
+CARD_GAMES = 50                 # most popular games given a cached cover for /generatecard
+MIN_LATENCY_REGRESSION_MS = 1.0
+MIN_MEMORY_REGRESSION_KB = 64.0
+MISSING_GOAL = "No Such Goal"
+
+
+def load_bot(tmp: str):
+    """Import main.py with every file it writes redirected into ``tmp``."""
+    if "database" in sys.modules:
+        raise RuntimeError("database was imported before the benchmark could point it at a temporary file")
+    os.environ["HUNTERS_LEDGER_DB"] = os.path.join(tmp, "hunters_ledger.db")
+    os.environ["AUDIT_LOG_DB"] = os.environ["HUNTERS_LEDGER_DB"]
+    os.environ["COVER_CACHE_DIR"] = os.path.join(tmp, "covers")
+    os.environ["AVATAR_CACHE_DIR"] = os.path.join(tmp, "avatars")
+    os.environ["COMMAND_METRICS_FILE"] = ""
+    os.environ["STEAMGRIDDB_API_KEY"] = ""
+    # The statement counts come from the query profiler, which is opt-in.
+    os.environ["SQL_PROFILE"] = "1"
+    # The banner and board art are loaded from resources/, relative to the repo.
+    os.chdir(REPO)
+    import main
+    return main
+
+
+# ---- Argument picking ----
+
+class Picker:
+    """Random users and arguments consistent with (and kept in step with) the community."""
+
+    def __init__(self, community: Community, rng: random.Random):
+        self.community = community
+        self.rng = rng
+        self.user_ids = [user_id for user_id, _ in community.users]
+
+    def user(self) -> int:
+        return self.rng.choice(self.user_ids)
+
+    def user_with(self, has: Callable[[int], Any]) -> int | None:
+        for _ in range(50):
+            user_id = self.user()
+            if has(user_id):
+                return user_id
+        return None
+
+    def game(self) -> str:
+        # Popular games are asked about more often.
+        return self.community.games[min(int(self.rng.expovariate(1 / 50)), len(self.community.games) - 1)]
+
+    def prefix(self) -> str:
+        name = self.game()
+        return name[: self.rng.randint(1, 4)]
+
+    def move(self, user_id: int, game: str, old: str, new: str | None) -> None:
+        backlog = self.community.backlogs[user_id]
+        backlog[old].remove(game)
+        if new is not None:
+            backlog[new].append(game)
+
+
+class Scenario(NamedTuple):
+    name: str
+    kind: str                                                   # "command" or "autocomplete"
+    handler: Callable[..., Awaitable[Any]]                      # fn(interaction, **params)
+    params: Callable[[Picker], tuple[int, dict[str, Any]]]      # -> (user id, params)
+
+
+def build_scenarios(main, users: dict[int, FakeUser]) -> list[Scenario]:
+    tree = main.bot.tree
+    goals = main.bot.get_cog("GoalSystem")
+
+    def command(name: str) -> Callable[..., Awaitable[Any]]:
+        return bind(tree.get_command(name))
+
+    def no_params(p: Picker):
+        return p.user(), {}
+
+    def game(p: Picker):
+        return p.user(), {"game_name": p.game()}
+
+    def completion(p: Picker):
+        return p.user(), {"current": p.prefix()}
+
+    def backlog_move(old: str, new: str | None):
+        def params(p: Picker):
+            user_id = p.user_with(lambda u: p.community.backlogs[u][old])
+            if user_id is None:
+                return p.user(), {"game_name": "Nothing Left To Move"}
+            name = p.rng.choice(p.community.backlogs[user_id][old])
+            p.move(user_id, name, old, new)
+            return user_id, {"game_name": name}
+        return params
+
+    def join(p: Picker):
+        user_id, name = p.user(), p.game()
+        joined = p.community.joined[user_id]
+        if name not in joined:
+            joined.append(name)
+        return user_id, {"game_name": name}
+
+    def leave(p: Picker):
+        user_id = p.user_with(lambda u: p.community.joined[u])
+        if user_id is None:
+            return p.user(), {"game_name": p.game()}
+        joined = p.community.joined[user_id]
+        return user_id, {"game_name": joined.pop(p.rng.randrange(len(joined)))}
+
+    def new_hunt(p: Picker):
+        user_id, name = p.user(), p.game()
+        backlog = p.community.backlogs[user_id]
+        if not any(name in names for names in backlog.values()):
+            backlog["not started"].append(name)
+        return user_id, {"game_name": name}
+
+    def rate(p: Picker):
+        user_id = p.user_with(lambda u: p.community.backlogs[u]["completed"])
+        name = p.rng.choice(p.community.backlogs[user_id]["completed"]) if user_id else p.game()
+        return user_id or p.user(), {"game_name": name, "rating": p.rng.randint(1, 5), "comments": "Benchmark run."}
+
+    def card(p: Picker):
+        covered = set(p.community.games[:CARD_GAMES])
+        user_id = p.user_with(lambda u: covered.intersection(p.community.backlogs[u]["completed"]))
+        if user_id is None:
+            return p.user(), {"game_name": p.game()}
+        names = sorted(covered.intersection(p.community.backlogs[user_id]["completed"]))
+        return user_id, {"game_name": p.rng.choice(names)}
+
+    def finished(p: Picker):
+        month = date.today() - timedelta(days=p.rng.randint(0, 365))
+        return p.user(), {"month": month.month, "year": month.year}
+
+    def other_user(p: Picker):
+        return p.user(), {"user": users[p.user()]}
+
+    # Small communities can run out of goals or uncopied templates; the
+    # handlers then take their "not found" / "already have it" paths.
+    def goal_of(p: Picker, user_id: int | None) -> str:
+        return p.rng.choice(p.community.goals[user_id]) if user_id is not None else MISSING_GOAL
+
+    def own_goal(p: Picker):
+        user_id = p.user_with(lambda u: p.community.goals[u])
+        return user_id or p.user(), {"goaltitle": goal_of(p, user_id)}
+
+    def other_goal(p: Picker):
+        owner = p.user_with(lambda u: p.community.goals[u])
+        return p.user(), {"user": users[owner or p.user()], "goaltitle": goal_of(p, owner)}
+
+    def template(p: Picker):
+        goal_type, title = p.rng.choice(p.community.templates or [("series", MISSING_GOAL)])
+        return p.user(), {"goaltype": choice(goal_type), "goaltitle": title}
+
+    def copy_template(p: Picker):
+        held = p.community.copied
+        user_id = p.user_with(lambda u: len(held[u]) < len(p.community.templates))
+        if user_id is None:
+            return template(p)
+        goal_type, title = p.rng.choice([t for t in p.community.templates if t[1] not in held[user_id]])
+        held[user_id].add(title)
+        p.community.goals[user_id].append(title)
+        return user_id, {"goaltype": choice(goal_type), "goaltitle": title}
+
+    def goal_completion(p: Picker):
+        user_id = p.user_with(lambda u: p.community.goals[u])
+        return user_id or p.user(), {"current": goal_of(p, user_id)[:3]}
+
+    def session(p: Picker):
+        day = date.today() + timedelta(days=p.rng.randint(1, 60))
+        return p.user(), {"game": p.game(), "date": day.isoformat(), "time": "19:30", "duration": 3}
+
+    return [
+        Scenario("showhunts", "command", command("showhunts"), no_params),
+        Scenario("whohunts", "command", command("whohunts"), game),
+        Scenario("whohunts:game_name", "autocomplete", main.who_hunts_autocomplete, completion),
+        Scenario("joinhunt", "command", command("joinhunt"), join),
+        Scenario("leavehunt", "command", command("leavehunt"), leave),
+        Scenario("showmyhunts", "command", command("showmyhunts"), no_params),
+        Scenario("showhunter", "command", command("showhunter"), other_user),
+        Scenario("mosthunted", "command", command("mosthunted"), no_params),
+        Scenario("nothunted", "command", command("nothunted"), no_params),
+        Scenario("newhunt", "command", command("newhunt"), new_hunt),
+        Scenario("mysolohunts", "command", command("mysolohunts"), no_params),
+        Scenario("starthunt", "command", command("starthunt"), backlog_move("not started", "in progress")),
+        Scenario("finishhunt", "command", command("finishhunt"), backlog_move("in progress", "completed")),
+        Scenario("finishhunt:game_name", "autocomplete", main.finishhunt_autocomplete, completion),
+        Scenario("giveup", "command", command("giveup"), backlog_move("not started", None)),
+        Scenario("myfinishedhunts", "command", command("myfinishedhunts"), finished),
+        Scenario("ratehunt", "command", command("ratehunt"), rate),
+        Scenario("huntfeedback", "command", command("huntfeedback"), game),
+        Scenario("mynext10", "command", command("mynext10"), no_params),
+        Scenario("azhunts", "command", command("azhunts"), no_params),
+        Scenario("generatecard", "command", command("generatecard"), card),
+        Scenario("generatecard:game_name", "autocomplete", main.generatecard_game_autocomplete, completion),
+        Scenario("mygoals", "command", command("mygoals"), no_params),
+        Scenario("mygoal", "command", command("mygoal"), own_goal),
+        Scenario("mygoal:goaltitle", "autocomplete", goals.mygoal_title_autocomplete, goal_completion),
+        Scenario("showgoal", "command", command("showgoal"), other_goal),
+        Scenario("syncgoal", "command", command("syncgoal"), own_goal),
+        Scenario("goallibrary", "command", command("goallibrary"), no_params),
+        Scenario("viewgamesingoal", "command", command("viewgamesingoal"), template),
+        Scenario("copygoal", "command", command("copygoal"), copy_template),
+        Scenario("huntingsession", "command", command("huntingsession"), session),
+    ]
+
+
+def choice(goal_type: str) -> app_commands.Choice[str]:
+    return app_commands.Choice(name=goal_type, value=goal_type)
+
+
+# ---- Offline caches ----
+
+def seed_avatars(main, users: list[tuple[int, str]]) -> None:
+    """A cached avatar for each (id, name), so cards never download one."""
+    from avatar_cache import _encode_avatar, avatar_key
+
+    avatar = io.BytesIO()
+    Image.new("RGB", (256, 256), (90, 60, 140)).save(avatar, "PNG")
+    avatar_png = _encode_avatar(avatar.getvalue())
+    for user_id, name in users:
+        url = FakeUser(user_id, name).display_avatar.with_size(128).url
+        main.avatar_cache._write_disk(avatar_key(url), avatar_png)
+
+
+def seed_covers(main, game_names: list[str]) -> None:
+    """A cached cover for each game, so cards never query SteamGridDB."""
+    from cover_cache import _prepare_cover, _store, cover_key
+
+    covers = main.cover_cache
+    now = time.time()
+    for i, game_name in enumerate(game_names):
+        raw = io.BytesIO()
+        Image.new("RGB", (600, 900), (40 + i * 4 % 200, 80, 120)).save(raw, "PNG")
+        data = _prepare_cover(raw.getvalue())
+        file_name = f"bench_{i}.png"
+        covers._write_file(file_name, data)
+        covers.index.write_sync(_store, (cover_key(game_name), game_name, i, None, file_name, len(data), now, now),
+                                covers.max_bytes)
+
+
+# ---- Measuring ----
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    result = {"mean": statistics.fmean(ordered)}
+    for pct in QUANTILES:
+        result[f"p{pct}"] = ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+    result["max"] = ordered[-1]
+    return result
+
+
+def _statements() -> int:
+    from query_profiler import profiler
+    return sum(stats.count for stats in profiler.stats.values()) + profiler.overflowed
+
+
+class Run(NamedTuple):
+    wall_ms: float
+    first_response_ms: float | None
+    db_calls: int
+    db_ms: float
+    statements: int
+    answered: bool
+    error: BaseException | None
+
+
+async def invoke(scenario: Scenario, interaction: FakeInteraction, params: dict[str, Any]) -> Run:
+    from database import track_queries
+
+    async def call() -> Run:
+        # In its own task, so the query tally covers this invocation only.
+        tally = track_queries()
+        statements = _statements()
+        start = time.perf_counter()
+        error, result = None, None
+        try:
+            result = await scenario.handler(interaction, **params)
+        except Exception as e:
+            error = e
+        wall_ms = (time.perf_counter() - start) * 1000
+        answered = bool(interaction.sent) if scenario.kind == "command" else result is not None
+        first_ms = interaction.first_response_ms if scenario.kind == "command" else wall_ms
+        return Run(wall_ms, first_ms, tally.calls, tally.seconds * 1000, _statements() - statements, answered, error)
+
+    return await asyncio.create_task(call())
+
+
+async def run_scenario(main, scenario: Scenario, picker: Picker, users: dict[int, FakeUser], guild: FakeGuild,
+                       iterations: int) -> list[Run]:
+    runs = []
+    for _ in range(iterations):
+        user_id, params = scenario.params(picker)
+        interaction = FakeInteraction(users[user_id], guild=guild, namespace=params)
+        runs.append(await invoke(scenario, interaction, params))
+    await main.audit_log.flush()
+    return runs
+
+
+def summarise(scenario: Scenario, runs: list[Run]) -> dict[str, Any]:
+    errors = [run.error for run in runs if run.error is not None]
+    return {
+        "kind": scenario.kind,
+        "runs": len(runs),
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "unanswered": sum(1 for run in runs if not run.answered and run.error is None),
+        "wall_ms": percentiles([run.wall_ms for run in runs]),
+        "first_response_ms": percentiles([run.first_response_ms for run in runs if run.first_response_ms is not None]),
+        "db_calls": statistics.fmean(run.db_calls for run in runs),
+        "db_ms": statistics.fmean(run.db_ms for run in runs),
+        "statements": statistics.fmean(run.statements for run in runs),
+    }
+
+
+async def run(args) -> dict[str, Any]:
+    spec = CommunitySpec(
+        users=args.users, games=args.games, backlog=args.backlog, goals=args.goals,
+        templates=args.templates, subscribers=args.subscribers, logs=args.logs,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        main = load_bot(tmp)
+        try:
+            await main.bot.load_extension("calendar_invite")
+            await main.bot.load_extension("goal_system")
+
+            start = time.perf_counter()
+            community = await main.db.write(populate, spec, args.seed)
+            main.game_index.load(row[0] for row in await main.db.fetchall("SELECT game_name FROM games"))
+            seed_avatars(main, community.users)
+            seed_covers(main, community.games[:CARD_GAMES])
+            print(f"community: {spec.users:,} users, {len(community.games):,} games, "
+                  f"{spec.templates} templates; built in {time.perf_counter() - start:.1f} s")
+
+            users = {user_id: FakeUser(user_id, name) for user_id, name in community.users}
+            guild = FakeGuild()
+            picker = Picker(community, random.Random(args.seed))
+            scenarios = build_scenarios(main, users)
+            if args.only:
+                scenarios = [s for s in scenarios if s.name.split(":")[0] in args.only]
+
+            main.loop_monitor.start()
+            results: dict[str, Any] = {}
+            print(HEADER)
+            for scenario in scenarios:
+                await run_scenario(main, scenario, picker, users, guild, args.warmup)
+                runs = await run_scenario(main, scenario, picker, users, guild, args.iterations)
+                results[scenario.name] = summarise(scenario, runs)
+                print_row(scenario.name, results[scenario.name])
+
+            if args.memory_iterations:
+                tracemalloc.start()
+                for scenario in scenarios:
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    await run_scenario(main, scenario, picker, users, guild, args.memory_iterations)
+                    results[scenario.name]["peak_kb"] = (tracemalloc.get_traced_memory()[1] - before) / 1024
+                tracemalloc.stop()
+            main.loop_monitor.stop()
+            loop = main.loop_monitor.snapshot()
+        finally:
+            await main.audit_log.close()
+            await main.close_session()
+            main.render_pool.close()
+            main.close_databases()
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "iterations": args.iterations,
+            "spec": spec._asdict(),
+        },
+        "process": {
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+            "loop_lag_max_ms": loop["lag_max_ms"],
+            "loop_stalls": loop["stalls"],
+        },
+        "commands": results,
+    }
+
+
+# ---- Reporting ----
+
+HEADER = (f"{'scenario':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'1st p50':>8} {'db calls':>8} {'stmts':>7} {'errors':>6}")
+
+
+def print_row(name: str, result: dict[str, Any]) -> None:
+    wall, first = result["wall_ms"], result["first_response_ms"]
+    errors = result["errors"] + result["unanswered"]
+    print(f"{name:<24} {wall['p50']:>8.2f} {wall['p95']:>8.2f} {wall['p99']:>8.2f} {wall['max']:>8.2f} "
+          f"{first.get('p50', float('nan')):>8.2f} {result['db_calls']:>8.1f} {result['statements']:>7.1f} "
+          f"{errors:>6}")
+    if result["first_error"]:
+        print(f"    first error: {result['first_error']}")
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Human-readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    grow = 1 + threshold
+    for name, cur in current["commands"].items():
+        base = baseline["commands"].get(name)
+        if base is None:
+            continue
+        for pct in ("p50", "p95"):
+            now, before = cur["wall_ms"][pct], base["wall_ms"][pct]
+            if now > before * grow and now - before > MIN_LATENCY_REGRESSION_MS:
+                regressions.append(f"{name}: {pct} {before:.2f} -> {now:.2f} ms")
+        if cur["db_calls"] - base["db_calls"] >= 0.5:
+            regressions.append(f"{name}: db calls {base['db_calls']:.1f} -> {cur['db_calls']:.1f}")
+        if cur["statements"] > base["statements"] * grow and cur["statements"] - base["statements"] >= 1:
+            regressions.append(f"{name}: statements {base['statements']:.1f} -> {cur['statements']:.1f}")
+        now_kb, before_kb = cur.get("peak_kb"), base.get("peak_kb")
+        if now_kb is not None and before_kb is not None:
+            if now_kb > before_kb * grow and now_kb - before_kb > MIN_MEMORY_REGRESSION_KB:
+                regressions.append(f"{name}: peak memory {before_kb:,.0f} -> {now_kb:,.0f} KB")
+        if cur["errors"] + cur["unanswered"] > base["errors"] + base["unanswered"]:
+            regressions.append(f"{name}: {cur['errors']} errors, {cur['unanswered']} unanswered "
+                               f"(baseline {base['errors']}, {base['unanswered']})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = CommunitySpec()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--games", type=int, default=defaults.games)
+    parser.add_argument("--backlog", type=int, default=defaults.backlog, help="average solo backlog rows per user")
+    parser.add_argument("--goals", type=int, default=defaults.goals, help="personal goals per user")
+    parser.add_argument("--templates", type=int, default=defaults.templates)
+    parser.add_argument("--subscribers", type=int, default=defaults.subscribers, help="copies of each template")
+    parser.add_argument("--logs", type=int, default=defaults.logs)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=200, help="timed runs per scenario")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed runs per scenario first")
+    parser.add_argument("--memory-iterations", type=int, default=5, help="runs per scenario under tracemalloc (0 skips)")
+    parser.add_argument("--only", nargs="+", metavar="COMMAND", help="run only these commands (and their autocompletes)")
+    parser.add_argument("--save", metavar="JSON", help="write the results here")
+    parser.add_argument("--baseline", metavar="JSON", help="compare against these saved results")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative growth that counts as a regression")
+    args = parser.parse_args()
+    # Resolve paths before load_bot changes directory.
+    args.save = os.path.abspath(args.save) if args.save else None
+    args.baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    results = asyncio.run(run(args))
+    rss = results["process"]["max_rss_kb"]
+    print(f"peak RSS {rss / 1024:,.0f} MB; " if rss else "", end="")
+    print(f"event loop: max lag {results['process']['loop_lag_max_ms']:.0f} ms, "
+          f"{results['process']['loop_stalls']} stalls")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"saved {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline["meta"]["spec"] != results["meta"]["spec"] or baseline["meta"]["seed"] != args.seed:
+            print("warning: the baseline used a different community; the comparison is not like for like")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Full-community marks re-evaluation: per-user evaluator vs bulk backfill.
+
+A synthetic community (``--users`` hunters, each with a backlog of completed,
+in-progress and abandoned hunts spread over two years, plus challenge
+counters) is evaluated two ways on a file database with production pragmas:
+
+* per-user — ``marks.evaluate_and_unlock_marks`` for every user, committing
+  after each one as a ``db.write`` per user would;
+* bulk — ``marks_backfill.backfill_marks`` in one transaction, with and
+  without rebuilding the hunt stats rollup first.
+
+Both must unlock the same marks. The script reports wall time and users/s.
+
+    python benchmarks/bench_marks_backfill.py [--users 20000] [--games 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hunt_stats import record_abandoned_hunts  # noqa: E402
+from marks import evaluate_and_unlock_marks, seed_hunting_marks  # noqa: E402
+from marks_backfill import backfill_marks  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+
+def build_db(path: str, users: int, games: int, seed: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript("""
+        CREATE TABLE solo_backlogs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL, user_name TEXT NOT NULL, game_name TEXT NOT NULL,
+            status TEXT DEFAULT 'not started', completion_date DATE, rating INTEGER, comments TEXT
+        );
+        CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, game_name TEXT UNIQUE, platform TEXT);
+        CREATE TABLE user_games (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, user_name TEXT,
+                                 game_id INTEGER, platform TEXT);
+        CREATE TABLE challenge_stats (
+            user_id TEXT PRIMARY KEY, next10_completed_count INTEGER DEFAULT 0, az_completed_count INTEGER DEFAULT 0
+        );
+        CREATE TABLE hunting_marks (key TEXT PRIMARY KEY, slot_index INTEGER NOT NULL, is_hidden INTEGER DEFAULT 0);
+        CREATE TABLE user_hunting_marks (
+            user_id TEXT NOT NULL, key TEXT NOT NULL, unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, key)
+        );
+    """)
+    seed_hunting_marks(conn)
+    apply_migrations(conn)
+
+    rng = random.Random(seed)
+    today = date.today()
+    rows, challenges = [], []
+    for u in range(users):
+        user_id = str(10_000_000 + u)
+        for g in range(rng.randint(1, games * 3)):
+            roll = rng.random()
+            if roll < 0.55:
+                done = today - timedelta(days=rng.randint(0, 730))
+                rows.append((user_id, "bench", f"Game {g}", "completed", done.isoformat()))
+            else:
+                rows.append((user_id, "bench", f"Game {g}", "in progress" if roll < 0.8 else "not started", None))
+        if rng.random() < 0.3:
+            challenges.append((user_id, rng.randint(0, 3), rng.randint(0, 2)))
+    conn.executemany(
+        "INSERT INTO solo_backlogs (user_id, user_name, game_name, status, completion_date) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.executemany("INSERT INTO challenge_stats VALUES (?, ?, ?)", challenges)
+    # Some give-ups, so the hidden mark has candidates; /giveup counts them.
+    given_up = "FROM solo_backlogs WHERE status = 'not started' AND id % 3 = 0"
+    for user_id, count in conn.execute(f"SELECT user_id, COUNT(*) {given_up} GROUP BY user_id").fetchall():
+        record_abandoned_hunts(conn, user_id, count)
+    conn.execute(f"DELETE {given_up}")
+    conn.commit()
+    conn.close()
+
+
+def unlocks(conn: sqlite3.Connection) -> set[tuple[str, str]]:
+    return set(conn.execute("SELECT user_id, key FROM user_hunting_marks"))
+
+
+def per_user(conn: sqlite3.Connection) -> None:
+    user_ids = [u for (u,) in conn.execute("SELECT user_id FROM user_hunt_stats UNION SELECT user_id FROM challenge_stats")]
+    for user_id in user_ids:
+        evaluate_and_unlock_marks(conn, user_id)
+        conn.commit()
+
+
+def timed(path: str, fn) -> tuple[float, set[tuple[str, str]]]:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("DELETE FROM user_hunting_marks")
+    conn.commit()
+    start = time.perf_counter()
+    fn(conn)
+    conn.commit()
+    elapsed = time.perf_counter() - start
+    result = unlocks(conn)
+    conn.close()
+    return elapsed, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--games", type=int, default=60, help="average backlog size per user")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_db(path, args.users, args.games, args.seed)
+        conn = sqlite3.connect(path)
+        backlog_rows = conn.execute("SELECT COUNT(*) FROM solo_backlogs").fetchone()[0]
+        users = conn.execute(
+            "SELECT COUNT(*) FROM (SELECT user_id FROM user_hunt_stats UNION SELECT user_id FROM challenge_stats)"
+        ).fetchone()[0]
+        conn.close()
+        print(f"Marks re-evaluation for {users:,} users ({backlog_rows:,} backlog rows)")
+
+        runs = [
+            ("per-user", per_user),
+            ("bulk", backfill_marks),
+            ("bulk + rebuild", lambda conn: backfill_marks(conn, rebuild_stats=True)),
+        ]
+        expected = None
+        for label, fn in runs:
+            elapsed, result = timed(path, fn)
+            if expected is None:
+                expected = result
+            status = "ok" if result == expected else "MISMATCH"
+            print(f"  {label:<15} {elapsed * 1000:>10.1f} ms  {users / elapsed:>10,.0f} users/s  "
+                  f"{len(result):>8,} unlocks  {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Marks of the Hunt boards: render every view vs the bitmask-keyed cache.
+
+``--users`` hunters each hold a random set of unlocked marks (common marks
+are likelier than rare ones), and ``--views`` /myhuntingmarks views are drawn
+from them, a few hunters viewing far more often than the rest. The views are
+served two ways:
+
+* render — ``render_marks_board`` on every view, as the inline renderer in
+  main.py did (art already decoded in the asset registry);
+* cached — ``marks_boards.get``, which renders each distinct board once.
+
+Before timing, the script checks that the cache is correct: each cached board
+is byte-identical to a fresh render, the order of the unlocked keys doesn't
+matter, and replacing a badge's art renders the board again.
+
+The real art in ``resources/marks`` is used when present. Otherwise
+placeholder board and badge art is generated in a temporary directory.
+
+    python benchmarks/bench_marks_board.py [--users 300] [--views 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # RES_MARKS_DIR is relative
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+import marks_board  # noqa: E402
+from assets import assets  # noqa: E402
+from marks import MARKS  # noqa: E402
+from marks_board import MarksBoardCache, board_badges, render_marks_board  # noqa: E402
+
+
+BADGE_SIZE = (96, 96)
+
+
+def placeholder_art(directory: str) -> None:
+    """A plain board and one numbered disc per mark, sized like the real art."""
+    Image.new("RGBA", (900, 720), (38, 30, 24, 255)).save(os.path.join(directory, "board.png"))
+    for key, slot, _ in MARKS:
+        badge = Image.new("RGBA", BADGE_SIZE, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(badge)
+        draw.ellipse((4, 4, BADGE_SIZE[0] - 4, BADGE_SIZE[1] - 4), fill=(150 + slot * 9, 110, 40, 255))
+        draw.text((BADGE_SIZE[0] // 2 - 6, BADGE_SIZE[1] // 2 - 6), str(slot), fill="white")
+        badge.save(os.path.join(directory, f"{key}.png"))
+
+
+def use_marks_dir(directory: str) -> None:
+    marks_board.RES_MARKS_DIR = directory
+    marks_board.BOARD_PATH = os.path.join(directory, "board.png")
+
+
+def unlock_sets(users: int, seed: int) -> list[list[str]]:
+    rng = random.Random(seed)
+    # Earlier marks in the catalogue are the easier ones.
+    odds = {key: 0.8 / (1 + slot * 0.6) for key, slot, _ in MARKS}
+    return [[key for key, chance in odds.items() if rng.random() < chance] for _ in range(users)]
+
+
+def self_check(slot_map: dict[str, int], sets: list[list[str]]) -> None:
+    cache = MarksBoardCache()
+
+    async def load_slots():
+        return slot_map
+
+    async def run():
+        for unlocked in sets[:50]:
+            cached = await cache.get(unlocked, load_slots)
+            fresh = render_marks_board(board_badges(unlocked, slot_map))
+            assert cached.data == fresh.data, f"cached board differs for {unlocked}"
+            shuffled = unlocked[::-1]
+            assert await cache.get(shuffled, load_slots) is cached, "key order changed the board"
+
+        unlocked = max(sets, key=len)
+        before = await cache.get(unlocked, load_slots)
+        if unlocked:
+            # New art for one of the unlocked badges must be picked up without a restart.
+            path = marks_board.badge_path(unlocked[0])
+            Image.new("RGBA", BADGE_SIZE, (20, 160, 200, 255)).save(path)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            after = await cache.get(unlocked, load_slots)
+            assert after.data != before.data, "replaced badge art was not rendered"
+
+    asyncio.run(run())
+    print(f"self-check passed ({cache.misses} renders, {cache.hits} hits)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--views", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    slot_map = {key: slot for key, slot, _ in MARKS}
+    sets = unlock_sets(args.users, args.seed)
+    rng = random.Random(args.seed + 1)
+    views = rng.choices(sets, weights=[1 / (rank + 1) for rank in range(len(sets))], k=args.views)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The self-check rewrites a badge, so it always works on a copy.
+        art_dir = os.path.join(tmp, "marks")
+        if os.path.exists(marks_board.BOARD_PATH):
+            shutil.copytree(marks_board.RES_MARKS_DIR, art_dir)
+            print(f"art: {marks_board.RES_MARKS_DIR}")
+        else:
+            os.makedirs(art_dir)
+            placeholder_art(art_dir)
+            print("art: generated placeholders (resources/marks is missing)")
+        use_marks_dir(art_dir)
+
+        self_check(slot_map, sets)
+        assets.clear()
+
+        render_marks_board(())  # warm the registry, as a running bot would be
+        samples = []
+        start = time.perf_counter()
+        for unlocked in views:
+            t = time.perf_counter()
+            render_marks_board(board_badges(unlocked, slot_map))
+            samples.append((time.perf_counter() - t) * 1000)
+        render_s = time.perf_counter() - start
+
+        cache = MarksBoardCache()
+
+        async def load_slots():
+            return slot_map
+
+        async def serve() -> list[float]:
+            timings = []
+            for unlocked in views:
+                t = time.perf_counter()
+                await cache.get(unlocked, load_slots)
+                timings.append((time.perf_counter() - t) * 1000)
+            return timings
+
+        start = time.perf_counter()
+        cached_samples = asyncio.run(serve())
+        cached_s = time.perf_counter() - start
+
+    distinct = len({board_badges(unlocked, slot_map) for unlocked in views})
+    print(f"{args.views:,} views by {args.users:,} hunters, {distinct} distinct boards")
+    print(f"  {'':<8} {'total':>10} {'median':>10} {'views/s':>10}")
+    for label, total, timings in (("render", render_s, samples), ("cached", cached_s, cached_samples)):
+        print(
+            f"  {label:<8} {total * 1000:8.1f} ms {statistics.median(timings):7.3f} ms "
+            f"{args.views / total:10,.0f}"
+        )
+    print(f"  speed-up {render_s / cached_s:.0f}x   cache: {cache.misses} renders, {cache.hits} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Throughput of the /newmasshunts import: per-game upserts vs bulk diff.
+
+For each batch size, a user who already has a backlog pastes a mix of new
+games and games that change status. The paste is applied two ways:
+
+* legacy — the old modal loop: a SELECT and then an INSERT or UPDATE per game,
+  on the same name key and index;
+* bulk — ``backlog_import.import_backlog``: a keyed lookup of the pasted
+  names only, an in-memory diff and two ``executemany`` calls.
+
+Both run in one transaction on a file database with the production pragmas.
+The script reports the best-of-N wall time and games/second.
+
+    python benchmarks/bench_mass_import.py [--batches 50,300,1000,5000] [--existing 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backlog_import import import_backlog  # noqa: E402
+from backlog_keys import normalize_game_name  # noqa: E402
+from database import CACHE_SIZE_KIB, MMAP_SIZE_BYTES  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+
+USER_ID = "1"
+USER_NAME = "bench"
+
+
+def legacy_import(conn: sqlite3.Connection, not_started: list[str], in_progress: list[str]) -> None:
+    # The old modal loop, matching on the name key (and its index) as the
+    # bulk path does, so the two differ only in statements per game.
+    def upsert(game_display: str, target_status: str) -> None:
+        key = normalize_game_name(game_display)
+        row = conn.execute(
+            'SELECT game_name, status FROM solo_backlogs WHERE user_id = ? AND normalized_game_name = ?',
+            (USER_ID, key)
+        ).fetchone()
+        if not row:
+            conn.execute(
+                'INSERT INTO solo_backlogs (user_id, user_name, game_name, normalized_game_name, status) VALUES (?, ?, ?, ?, ?)',
+                (USER_ID, USER_NAME, game_display, key, target_status)
+            )
+            return
+        if row[1] != target_status:
+            conn.execute(
+                'UPDATE solo_backlogs SET status = ?, user_name = ? WHERE user_id = ? AND normalized_game_name = ?',
+                (target_status, USER_NAME, USER_ID, key)
+            )
+
+    for g in not_started:
+        upsert(g, "not started")
+    for g in in_progress:
+        upsert(g, "in progress")
+
+
+def bulk_import(conn: sqlite3.Connection, not_started: list[str], in_progress: list[str]) -> None:
+    import_backlog(conn, USER_ID, USER_NAME, not_started, in_progress)
+
+
+def fresh_db(path: str, existing: int, others: int, indexes: bool) -> sqlite3.Connection:
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+    conn.executescript("""
+        CREATE TABLE games (id INTEGER PRIMARY KEY AUTOINCREMENT, game_name TEXT UNIQUE, platform TEXT);
+        CREATE TABLE user_games (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT, user_name TEXT,
+                                 game_id INTEGER, platform TEXT);
+        CREATE TABLE solo_backlogs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL, user_name TEXT NOT NULL, game_name TEXT NOT NULL,
+            status TEXT DEFAULT 'not started', completion_date DATE, rating INTEGER, comments TEXT,
+            normalized_game_name TEXT
+        );
+    """)
+    rows = [(USER_ID, USER_NAME, f"Existing {i}", "not started") for i in range(existing)]
+    rows += [(str(2 + i % 1000), "other", f"Other {i}", "not started") for i in range(others)]
+    # Keyed as the bot stores them, so the bulk path finds them without migration 4.
+    conn.executemany(
+        "INSERT INTO solo_backlogs (user_id, user_name, game_name, status, normalized_game_name) VALUES (?, ?, ?, ?, ?)",
+        [(*row, normalize_game_name(row[2])) for row in rows],
+    )
+    if indexes:
+        apply_migrations(conn)
+    conn.commit()
+    return conn
+
+
+def paste(batch: int, existing: int, seed: int) -> tuple[list[str], list[str]]:
+    # Roughly a quarter of the paste moves existing games to in progress.
+    rng = random.Random(seed)
+    moves = min(existing, batch // 4)
+    in_progress = [f"existing {i}" for i in rng.sample(range(existing), moves)]
+    not_started = [f"Pasted {rng.random():.12f}" for _ in range(batch - moves)]
+    return not_started, in_progress
+
+
+def timed(fn, path: str, args, batch: int, seed: int) -> float:
+    best = float("inf")
+    for _ in range(args.repeat):
+        conn = fresh_db(path, args.existing, args.others, not args.no_indexes)
+        not_started, in_progress = paste(batch, args.existing, seed)
+        start = time.perf_counter()
+        fn(conn, not_started, in_progress)
+        conn.commit()
+        best = min(best, time.perf_counter() - start)
+        conn.close()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", default="50,300,1000,5000", help="comma-separated paste sizes")
+    parser.add_argument("--existing", type=int, default=2_000, help="games already in the user's backlog")
+    parser.add_argument("--others", type=int, default=100_000, help="rows belonging to other users")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of runs per measurement")
+    parser.add_argument("--no-indexes", action="store_true", help="skip migration 1 (pre-index schema)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Mass import into a {args.existing:,}-game backlog ({args.others:,} other rows)")
+        print(f"  {'batch':>6}  {'legacy':>12}  {'bulk':>12}  {'legacy/s':>10}  {'bulk/s':>10}  speed-up")
+        for batch in (int(b) for b in args.batches.split(",")):
+            legacy = timed(legacy_import, path, args, batch, args.seed)
+            bulk = timed(bulk_import, path, args, batch, args.seed)
+            print(
+                f"  {batch:>6}  {legacy * 1000:>9.2f} ms  {bulk * 1000:>9.2f} ms  "
+                f"{batch / legacy:>10,.0f}  {batch / bulk:>10,.0f}  {legacy / bulk:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Outlined title text: offset-loop outline vs dilated glyph mask.
+
+For a set of long game titles, times on the real banner background and font:
+
+* fit — the old ``get_scaled_font`` (reload the TTF at every 2px step)
+  against ``fit_font`` (binary search over memoised fonts), and checks both
+  pick the same size;
+* outline — the old ``draw_text_with_outline`` (48 offset draws + fill)
+  against ``draw_outlined_text``, with a cold and a warm mask cache;
+
+and reports how far the new output is from the old one: mean absolute
+channel difference and the share of pixels differing by more than 32/255.
+
+    python benchmarks/bench_text_render.py [--iterations 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # RESOURCE_PATH is relative
+
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageStat  # noqa: E402
+
+import text_render  # noqa: E402
+from banner import DEFAULT_BACKGROUND, FONT_PATH, GAME_NAME_FONT_SIZE, RESOURCE_PATH  # noqa: E402
+
+
+TITLES = (
+    "The Legend of Zelda: Tears of the Kingdom",
+    "Star Wars Jedi: Fallen Order - Deluxe Edition",
+    "Tom Clancy's Rainbow Six Siege Operator Edition",
+    "The Elder Scrolls V: Skyrim Special Edition",
+    "Microsoft Flight Simulator: 40th Anniversary",
+    "Batman: Arkham Knight Premium Edition",
+    "Halo: The Master Chief Collection",
+    "Ori and the Will of the Wisps",
+)
+MAX_WIDTH = 550
+
+
+def legacy_get_scaled_font(text, base_size, max_width, font_path, draw_context):
+    font_size = base_size
+    font = ImageFont.truetype(font_path, font_size)
+    while font_size > 40:
+        bbox = draw_context.textbbox((0, 0), text, font=font)
+        if bbox[2] - bbox[0] <= max_width:
+            break
+        font_size -= 2
+        font = ImageFont.truetype(font_path, font_size)
+    return font, font_size
+
+
+def legacy_draw_text_with_outline(draw, position, text, font, fill="white", outline="black", outline_thickness=3):
+    x, y = position
+    for dx in range(-outline_thickness, outline_thickness + 1):
+        for dy in range(-outline_thickness, outline_thickness + 1):
+            if dx or dy:
+                draw.text((x + dx, y + dy), text, font=font, fill=outline)
+    draw.text(position, text, font=font, fill=fill)
+
+
+def median_ms(fn, iterations: int, before=None) -> float:
+    samples = []
+    for _ in range(iterations):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    background = Image.open(os.path.join(RESOURCE_PATH, DEFAULT_BACKGROUND)).convert("RGBA")
+    scratch = ImageDraw.Draw(background.copy())
+
+    print(f"{'title':<48} {'fit old':>8} {'fit new':>8} {'outline old':>12} {'new cold':>9} {'new warm':>9} {'mean diff':>10} {'>32':>7}")
+    totals = [0.0] * 4
+    for title in TITLES:
+        old_font, old_size = legacy_get_scaled_font(title, GAME_NAME_FONT_SIZE, MAX_WIDTH, FONT_PATH, scratch)
+        new_font, new_size = text_render.fit_font(title, FONT_PATH, GAME_NAME_FONT_SIZE, MAX_WIDTH)
+        if old_size != new_size:
+            print(f"  size mismatch for {title!r}: {old_size} vs {new_size}")
+        position = (215, 150 + new_size // 2)
+
+        fit_old = median_ms(
+            lambda: legacy_get_scaled_font(title, GAME_NAME_FONT_SIZE, MAX_WIDTH, FONT_PATH, scratch), args.iterations
+        )
+        fit_new = median_ms(lambda: text_render.fit_font(title, FONT_PATH, GAME_NAME_FONT_SIZE, MAX_WIDTH), args.iterations)
+
+        def old():
+            image = background.copy()
+            legacy_draw_text_with_outline(ImageDraw.Draw(image), position, title, new_font)
+            return image
+
+        def new():
+            image = background.copy()
+            text_render.draw_outlined_text(image, ImageDraw.Draw(image), position, title, new_font)
+            return image
+
+        outline_old = median_ms(old, args.iterations)
+        outline_cold = median_ms(new, args.iterations, before=text_render._outline_masks.cache_clear)
+        outline_warm = median_ms(new, args.iterations)
+
+        diff = ImageChops.difference(old().convert("RGB"), new().convert("RGB"))
+        mean = statistics.mean(ImageStat.Stat(diff).mean)
+        histogram = diff.convert("L").histogram()
+        over = sum(histogram[33:]) / sum(histogram) * 100
+
+        for i, value in enumerate((fit_old, fit_new, outline_old, outline_cold)):
+            totals[i] += value
+        print(f"{title[:48]:<48} {fit_old:8.2f} {fit_new:8.2f} {outline_old:12.2f} {outline_cold:9.2f} {outline_warm:9.2f} {mean:10.4f} {over:6.3f}%")
+
+    print(f"\ntotal ms: fit {totals[0]:.1f} -> {totals[1]:.1f}, outline {totals[2]:.1f} -> {totals[3]:.1f} (cold)")
+
+
+if __name__ == "__main__":
+    main()
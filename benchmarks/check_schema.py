@@ -0,0 +1,145 @@
+"""Check that migrated databases end up with the same schema as a fresh one.
+
+The bot builds its schema in two steps: ``init_schema`` in main.py creates
+the base tables, then ``apply_migrations`` runs every numbered step. Both
+paths have to agree, or a command (or the audit writer) that relies on a
+column fails on only some files. Three databases are built in a temporary
+directory:
+
+* fresh — what importing main.py creates on an empty file;
+* legacy — a file with the tables as they were before migration 1
+  (``logs`` without user_id/location/extra, ``solo_backlogs`` without
+  ``normalized_game_name``), then ``init_schema`` and the migrations, as
+  the bot does on startup;
+* migrations first — a file with the gameplay tables but no ``logs``,
+  migrated before ``init_schema`` runs, as the benchmark fixtures are.
+
+Their columns, indexes and triggers are compared. The script exits with
+status 1 and lists the differences if they don't match.
+
+    python benchmarks/check_schema.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_commands import load_bot  # noqa: E402
+
+
+LEGACY_GAMES = """
+    CREATE TABLE games (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_name TEXT UNIQUE,
+        platform TEXT
+    )
+"""
+LEGACY_USER_GAMES = """
+    CREATE TABLE user_games (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT,
+        user_name TEXT,
+        game_id INTEGER,
+        platform TEXT,
+        FOREIGN KEY (game_id) REFERENCES games(id)
+    )
+"""
+LEGACY_LOGS = """
+    CREATE TABLE logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user TEXT NOT NULL,
+        command TEXT NOT NULL,
+        game_name TEXT
+    )
+"""
+LEGACY_SOLO_BACKLOGS = """
+    CREATE TABLE solo_backlogs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        user_name TEXT NOT NULL,
+        game_name TEXT NOT NULL,
+        status TEXT CHECK(status IN ('not started', 'in progress', 'completed')) DEFAULT 'not started',
+        completion_date DATE,
+        rating INTEGER CHECK(rating BETWEEN 1 AND 5),
+        comments TEXT
+    )
+"""
+
+
+def schema(conn: sqlite3.Connection) -> dict[str, object]:
+    """Columns per table, plus index and trigger definitions, keyed by name."""
+    result: dict[str, object] = {"user_version": conn.execute("PRAGMA user_version").fetchone()[0]}
+    for kind, name, sql in conn.execute(
+        "SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' ORDER BY type, name"
+    ):
+        if kind == "table":
+            # Table SQL differs once ALTER TABLE has run; the columns must not.
+            result[f"table {name}"] = [tuple(row[1:]) for row in conn.execute(f"PRAGMA table_info({name})")]
+        elif sql is not None:
+            result[f"{kind} {name}"] = " ".join(sql.split())
+    return result
+
+
+def build(path: str, main, legacy_ddl: list[str], migrate_first: bool) -> dict[str, object]:
+    conn = sqlite3.connect(path)
+    try:
+        for ddl in legacy_ddl:
+            conn.execute(ddl)
+        steps = [main.apply_migrations, main.init_schema] if migrate_first else [main.init_schema, main.apply_migrations]
+        for step in steps:
+            step(conn)
+        conn.commit()
+        return schema(conn)
+    finally:
+        conn.close()
+
+
+def differences(expected: dict[str, object], actual: dict[str, object]) -> list[str]:
+    lines = []
+    for key in sorted(expected.keys() | actual.keys()):
+        if key not in actual:
+            lines.append(f"  missing {key}")
+        elif key not in expected:
+            lines.append(f"  extra   {key}")
+        elif expected[key] != actual[key]:
+            lines.append(f"  differs {key}:\n    fresh:    {expected[key]}\n    migrated: {actual[key]}")
+    return lines
+
+
+def main() -> None:
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        bot = load_bot(tmp)
+        try:
+            conn = sqlite3.connect(os.path.join(tmp, "hunters_ledger.db"))
+            try:
+                fresh = schema(conn)
+            finally:
+                conn.close()
+            gameplay = [LEGACY_GAMES, LEGACY_USER_GAMES, LEGACY_SOLO_BACKLOGS]
+            builds = {
+                "legacy": build(os.path.join(tmp, "legacy.db"), bot, [*gameplay, LEGACY_LOGS], False),
+                "migrations first": build(os.path.join(tmp, "first.db"), bot, gameplay, True),
+            }
+        finally:
+            bot.render_pool.close()
+            bot.close_databases()
+
+    failed = False
+    for label, actual in builds.items():
+        lines = differences(fresh, actual)
+        print(f"{label:<17} {'matches the fresh schema' if not lines else 'DIFFERS from the fresh schema'}")
+        for line in lines:
+            print(line)
+        failed = failed or bool(lines)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Synthetic community for the offline benchmarks.
+
+``populate`` fills a database that already has the bot's schema (main.py's
+tables, the migrations and the GoalSystem tables) with a deterministic
+community sized by ``CommunitySpec``:
+
+* ``games`` tracked games, with a long-tailed popularity, and the hunters
+  signed up to them;
+* a solo backlog of about ``backlog`` rows per user. Roughly half are
+  completed, with dates over the last two years and some ratings; the rest
+  are in progress or not started;
+* ``goals`` personal goals per user, drawn mostly from their own backlog;
+* ``templates`` official goal templates, each copied by ``subscribers``
+  users as a synced template copy;
+* ``logs`` audit rows.
+
+The returned ``Community`` remembers who holds what, so a benchmark can pick
+arguments that hit the interesting paths (a game the user is actually
+hunting, a goal they actually have) rather than "not found" replies.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import string
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import NamedTuple
+
+from backlog_keys import normalize_game_name
+
+
+FIRST_USER_ID = 100_000_000_000_000_000
+
+WORDS = (
+    "Ashen", "Blighted", "Crimson", "Dread", "Elden", "Forsaken", "Gilded", "Hollow", "Iron", "Jade",
+    "Kindled", "Lost", "Molten", "Nameless", "Obsidian", "Pale", "Quiet", "Ruined", "Sunken", "Twilight",
+    "Umbral", "Veiled", "Withered", "Xeno", "Yawning", "Zealous",
+)
+NOUNS = (
+    "Crown", "Depths", "Echoes", "Frontier", "Garden", "Hunt", "Kingdom", "Legacy", "Odyssey", "Protocol",
+    "Requiem", "Saga", "Tides", "Vigil", "Wastes",
+)
+PLATFORMS = ("", "", "", " (PS5)", " (PS4)", " (Vita)")
+
+
+class CommunitySpec(NamedTuple):
+    users: int = 500
+    games: int = 2_000
+    backlog: int = 40         # average solo backlog rows per user
+    goals: int = 2            # personal goals per user
+    templates: int = 20       # official goal templates
+    subscribers: int = 100    # users holding a synced copy of each template
+    logs: int = 50_000
+
+
+@dataclass
+class Community:
+    spec: CommunitySpec
+    users: list[tuple[int, str]] = field(default_factory=list)          # (id, name)
+    games: list[str] = field(default_factory=list)                      # most popular first
+    joined: dict[int, list[str]] = field(default_factory=dict)          # user_games, by user
+    backlogs: dict[int, dict[str, list[str]]] = field(default_factory=dict)  # status -> games
+    goals: dict[int, list[str]] = field(default_factory=dict)           # goal titles, copies included
+    templates: list[tuple[str, str]] = field(default_factory=list)      # (goal_type, title)
+    copied: dict[int, set[str]] = field(default_factory=dict)           # template titles held
+
+
+def game_names(count: int, rng: random.Random) -> list[str]:
+    names = []
+    for i in range(count):
+        name = f"{rng.choice(WORDS)} {rng.choice(NOUNS)}"
+        if i >= len(WORDS) * len(NOUNS):
+            name += f" {i // (len(WORDS) * len(NOUNS)) + 1}"
+        names.append(name + rng.choice(PLATFORMS))
+    # Exact duplicates are possible above; tracked game names are unique.
+    return list(dict.fromkeys(names))
+
+
+def populate(conn: sqlite3.Connection, spec: CommunitySpec, seed: int = 1) -> Community:
+    rng = random.Random(seed)
+    community = Community(spec)
+    community.games = game_names(spec.games, rng)
+    popularity = [1 / (rank + 1) ** 0.8 for rank in range(len(community.games))]
+    today = date.today()
+
+    def pick_games(k: int) -> list[str]:
+        return list(dict.fromkeys(rng.choices(community.games, popularity, k=k)))
+
+    conn.executemany("INSERT INTO games (game_name) VALUES (?)", [(name,) for name in community.games])
+    game_ids = dict(conn.execute("SELECT game_name, id FROM games"))
+
+    user_games, backlog_rows = [], []
+    for u in range(spec.users):
+        user_id, user_name = FIRST_USER_ID + u, f"hunter{u:05d}"
+        community.users.append((user_id, user_name))
+
+        joined = community.joined[user_id] = pick_games(max(1, spec.backlog // 4))
+        user_games.extend((str(user_id), user_name, game_ids[name]) for name in joined)
+
+        statuses = community.backlogs[user_id] = {"completed": [], "in progress": [], "not started": []}
+        for name in pick_games(rng.randint(max(1, spec.backlog // 2), max(1, spec.backlog * 3 // 2))):
+            roll = rng.random()
+            if roll < 0.5:
+                done = today - timedelta(days=rng.randint(0, 730))
+                rating = rng.randint(1, 5) if rng.random() < 0.3 else None
+                comments = f"{rng.choice(WORDS)} and {rng.choice(WORDS).lower()}." if rating else None
+                backlog_rows.append((str(user_id), user_name, name, normalize_game_name(name), "completed",
+                                     done.isoformat(), rating, comments))
+                statuses["completed"].append(name)
+            else:
+                status = "in progress" if roll < 0.7 else "not started"
+                backlog_rows.append((str(user_id), user_name, name, normalize_game_name(name), status, None, None, None))
+                statuses[status].append(name)
+
+    conn.executemany("INSERT INTO user_games (user_id, user_name, game_id) VALUES (?, ?, ?)", user_games)
+    conn.executemany(
+        """INSERT INTO solo_backlogs
+           (user_id, user_name, game_name, normalized_game_name, status, completion_date, rating, comments)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        backlog_rows,
+    )
+
+    _populate_goals(conn, community, rng, pick_games)
+
+    logs = []
+    for _ in range(spec.logs):
+        user_id, user_name = rng.choice(community.users)
+        command = rng.choice(("trackhunt", "joinhunt", "leavehunt", "newhunt", "finishhunt", "giveup"))
+        logs.append((user_name, command, rng.choice(community.games), str(user_id), "GUILD:1", None))
+    conn.executemany(
+        "INSERT INTO logs (user, command, game_name, user_id, location, extra) VALUES (?, ?, ?, ?, ?, ?)", logs
+    )
+    return community
+
+
+def _populate_goals(conn: sqlite3.Connection, community: Community, rng: random.Random, pick_games) -> None:
+    # Imported here: goal_system pulls in database, which reads HUNTERS_LEDGER_DB
+    # on import, and the benchmark sets that first.
+    from goal_system import GOAL_TYPES
+
+    spec = community.spec
+    for user_id, _ in community.users:
+        community.goals[user_id] = []
+        community.copied[user_id] = set()
+
+    for t in range(spec.templates):
+        goal_type = GOAL_TYPES[t % (len(GOAL_TYPES) - 1)]  # no personal templates
+        title = f"{rng.choice(WORDS)} {goal_type.title()} Challenge {t + 1}"
+        template_id = conn.execute(
+            """INSERT INTO goal_templates (goal_type, title, description, created_by_user_id, created_by_user_name)
+               VALUES (?, ?, ?, ?, ?)""",
+            (goal_type, title, "Benchmark template", str(FIRST_USER_ID), "hunter00000"),
+        ).lastrowid
+        community.templates.append((goal_type, title))
+        items = _goal_items(goal_type, pick_games(rng.randint(10, 30)))
+        conn.executemany(
+            """INSERT INTO goal_template_items (template_id, game_name, normalized_game_name, slot_label, sort_order)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(template_id, *item) for item in items],
+        )
+        item_ids = [row[0] for row in conn.execute(
+            "SELECT id FROM goal_template_items WHERE template_id = ? ORDER BY sort_order", (template_id,)
+        )]
+        for user_id, user_name in rng.sample(community.users, min(spec.subscribers, len(community.users))):
+            goal_id = conn.execute(
+                """INSERT INTO user_goals (user_id, user_name, goal_type, title, source_template_id, is_template_copy)
+                   VALUES (?, ?, ?, ?, ?, 1)""",
+                (str(user_id), user_name, goal_type, title, template_id),
+            ).lastrowid
+            conn.executemany(
+                """INSERT INTO user_goal_items
+                   (user_goal_id, source_template_item_id, game_name, normalized_game_name, slot_label, sort_order)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(goal_id, item_id, *item) for item_id, item in zip(item_ids, items)],
+            )
+            community.goals[user_id].append(title)
+            community.copied[user_id].add(title)
+
+    for user_id, user_name in community.users:
+        backlog = [name for names in community.backlogs[user_id].values() for name in names]
+        for g in range(spec.goals):
+            goal_type = rng.choice(GOAL_TYPES)
+            title = f"My {goal_type.title()} Goal {g + 1}"
+            goal_id = conn.execute(
+                "INSERT INTO user_goals (user_id, user_name, goal_type, title) VALUES (?, ?, ?, ?)",
+                (str(user_id), user_name, goal_type, title),
+            ).lastrowid
+            names = rng.sample(backlog, min(len(backlog), rng.randint(5, 20))) + pick_games(3)
+            conn.executemany(
+                """INSERT INTO user_goal_items
+                   (user_goal_id, game_name, normalized_game_name, slot_label, sort_order, is_personal_addition)
+                   VALUES (?, ?, ?, ?, ?, 1)""",
+                [(goal_id, *item) for item in _goal_items(goal_type, names)],
+            )
+            community.goals[user_id].append(title)
+
+
+def _goal_items(goal_type: str, names: list[str]) -> list[tuple[str, str, str | None, int]]:
+    """(game_name, normalized_game_name, slot_label, sort_order), one per normalised name."""
+    items, seen, letters = [], set(), iter(string.ascii_uppercase)
+    for name in names:
+        normalized = normalize_game_name(name)
+        if normalized in seen:
+            continue
+        slot = None
+        if goal_type == "az":
+            slot = next(letters, None)
+            if slot is None:
+                break
+        seen.add(normalized)
+        items.append((name, normalized, slot, len(items)))
+    return items
@@ -0,0 +1,139 @@
+"""Stand-ins for the discord.py objects a command handler touches.
+
+The benchmarks drive the real handlers — main.py's commands and the
+GoalSystem and CalendarInvite cogs — without a gateway connection. A
+``FakeInteraction`` carries a ``FakeUser`` and a guild, and its ``response``
+and ``followup`` record every call as a ``Sent`` entry instead of talking
+to Discord, stamped with when it happened, so a run can be checked and
+timed to its first response.
+
+Only the attributes the handlers actually read are provided; a handler that
+reaches for something else fails loudly with ``AttributeError``.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from discord import app_commands
+
+
+class Sent(NamedTuple):
+    kind: str                # "message", "defer", "modal", "edit", "followup", "edit_original"
+    content: Any             # message text, or the modal for "modal"
+    kwargs: dict[str, Any]   # embed, view, file, ephemeral, ...
+    at: float                # time.perf_counter() when it was sent
+
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+    def with_size(self, size: int) -> FakeAsset:
+        return FakeAsset(f"{self.url.split('?')[0]}?size={size}")
+
+
+class FakeUser:
+    def __init__(self, user_id: int, name: str, *, administrator: bool = False):
+        self.id = user_id
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+        self.roles: list[Any] = []
+        self.guild_permissions = SimpleNamespace(administrator=administrator)
+        self.display_avatar = FakeAsset(f"https://cdn.discordapp.com/avatars/{user_id}/{user_id:x}.png?size=1024")
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int = 1):
+        self.id = guild_id
+        self.name = "Hunter's Haven"
+
+
+class FakeResponse:
+    def __init__(self, interaction: FakeInteraction):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _record(self, kind: str, content: Any, kwargs: dict[str, Any]) -> None:
+        if self._done:
+            # What discord.py raises as InteractionResponded.
+            raise RuntimeError(f"interaction already responded to ({kind})")
+        self._done = True
+        self._interaction._record(kind, content, kwargs)
+
+    async def send_message(self, content: Any = None, **kwargs: Any) -> None:
+        self._record("message", content, kwargs)
+
+    async def defer(self, **kwargs: Any) -> None:
+        self._record("defer", None, kwargs)
+
+    async def send_modal(self, modal: Any) -> None:
+        self._record("modal", modal, {})
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        self._record("edit", kwargs.get("content"), kwargs)
+
+
+class FakeFollowup:
+    def __init__(self, interaction: FakeInteraction):
+        self._interaction = interaction
+
+    async def send(self, content: Any = None, **kwargs: Any) -> None:
+        self._interaction._record("followup", content, kwargs)
+
+
+class FakeInteraction:
+    def __init__(self, user: FakeUser, *, guild: FakeGuild | None = None, namespace: dict[str, Any] | None = None):
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.namespace = SimpleNamespace(**(namespace or {}))
+        self.created_at = datetime.now(timezone.utc)
+        self.created = time.perf_counter()
+        self.sent: list[Sent] = []
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    def _record(self, kind: str, content: Any, kwargs: dict[str, Any]) -> None:
+        self.sent.append(Sent(kind, content, kwargs, time.perf_counter()))
+
+    async def edit_original_response(self, **kwargs: Any) -> None:
+        self._record("edit_original", kwargs.get("content"), kwargs)
+
+    @property
+    def first_response_ms(self) -> float | None:
+        return (self.sent[0].at - self.created) * 1000 if self.sent else None
+
+
+def bind(command: app_commands.Command) -> Callable[..., Awaitable[Any]]:
+    """``command``'s callback as ``fn(interaction, **params)``, bound to its cog if it has one.
+
+    Checks and argument transformers are skipped: the benchmarks pass already
+    converted values (``FakeUser`` for users, ``app_commands.Choice`` for choices).
+    """
+    if command.binding is None:
+        return command.callback
+    return lambda interaction, **params: command.callback(command.binding, interaction, **params)
+
+
+def bind_autocomplete(command: app_commands.Command, option: str) -> Callable[..., Awaitable[Any]] | None:
+    """The autocomplete callback of ``command``'s ``option`` as ``fn(interaction, current)``, if it has one."""
+    param = command._params.get(option)
+    callback = param.autocomplete if param is not None else None
+    if callback is None:
+        return None
+    if getattr(callback, "pass_command_binding", False):
+        return lambda interaction, current: callback(command.binding, interaction, current)
+    return callback
@@ -0,0 +1,300 @@
+"""Replay a recorded interaction trace against a copy of the database.
+
+Takes a trace written with ``INTERACTION_TRACE_FILE`` (see
+interaction_trace.py) and a database: ideally a /backupdb copy from when
+recording started, so the commands find the state they originally saw. The
+database is copied into a temporary directory and main.py is imported
+against the copy, as in bench_commands.py. Then every traced command and
+autocomplete is fired at its original offset divided by ``--speed``
+(1x, 10x, 100x, ...). Commands run through the real handlers with
+``fake_discord`` interactions. At most ``--concurrency`` are in flight;
+the rest wait their turn, as they would behind a saturated bot.
+
+Latency is measured from when an interaction was due, so queueing and event
+loop contention are included. The report gives, per command:
+
+* runs, errors and how many missed Discord's 3 s acknowledgement window;
+* time to first response (p50/p95/p99) and handler wall time (p95);
+* database calls per run.
+
+Overall, it gives the achieved rate, the peak number of interactions in
+flight and the event loop's worst lag and stalls. Context menus (none yet)
+are skipped. Avatars and covers are seeded offline for the users and games
+in the trace, so nothing touches the network.
+
+    python benchmarks/replay_trace.py trace.jsonl --db backups/hunters_ledger_20260101.db
+        [--speed 10] [--concurrency 16] [--only finishhunt generatecard] [--save replay.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, NamedTuple
+
+from discord import AppCommandOptionType, app_commands
+from discord.app_commands.transformers import ChoiceTransformer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_commands import percentiles, load_bot, seed_avatars, seed_covers  # noqa: E402
+from fake_discord import FakeGuild, FakeInteraction, FakeUser, bind, bind_autocomplete  # noqa: E402
+
+
+ACK_WINDOW_MS = 3000.0
+USER_OPTION_TYPES = (AppCommandOptionType.user, AppCommandOptionType.mentionable)
+
+
+def read_trace(path: str, only: list[str] | None, limit: int | None) -> list[dict[str, Any]]:
+    entries = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # The last line of a trace copied mid-write can be partial.
+                continue
+            if only and entry["n"].split(" ")[0] not in only:
+                continue
+            entries.append(entry)
+    entries.sort(key=lambda entry: entry["t"])
+    return entries[:limit] if limit else entries
+
+
+def copy_database(source: str, target: str) -> None:
+    """Consistent copy, even of a database the bot is writing to."""
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+class Replayer:
+    def __init__(self, main, speed: float, concurrency: int):
+        self.tree = main.bot.tree
+        self.speed = speed
+        self.slots = asyncio.Semaphore(concurrency)
+        self.users: dict[int, FakeUser] = {}
+        self.guilds: dict[int, FakeGuild] = {}
+        self.results: dict[str, list[Result]] = defaultdict(list)
+        self.skipped: dict[str, int] = defaultdict(int)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def user(self, user_id: int | str, name: str | None = None) -> FakeUser:
+        user_id = int(user_id)
+        if user_id not in self.users:
+            self.users[user_id] = FakeUser(user_id, name or f"user{user_id}")
+        return self.users[user_id]
+
+    def command(self, name: str) -> app_commands.Command | None:
+        parts = name.split(" ")
+        command = self.tree.get_command(parts[0])
+        for part in parts[1:]:
+            command = command.get_command(part) if isinstance(command, app_commands.Group) else None
+        return command if isinstance(command, app_commands.Command) else None
+
+    def arguments(self, command: app_commands.Command, raw: dict[str, Any]) -> dict[str, Any]:
+        """Raw option values as the handler receives them after discord.py's transformers."""
+        params = {}
+        for name, value in raw.items():
+            param = command._params.get(name)
+            if param is None or value is None:
+                continue
+            if isinstance(param._annotation, ChoiceTransformer):
+                value = next((c for c in param.choices if c.value == value), app_commands.Choice(name=str(value), value=value))
+            elif param.type in USER_OPTION_TYPES:
+                value = self.user(value)
+            params[name] = value
+        return params
+
+    async def replay(self, entries: list[dict[str, Any]]) -> float:
+        if not entries:
+            return 0.0
+        start, first_t = time.perf_counter(), entries[0]["t"]
+        tasks = []
+        for entry in entries:
+            due = start + (entry["t"] - first_t) / self.speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.run(entry, due)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    async def run(self, entry: dict[str, Any], due: float) -> None:
+        from database import track_queries
+
+        kind, name = entry["k"], entry["n"]
+        command = self.command(name) if kind in ("command", "autocomplete") else None
+        if command is None:
+            self.skipped[f"{kind}:{name}"] += 1
+            return
+        params = self.arguments(command, entry["p"])
+        if kind == "autocomplete":
+            handler = bind_autocomplete(command, entry.get("fo", ""))
+            if handler is None:
+                self.skipped[f"{kind}:{name}"] += 1
+                return
+            call_params = {"current": entry["p"].get(entry["fo"]) or ""}
+            label = f"{name}:{entry['fo']}"
+        else:
+            handler, call_params, label = bind(command), params, name
+
+        guild_id = entry.get("g")
+        guild = self.guilds.setdefault(int(guild_id), FakeGuild(int(guild_id))) if guild_id else None
+        interaction = FakeInteraction(self.user(entry["u"], entry.get("un")), guild=guild, namespace=params)
+        # Latency counts from when the interaction was due, not from when a slot freed up.
+        interaction.created = due
+
+        async with self.slots:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            tally = track_queries()
+            started = time.perf_counter()
+            error = None
+            try:
+                result = await handler(interaction, **call_params)
+            except Exception as e:
+                error, result = e, None
+            finished = time.perf_counter()
+            self.in_flight -= 1
+
+        if kind == "autocomplete":
+            first_ms = (finished - due) * 1000 if result is not None else None
+        else:
+            first_ms = interaction.first_response_ms
+        self.results[label].append(Result((finished - started) * 1000, first_ms, tally.calls, error))
+
+
+class Result(NamedTuple):
+    wall_ms: float
+    first_response_ms: float | None    # from when it was due; None if it never answered
+    db_calls: int
+    error: BaseException | None
+
+
+def summarise(results: list[Result]) -> dict[str, Any]:
+    errors = [r.error for r in results if r.error is not None]
+    answered = [r.first_response_ms for r in results if r.first_response_ms is not None]
+    return {
+        "runs": len(results),
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "ack_missed": sum(1 for r in results if r.first_response_ms is None or r.first_response_ms > ACK_WINDOW_MS),
+        "first_response_ms": percentiles(answered),
+        "wall_ms": percentiles([r.wall_ms for r in results]),
+        "db_calls": statistics.fmean(r.db_calls for r in results),
+    }
+
+
+async def run(args, entries: list[dict[str, Any]]) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        copy_database(args.db, os.path.join(tmp, "hunters_ledger.db"))
+        main = load_bot(tmp)
+        try:
+            await main.bot.load_extension("calendar_invite")
+            await main.bot.load_extension("goal_system")
+            main.game_index.load(row[0] for row in await main.db.fetchall("SELECT game_name FROM games"))
+            seed_avatars(main, list({int(e["u"]): e.get("un") or f"user{e['u']}" for e in entries}.items()))
+            seed_covers(main, sorted({e["p"]["game_name"] for e in entries if e["n"] == "generatecard" and e["p"].get("game_name")}))
+            main.audit_log.start()
+            main.loop_monitor.start()
+
+            replayer = Replayer(main, args.speed, args.concurrency)
+            elapsed = await replayer.replay(entries)
+
+            main.loop_monitor.stop()
+            loop = main.loop_monitor.snapshot()
+        finally:
+            await main.audit_log.close()
+            await main.close_session()
+            main.render_pool.close()
+            main.close_databases()
+
+    span = entries[-1]["t"] - entries[0]["t"] if entries else 0.0
+    replayed = sum(len(results) for results in replayer.results.values())
+    return {
+        "meta": {
+            "trace": os.path.abspath(args.trace),
+            "db": os.path.abspath(args.db),
+            "speed": args.speed,
+            "concurrency": args.concurrency,
+            "trace_seconds": span,
+            "replay_seconds": elapsed,
+        },
+        "totals": {
+            "interactions": replayed,
+            "per_second": replayed / elapsed if elapsed else 0.0,
+            "peak_in_flight": replayer.peak_in_flight,
+            "ack_missed": sum(summarise(r)["ack_missed"] for r in replayer.results.values()),
+            "loop_lag_max_ms": loop["lag_max_ms"],
+            "loop_stalls": loop["stalls"],
+            "skipped": dict(replayer.skipped),
+        },
+        "commands": {label: summarise(results) for label, results in replayer.results.items()},
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    meta, totals = report["meta"], report["totals"]
+    print(f"replayed {totals['interactions']:,} interactions from {meta['trace_seconds']:,.0f} s of trace "
+          f"in {meta['replay_seconds']:,.1f} s at {meta['speed']:g}x, concurrency {meta['concurrency']} "
+          f"({totals['per_second']:,.1f}/s, peak {totals['peak_in_flight']} in flight)")
+    print(f"{'command':<28} {'runs':>6} {'err':>4} {'>3s':>5} {'1st p50':>8} {'1st p95':>8} {'1st p99':>8} "
+          f"{'wall p95':>9} {'db/run':>7}")
+    rows = sorted(report["commands"].items(), key=lambda item: item[1]["runs"], reverse=True)
+    for label, s in rows:
+        first = s["first_response_ms"]
+        print(f"{label[:28]:<28} {s['runs']:>6} {s['errors']:>4} {s['ack_missed']:>5} "
+              f"{first.get('p50', float('nan')):>8.1f} {first.get('p95', float('nan')):>8.1f} "
+              f"{first.get('p99', float('nan')):>8.1f} {s['wall_ms']['p95']:>9.1f} {s['db_calls']:>7.1f}")
+        if s["first_error"]:
+            print(f"    first error: {s['first_error']}")
+    print(f"missed the 3 s window: {totals['ack_missed']}; event loop: max lag {totals['loop_lag_max_ms']:.0f} ms, "
+          f"{totals['loop_stalls']} stalls")
+    if totals["skipped"]:
+        print("skipped: " + ", ".join(f"{name} x{count}" for name, count in sorted(totals["skipped"].items())))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace", help="trace file written with INTERACTION_TRACE_FILE")
+    parser.add_argument("--db", required=True, help="database to replay against (copied, never modified)")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression: 10 replays an hour in 6 minutes")
+    parser.add_argument("--concurrency", type=int, default=16, help="most interactions in flight at once")
+    parser.add_argument("--only", nargs="+", metavar="COMMAND", help="replay only these commands (and their autocompletes)")
+    parser.add_argument("--limit", type=int, help="replay only the first N interactions")
+    parser.add_argument("--save", metavar="JSON", help="write the report here")
+    args = parser.parse_args()
+    if args.speed <= 0 or args.concurrency < 1:
+        parser.error("--speed must be positive and --concurrency at least 1")
+    # Resolve paths before load_bot changes directory.
+    args.trace, args.db = os.path.abspath(args.trace), os.path.abspath(args.db)
+    args.save = os.path.abspath(args.save) if args.save else None
+
+    entries = read_trace(args.trace, args.only, args.limit)
+    report = asyncio.run(run(args, entries))
+    print_report(report)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"saved {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""Latency and database-load metrics for every app command and autocomplete.
+
+``InstrumentedTree`` is the bot's ``CommandTree``. Every slash command,
+context menu and autocomplete handler — main.py's and the GoalSystem and
+CalendarInvite cogs' alike — is dispatched through ``CommandTree._call``,
+so wrapping that one method measures all of them:
+
+* wall time of the handler;
+* time to first response (defer, message, modal or autocomplete choices);
+* database calls awaited and the time spent awaiting them (``track_queries``;
+  one ``db.read``/``db.write`` unit of work counts as one call);
+* outcome — ``ok`` or ``error`` (the command failed, or an autocomplete
+  never answered);
+* whether the interaction missed Discord's ``ACK_WINDOW_SECONDS`` window,
+  measured from its creation (so time spent waiting for a blocked event loop
+  counts). Misses are also kept, newest last, in ``CommandMetrics.ack_misses``.
+
+``CommandMetrics`` keeps the last ``COMMAND_METRICS_WINDOW`` samples per
+handler for p50/p95/p99 plus lifetime counters, feeds the owner-only
+/commandstats command and is written every
+``COMMAND_METRICS_INTERVAL_SECONDS`` to ``COMMAND_METRICS_FILE`` in the
+Prometheus text format (summaries with quantiles), ready for node_exporter's
+textfile collector. An empty ``COMMAND_METRICS_FILE`` disables the file.
+
+discord.py has no public hook around dispatch or the first response, so
+this leans on three internals: ``CommandTree._call``, the
+``Interaction._cs_response`` slot behind ``Interaction.response`` and
+``InteractionResponse``'s constructor. requirements.txt pins discord.py to
+the minor release this was checked against. ``InstrumentedTree`` checks for
+them when it is built and, if they are gone, prints a warning and falls
+back to plain dispatch: commands keep working, only the metrics (and the
+interaction trace) stop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+import discord
+from discord import app_commands
+
+from database import track_queries
+from interaction_trace import TraceRecorder
+
+
+COMMAND_METRICS_FILE = os.getenv("COMMAND_METRICS_FILE", os.path.join("metrics", "hunters_ledger.prom"))
+COMMAND_METRICS_INTERVAL_SECONDS = float(os.getenv("COMMAND_METRICS_INTERVAL_SECONDS", "60"))
+COMMAND_METRICS_WINDOW = int(os.getenv("COMMAND_METRICS_WINDOW", "512"))
+ACK_WINDOW_SECONDS = 3.0
+ACK_MISS_HISTORY = 20
+
+QUANTILES = (50, 95, 99)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Sample(NamedTuple):
+    wall_ms: float
+    first_response_ms: float | None
+    db_calls: int
+    db_ms: float
+    ok: bool
+    ack_missed: bool = False
+
+
+class AckMiss(NamedTuple):
+    at: float                 # time.time() when the handler finished
+    kind: str
+    name: str
+    ack_ms: float | None      # creation to first response; None if it never answered
+
+
+class HandlerStats:
+    """Rolling window plus lifetime totals for one command or autocomplete."""
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.ack_missed = 0
+        self.wall_ms_total = 0.0
+        self.db_calls_total = 0
+        self.db_ms_total = 0.0
+        self.wall_ms: deque[float] = deque(maxlen=window)
+        self.first_response_ms: deque[float] = deque(maxlen=window)
+        self.db_ms: deque[float] = deque(maxlen=window)
+        self.db_calls: deque[int] = deque(maxlen=window)
+
+    def add(self, sample: Sample) -> None:
+        self.count += 1
+        self.errors += not sample.ok
+        self.ack_missed += sample.ack_missed
+        self.wall_ms_total += sample.wall_ms
+        self.db_calls_total += sample.db_calls
+        self.db_ms_total += sample.db_ms
+        self.wall_ms.append(sample.wall_ms)
+        if sample.first_response_ms is not None:
+            self.first_response_ms.append(sample.first_response_ms)
+        self.db_ms.append(sample.db_ms)
+        self.db_calls.append(sample.db_calls)
+
+    def snapshot(self) -> dict[str, Any]:
+        wall = sorted(self.wall_ms)
+        first = sorted(self.first_response_ms)
+        db = sorted(self.db_ms)
+        snap: dict[str, Any] = {
+            "count": self.count,
+            "errors": self.errors,
+            "ack_missed": self.ack_missed,
+            "db_calls_avg": sum(self.db_calls) / len(self.db_calls) if self.db_calls else 0.0,
+            "db_calls_max": max(self.db_calls, default=0),
+        }
+        for q in QUANTILES:
+            snap[f"wall_p{q}_ms"] = _percentile(wall, q)
+            snap[f"first_response_p{q}_ms"] = _percentile(first, q)
+            snap[f"db_p{q}_ms"] = _percentile(db, q)
+        return snap
+
+
+class CommandMetrics:
+    def __init__(self, window: int = COMMAND_METRICS_WINDOW):
+        self.window = window
+        # (kind, name) -> stats; kind is "command", "autocomplete" or "context_menu"
+        self.handlers: dict[tuple[str, str], HandlerStats] = {}
+        self.ack_misses: deque[AckMiss] = deque(maxlen=ACK_MISS_HISTORY)
+
+    @property
+    def ack_missed_total(self) -> int:
+        return sum(stats.ack_missed for stats in self.handlers.values())
+
+    def observe(self, kind: str, name: str, sample: Sample) -> None:
+        stats = self.handlers.get((kind, name))
+        if stats is None:
+            stats = self.handlers[(kind, name)] = HandlerStats(self.window)
+        stats.add(sample)
+
+    def snapshot(self) -> dict[tuple[str, str], dict[str, Any]]:
+        return {key: stats.snapshot() for key, stats in self.handlers.items()}
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+
+        def family(metric: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        snapshot = self.snapshot()
+        labels = {key: f'kind="{key[0]}",command="{_escape(key[1])}"' for key in self.handlers}
+
+        family("ledger_command_invocations_total", "counter", "App command and autocomplete invocations.")
+        for key, stats in self.handlers.items():
+            lines.append(f"ledger_command_invocations_total{{{labels[key]}}} {stats.count}")
+        family("ledger_command_errors_total", "counter", "Invocations that failed.")
+        for key, stats in self.handlers.items():
+            lines.append(f"ledger_command_errors_total{{{labels[key]}}} {stats.errors}")
+        family("ledger_command_ack_missed_total", "counter", f"Interactions not acknowledged within {ACK_WINDOW_SECONDS:g}s.")
+        for key, stats in self.handlers.items():
+            lines.append(f"ledger_command_ack_missed_total{{{labels[key]}}} {stats.ack_missed}")
+        family("ledger_command_db_calls_total", "counter", "Database calls awaited by handlers.")
+        for key, stats in self.handlers.items():
+            lines.append(f"ledger_command_db_calls_total{{{labels[key]}}} {stats.db_calls_total}")
+
+        for metric, field, help_text, total in (
+            ("ledger_command_duration_seconds", "wall", "Handler wall time.", "wall_ms_total"),
+            ("ledger_command_first_response_seconds", "first_response", "Time to the first interaction response.", None),
+            ("ledger_command_db_seconds", "db", "Time handlers spent awaiting the database.", "db_ms_total"),
+        ):
+            family(metric, "summary", f"{help_text} Quantiles over the last {self.window} calls.")
+            for key, stats in self.handlers.items():
+                for q in QUANTILES:
+                    value = snapshot[key][f"{field}_p{q}_ms"] / 1000
+                    lines.append(f'{metric}{{{labels[key]},quantile="{q / 100}"}} {value:.6f}')
+                if total is not None:
+                    lines.append(f"{metric}_sum{{{labels[key]}}} {getattr(stats, total) / 1000:.6f}")
+                    lines.append(f"{metric}_count{{{labels[key]}}} {stats.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # The textfile collector must never read a half-written file.
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def timed_dispatch_supported() -> bool:
+    """Whether this discord.py still has the internals ``InstrumentedTree`` wraps."""
+    response = discord.Interaction.__dict__.get("response")
+    return (
+        callable(getattr(app_commands.CommandTree, "_call", None))
+        and "_cs_response" in getattr(discord.Interaction, "__slots__", ())
+        and getattr(response, "name", None) == "_cs_response"
+        and isinstance(getattr(discord.InteractionResponse, "type", None), property)
+    )
+
+
+class _TimedResponse(discord.InteractionResponse):
+    """InteractionResponse that remembers when the first response went out."""
+
+    __slots__ = ("responded_at",)
+
+    def __init__(self, parent: discord.Interaction):
+        super().__init__(parent)
+        self.responded_at: float | None = None
+
+
+def _timed(name: str):
+    async def method(self: _TimedResponse, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await getattr(super(_TimedResponse, self), name)(*args, **kwargs)
+        finally:
+            if self.responded_at is None and self.type is not None:
+                self.responded_at = time.perf_counter()
+
+    method.__name__ = name
+    return method
+
+
+for _name in ("defer", "send_message", "edit_message", "send_modal", "autocomplete", "launch_activity", "pong"):
+    if hasattr(discord.InteractionResponse, _name):
+        setattr(_TimedResponse, _name, _timed(_name))
+
+
+class InstrumentedTree(app_commands.CommandTree):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = CommandMetrics()
+        # Set by main.py when INTERACTION_TRACE_FILE is configured
+        self.trace: TraceRecorder | None = None
+        self.instrumented = timed_dispatch_supported()
+        if not self.instrumented:
+            print(f"discord.py {discord.__version__} changed the internals command metrics wrap; "
+                  "dispatching without metrics or the interaction trace")
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        if not self.instrumented:
+            return await super()._call(interaction)
+        started = time.perf_counter()
+        # Discord's acknowledgement clock starts when the interaction is created.
+        dispatch_delay = max(0.0, time.time() - interaction.created_at.timestamp())
+        tally = track_queries()
+        response = None
+        if not hasattr(interaction, "_cs_response"):
+            # Pre-fill the slot behind Interaction.response with the timed variant
+            response = _TimedResponse(interaction)
+            interaction._cs_response = response
+
+        data: dict = interaction.data or {}  # type: ignore[assignment]
+        if interaction.type is discord.InteractionType.autocomplete:
+            kind = "autocomplete"
+        elif data.get("type", 1) != 1:
+            kind = "context_menu"
+        else:
+            kind = "command"
+
+        ok = False
+        try:
+            await super()._call(interaction)
+            ok = not interaction.command_failed
+            if kind == "autocomplete":
+                # Autocomplete errors are logged and swallowed by discord.py.
+                ok = interaction.response.is_done()
+        finally:
+            command = interaction.command
+            name = command.qualified_name if command is not None else data.get("name", "unknown")
+            first = response.responded_at if response is not None else None
+            first_ms = (first - started) * 1000 if first is not None else None
+            ack_ms = dispatch_delay * 1000 + first_ms if first_ms is not None else None
+            # Without the timed response the ack time is unknown, not missed.
+            ack_missed = response is not None and (ack_ms is None or ack_ms > ACK_WINDOW_SECONDS * 1000)
+            if ack_missed:
+                self.metrics.ack_misses.append(AckMiss(time.time(), kind, name, ack_ms))
+            wall_ms = (time.perf_counter() - started) * 1000
+            self.metrics.observe(kind, name, Sample(
+                wall_ms=wall_ms,
+                first_response_ms=first_ms,
+                db_calls=tally.calls,
+                db_ms=tally.seconds * 1000,
+                ok=ok,
+                ack_missed=ack_missed,
+            ))
+            if self.trace is not None:
+                self.trace.record(
+                    interaction, kind, name,
+                    wall_ms=wall_ms, first_response_ms=first_ms, db_calls=tally.calls, ok=ok,
+                )
+
+
+async def dump_metrics_periodically(
+    metrics: CommandMetrics,
+    path: str = COMMAND_METRICS_FILE,
+    interval: float = COMMAND_METRICS_INTERVAL_SECONDS,
+) -> None:
+    """Rewrite the Prometheus file every ``interval`` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(metrics.write_prometheus, path)
+        except OSError as e:
+            print(f"Could not write command metrics to {path}: {e!r}")
+
+
+def format_command_stats(metrics: CommandMetrics, limit: int = 15, kind: str | None = None) -> str:
+    """Plain-text table of the slowest handlers by p95 wall time."""
+    rows = sorted(
+        ((key, snap) for key, snap in metrics.snapshot().items() if kind is None or key[0] == kind),
+        key=lambda item: item[1]["wall_p95_ms"],
+        reverse=True,
+    )[:limit]
+    if not rows:
+        return "No commands recorded yet."
+    lines = [f"{'command':<22} {'n':>6} {'err':>4} {'p50':>7} {'p95':>7} {'p99':>7} {'1st p95':>8} {'db/call':>7} {'db p95':>7}"]
+    for (k, name), s in rows:
+        label = f"{name} (ac)" if k == "autocomplete" else name
+        lines.append(
+            f"{label[:22]:<22} {s['count']:>6} {s['errors']:>4} {s['wall_p50_ms']:>7.0f} {s['wall_p95_ms']:>7.0f} "
+            f"{s['wall_p99_ms']:>7.0f} {s['first_response_p95_ms']:>8.0f} {s['db_calls_avg']:>7.1f} {s['db_p95_ms']:>7.0f}"
+        )
+    return "\n".join(lines)
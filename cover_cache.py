@@ -0,0 +1,246 @@
+"""On-disk cache of SteamGridDB covers for /generatecard.
+
+Every card used to cost two SteamGridDB API calls and a full-size download,
+and left a ``resources/{game_name}_cover.jpg`` behind named after whatever
+the user typed. Covers now live under ``COVER_CACHE_DIR``:
+
+* ``index.sqlite`` maps the normalised game name to the SteamGridDB id, image
+  URL, stored file, size and timestamps;
+* each cover is stored once, already resized to ``COVER_SIZE`` and encoded as
+  PNG, under a file name derived from a hash of the key — never from user
+  input.
+
+Hits are served from disk with no network access. Entries expire after
+``COVER_TTL_SECONDS``; a refresh reuses the known SteamGridDB id so it skips
+the search call. "Not found" answers (SteamGridDB replied and had no game or
+no grid) are cached too, for the shorter ``COVER_NEGATIVE_TTL_SECONDS``. A
+failed fetch (network error, timeout, missing API key, 429, 5xx) is not
+stored: the game is only left alone for ``COVER_RETRY_SECONDS``, in memory,
+and an expired cover still on disk is served meanwhile. When the stored covers exceed
+``COVER_CACHE_MAX_BYTES`` the least recently used ones are evicted.
+Concurrent requests for the same game share one fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import os
+import sqlite3
+import time
+
+from PIL import Image
+
+from backlog_keys import normalize_game_name
+from banner import COVER_SIZE
+from database import Database, get_database
+from singleflight import SingleFlight
+from steamgriddb import fetch_grid_url, search_game_id
+from web_client import FetchError, get_bytes
+
+
+COVER_CACHE_DIR = os.getenv("COVER_CACHE_DIR", os.path.join("cache", "covers"))
+COVER_TTL_SECONDS = int(os.getenv("COVER_TTL_SECONDS", str(30 * 24 * 3600)))
+COVER_NEGATIVE_TTL_SECONDS = int(os.getenv("COVER_NEGATIVE_TTL_SECONDS", str(6 * 3600)))
+COVER_RETRY_SECONDS = int(os.getenv("COVER_RETRY_SECONDS", "60"))
+COVER_CACHE_MAX_BYTES = int(os.getenv("COVER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+def cover_key(game_name: str) -> str:
+    """Cache key for a game name: the same key the backlog stores (see backlog_keys)."""
+    return normalize_game_name(game_name)
+
+
+def _init_index(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS covers (
+            key TEXT PRIMARY KEY,
+            game_name TEXT NOT NULL,
+            sgdb_id INTEGER,
+            image_url TEXT,
+            file_name TEXT,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            fetched_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_covers_last_used ON covers (last_used)")
+
+
+def _lookup(conn: sqlite3.Connection, key: str) -> sqlite3.Row | None:
+    return conn.execute("SELECT * FROM covers WHERE key = ?", (key,)).fetchone()
+
+
+def _touch(conn: sqlite3.Connection, key: str, now: float) -> None:
+    conn.execute("UPDATE covers SET last_used = ? WHERE key = ?", (now, key))
+
+
+def _store(conn: sqlite3.Connection, entry: tuple, max_bytes: int) -> list[str]:
+    """Upsert one entry, then evict LRU covers over budget; returns file names to delete."""
+    evicted = []
+    previous = conn.execute("SELECT file_name FROM covers WHERE key = ?", (entry[0],)).fetchone()
+    if previous is not None and previous[0] and previous[0] != entry[4]:
+        evicted.append(previous[0])
+
+    conn.execute("""
+        INSERT INTO covers (key, game_name, sgdb_id, image_url, file_name, bytes, fetched_at, last_used)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            game_name = excluded.game_name,
+            sgdb_id = excluded.sgdb_id,
+            image_url = excluded.image_url,
+            file_name = excluded.file_name,
+            bytes = excluded.bytes,
+            fetched_at = excluded.fetched_at,
+            last_used = excluded.last_used
+    """, entry)
+
+    total = conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM covers").fetchone()[0]
+    if total > max_bytes:
+        for key, file_name, size in conn.execute(
+            "SELECT key, file_name, bytes FROM covers WHERE file_name IS NOT NULL AND key != ? ORDER BY last_used ASC",
+            (entry[0],),
+        ).fetchall():
+            if total <= max_bytes:
+                break
+            conn.execute("DELETE FROM covers WHERE key = ?", (key,))
+            evicted.append(file_name)
+            total -= size
+    return evicted
+
+
+def _prepare_cover(raw: bytes) -> bytes:
+    """Decode a downloaded cover, resize it to COVER_SIZE and re-encode as PNG."""
+    with Image.open(io.BytesIO(raw)) as source:
+        cover = source.convert("RGBA").resize(COVER_SIZE, Image.LANCZOS)
+    buf = io.BytesIO()
+    cover.save(buf, "PNG")
+    return buf.getvalue()
+
+
+class CoverCache:
+    def __init__(
+        self,
+        directory: str = COVER_CACHE_DIR,
+        *,
+        ttl: int = COVER_TTL_SECONDS,
+        negative_ttl: int = COVER_NEGATIVE_TTL_SECONDS,
+        retry_seconds: int = COVER_RETRY_SECONDS,
+        max_bytes: int = COVER_CACHE_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.retry_seconds = retry_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.index: Database = get_database(os.path.join(directory, "index.sqlite"))
+        self.index.write_sync(_init_index)
+        self._inflight = SingleFlight()
+        # key -> time before which a failed fetch is not retried
+        self._retry_after: dict[str, float] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def _path(self, file_name: str) -> str:
+        return os.path.join(self.directory, file_name)
+
+    def _read_file(self, file_name: str) -> bytes | None:
+        try:
+            with open(self._path(file_name), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def _write_file(self, file_name: str, data: bytes) -> None:
+        path = self._path(file_name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+    def _remove_files(self, file_names: list[str]) -> None:
+        for file_name in file_names:
+            try:
+                os.remove(self._path(file_name))
+            except OSError:
+                pass
+
+    async def get(self, game_name: str, api_key: str | None) -> bytes | None:
+        """PNG bytes of the cover at COVER_SIZE, or None if SteamGridDB has none (or can't be reached)."""
+        key = cover_key(game_name)
+        now = time.time()
+        row = await self.index.read(_lookup, key)
+
+        if row is not None:
+            if row["file_name"] is None:
+                if now - row["fetched_at"] < self.negative_ttl:
+                    self.negative_hits += 1
+                    return None
+            elif now - row["fetched_at"] < self.ttl:
+                data = await asyncio.to_thread(self._read_file, row["file_name"])
+                if data is not None:
+                    self.hits += 1
+                    await self.index.write(_touch, key, now)
+                    return data
+
+        stale_file = row["file_name"] if row is not None else None
+        if not api_key or self._retry_after.get(key, 0.0) > now:
+            # A recent fetch failed, or there is no key to ask with: make do
+            # with whatever is on disk and don't record an answer.
+            return await self._read_stale(stale_file)
+
+        # Miss, expired or file gone: fetch once, however many cards want it.
+        if key not in self._inflight:
+            self.misses += 1
+        known_id = row["sgdb_id"] if row is not None else None
+        return await self._inflight.run(key, self._fetch, key, game_name, known_id, stale_file, api_key)
+
+    async def _read_stale(self, file_name: str | None) -> bytes | None:
+        return await asyncio.to_thread(self._read_file, file_name) if file_name else None
+
+    async def _fetch(
+        self, key: str, game_name: str, known_id: int | None, stale_file: str | None, api_key: str | None,
+    ) -> bytes | None:
+        try:
+            game_id = known_id if known_id is not None else await search_game_id(game_name, api_key)
+            image_url = await fetch_grid_url(game_id, api_key) if game_id is not None else None
+            raw = await get_bytes(image_url) if image_url else None
+        except FetchError as e:
+            # Not an answer about the game: leave the index as it is.
+            self.failures += 1
+            now = time.time()
+            self._retry_after = {k: t for k, t in self._retry_after.items() if t > now}
+            self._retry_after[key] = now + self.retry_seconds
+            print(f"Could not fetch the cover for '{game_name}': {e}")
+            return await self._read_stale(stale_file)
+        self._retry_after.pop(key, None)
+
+        if raw is None:
+            # Negative entry: remember the id (if any) but no file.
+            data, file_name = None, None
+        else:
+            data = await asyncio.to_thread(_prepare_cover, raw)
+            file_name = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".png"
+            await asyncio.to_thread(self._write_file, file_name, data)
+
+        now = time.time()
+        evicted = await self.index.write(
+            _store, (key, game_name, game_id, image_url, file_name, len(data or b""), now, now), self.max_bytes
+        )
+        if evicted:
+            await asyncio.to_thread(self._remove_files, evicted)
+        return data
+
+
+_cover_cache: CoverCache | None = None
+
+
+def get_cover_cache() -> CoverCache:
+    global _cover_cache
+    if _cover_cache is None:
+        _cover_cache = CoverCache()
+    return _cover_cache
@@ -0,0 +1,194 @@
+"""Async access layer for the Hunter's Ledger SQLite database.
+
+``sqlite3`` calls block, so nothing here runs on the event loop. Reads are
+spread over a small, bounded pool of worker threads that each own one
+connection; every write goes through a single writer thread so writes are
+applied one at a time and never fight each other for the file lock.
+
+Callers either use the one-statement helpers (``fetchone``/``fetchall``/
+``execute``) or pass a plain function that receives the connection, which is
+how multi-statement units of work run in a single transaction.
+
+There is one ``Database`` per file for the whole process: main.py and the
+cogs all get it from ``get_database()`` so the bot only ever has one writer.
+
+With ``SQL_PROFILE=1`` every connection is attached to the
+``query_profiler`` (per-statement timing and plans of slow statements).
+
+``track_queries()`` starts a per-task ``QueryTally`` of calls and the time
+spent awaiting them; the command metrics use it to attribute database work
+to each slash command.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, TypeVar
+
+from query_profiler import SQL_PROFILE, profiler
+
+
+T = TypeVar("T")
+
+DB_PATH = os.getenv("HUNTERS_LEDGER_DB", "hunters_ledger.db")
+DEFAULT_READERS = 4
+
+# Connection tuning, applied to every connection as it is opened.
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KIB = 16 * 1024
+MMAP_SIZE_BYTES = 256 * 1024 * 1024
+
+
+class QueryTally:
+    """Database calls made by one task (and the tasks it starts), with their wall time."""
+
+    __slots__ = ("calls", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+
+_query_tally: ContextVar[QueryTally | None] = ContextVar("query_tally", default=None)
+
+
+def track_queries() -> QueryTally:
+    """Count every ``read``/``write`` awaited from the current task from now on."""
+    tally = QueryTally()
+    _query_tally.set(tally)
+    return tally
+
+
+async def _tallied(future: asyncio.Future[T]) -> T:
+    tally = _query_tally.get()
+    if tally is None:
+        return await future
+    started = time.perf_counter()
+    try:
+        return await future
+    finally:
+        tally.calls += 1
+        tally.seconds += time.perf_counter() - started
+
+
+class Database:
+    def __init__(self, path: str, *, readers: int = DEFAULT_READERS):
+        self.path = path
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=max(1, readers), thread_name_prefix="db-reader")
+
+    def _connect(self, *, writer: bool = False) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if writer:
+            # WAL is persistent in the file, so the owner connection sets it
+            # once; readers then never block on the writer.
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE_BYTES}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        if SQL_PROFILE:
+            profiler.attach(conn)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _thread_connection(self, *, writer: bool = False) -> sqlite3.Connection:
+        # Each worker thread keeps its own connection, so the read pool is
+        # bounded by the executor size and the writer thread owns exactly one.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(writer=writer)
+        return conn
+
+    def _run_read(self, fn: Callable[..., T], args: tuple) -> T:
+        conn = self._thread_connection()
+        profiler.begin(conn)
+        try:
+            return fn(conn, *args)
+        finally:
+            # A reader must never sit on an open transaction.
+            if conn.in_transaction:
+                conn.rollback()
+            profiler.finish(conn)
+
+    def _run_write(self, fn: Callable[..., T], args: tuple) -> T:
+        conn = self._thread_connection(writer=True)
+        profiler.begin(conn)
+        try:
+            result = fn(conn, *args)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            profiler.finish(conn)
+        return result
+
+    async def read(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` on a reader connection."""
+        loop = asyncio.get_running_loop()
+        return await _tallied(loop.run_in_executor(self._readers, self._run_read, fn, args))
+
+    async def write(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` on the writer as one committed transaction."""
+        loop = asyncio.get_running_loop()
+        return await _tallied(loop.run_in_executor(self._writer, self._run_write, fn, args))
+
+    def write_sync(self, fn: Callable[..., T], *args: Any) -> T:
+        """Blocking ``write`` for start-up code that runs before the event loop."""
+        return self._writer.submit(self._run_write, fn, args).result()
+
+    async def fetchone(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Row | None:
+        return await self.read(lambda conn: conn.execute(sql, tuple(params)).fetchone())
+
+    async def fetchall(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        return await self.read(lambda conn: conn.execute(sql, tuple(params)).fetchall())
+
+    async def execute(self, sql: str, params: Iterable[Any] = ()) -> sqlite3.Cursor:
+        """Run one write statement and commit; the cursor keeps ``rowcount``/``lastrowid``."""
+        return await self.write(lambda conn: conn.execute(sql, tuple(params)))
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Iterable[Any]]) -> sqlite3.Cursor:
+        rows = [tuple(params) for params in seq_of_params]
+        return await self.write(lambda conn: conn.executemany(sql, rows))
+
+    def close(self) -> None:
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+_databases: dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: str = DB_PATH) -> Database:
+    """Return the process-wide ``Database`` for ``path``, creating it on first use."""
+    key = os.path.abspath(path)
+    with _databases_lock:
+        database = _databases.get(key)
+        if database is None:
+            database = _databases[key] = Database(path)
+        return database
+
+
+def close_databases() -> None:
+    with _databases_lock:
+        for database in _databases.values():
+            database.close()
+        _databases.clear()
@@ -0,0 +1,127 @@
+"""In-memory search index over tracked game names for the autocompletes.
+
+Every keystroke in a ``game_name`` box used to run a ``LIKE '%x%'`` scan over
+``games``. The index keeps the names in the same order SQLite returned them
+(``ORDER BY game_name``) plus postings from every 1-, 2- and 3-character
+casefolded slice to the names containing it, so a lookup is a dict hit, a
+small set intersection and a verify — no SQLite involved.
+
+It is built once from ``games`` at startup and then kept in step by the
+commands that write that table (/trackhunt, /changehunt, /forgethunt).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Iterable
+
+
+GRAM = 3
+AUTOCOMPLETE_LIMIT = 25
+
+
+def _grams(key: str) -> set[str]:
+    grams = set()
+    for size in range(1, GRAM + 1):
+        for start in range(len(key) - size + 1):
+            grams.add(key[start:start + size])
+    return grams
+
+
+class GameNameIndex:
+    def __init__(self, names: Iterable[str] = ()):
+        self._sorted: list[str] = []
+        self._keys: dict[str, str] = {}
+        self._postings: dict[str, set[str]] = {}
+        self.load(names)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def load(self, names: Iterable[str]) -> None:
+        """Replace the whole index with ``names``."""
+        self._sorted = []
+        self._keys = {}
+        self._postings = {}
+        for name in names:
+            if name and name not in self._keys:
+                self._index(name)
+        self._sorted.sort()
+
+    def _index(self, name: str) -> None:
+        key = name.casefold()
+        self._keys[name] = key
+        self._sorted.append(name)
+        for gram in _grams(key):
+            self._postings.setdefault(gram, set()).add(name)
+
+    def add(self, name: str) -> None:
+        if not name or name in self._keys:
+            return
+        key = name.casefold()
+        self._keys[name] = key
+        insort(self._sorted, name)
+        for gram in _grams(key):
+            self._postings.setdefault(gram, set()).add(name)
+
+    def remove(self, name: str) -> None:
+        key = self._keys.pop(name, None)
+        if key is None:
+            return
+        pos = bisect_left(self._sorted, name)
+        if pos < len(self._sorted) and self._sorted[pos] == name:
+            del self._sorted[pos]
+        for gram in _grams(key):
+            bucket = self._postings.get(gram)
+            if bucket is not None:
+                bucket.discard(name)
+                if not bucket:
+                    del self._postings[gram]
+
+    def rename(self, old: str, new: str) -> None:
+        self.remove(old)
+        self.add(new)
+
+    def search(self, query: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+        """Names containing ``query`` (case-insensitive), in name order."""
+        needle = (query or "").casefold()
+        if not needle:
+            return self._sorted[:limit]
+
+        if len(needle) <= GRAM:
+            candidates = self._postings.get(needle)
+            if not candidates:
+                return []
+            exact = True
+        else:
+            buckets = []
+            for start in range(len(needle) - GRAM + 1):
+                bucket = self._postings.get(needle[start:start + GRAM])
+                if not bucket:
+                    return []
+                buckets.append(bucket)
+            buckets.sort(key=len)
+            candidates = buckets[0].intersection(*buckets[1:])
+            exact = False
+
+        keys = self._keys
+        # Broad matches are cheaper to pick off the sorted list in order;
+        # narrow ones are cheaper to sort directly.
+        if len(candidates) * 4 > len(self._sorted):
+            results = []
+            for name in self._sorted:
+                if name in candidates and (exact or needle in keys[name]):
+                    results.append(name)
+                    if len(results) == limit:
+                        break
+            return results
+
+        if not exact:
+            candidates = [name for name in candidates if needle in keys[name]]
+        return sorted(candidates)[:limit]
+
+
+game_index = GameNameIndex()
@@ -9,7 +9,6 @@ from __future__ import annotations
 import os
 import re
 import sqlite3
-import unicodedata
 from collections import defaultdict
 from typing import Iterable
 
@@ -17,8 +16,11 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from backlog_cache import get_backlog_cache
+from backlog_keys import normalize_game_name
+from database import get_database
+
 
-DB_PATH = os.getenv("HUNTERS_LEDGER_DB", "hunters_ledger.db")
 GOAL_TYPES = ("series", "az", "genre", "event", "personal")
 GOAL_LABELS = {
     "series": "Series",
@@ -38,14 +40,6 @@ DEFAULT_MOD_ROLE_IDS = {
 GOAL_OWNER_USER_ID = 420996360699904000
 
 
-def normalize_game_name(value: str) -> str:
-    """Return a conservative comparison key without losing platform labels."""
-    value = unicodedata.normalize("NFKC", value or "").casefold().strip()
-    value = value.replace("’", "'").replace("–", "-").replace("—", "-")
-    value = re.sub(r"[^\w\s()]", " ", value)
-    return re.sub(r"\s+", " ", value).strip()
-
-
 def make_progress_bar(completed: int, total: int, length: int = 18) -> str:
     percentage = round((completed / total) * 100) if total else 0
     filled = round((completed / total) * length) if total else 0
@@ -178,7 +172,7 @@ class AddMissingHuntsView(discord.ui.View):
         if str(interaction.user.id) != self.owner_id:
             await interaction.response.send_message("This button belongs to another hunter.", ephemeral=True)
             return
-        count, names = self.cog.add_missing_to_backlog(self.user_goal_id, interaction.user)
+        count, names = await self.cog.add_missing_to_backlog(self.user_goal_id, interaction.user)
         button.disabled = True
         await interaction.response.edit_message(view=self)
         summary = summarize_names(names)
@@ -211,8 +205,7 @@ class ConfirmDeleteGoalView(discord.ui.View):
         if str(interaction.user.id) != self.owner_id:
             await interaction.response.send_message("This confirmation belongs to another hunter.", ephemeral=True)
             return
-        self.cog.db.execute("DELETE FROM user_goals WHERE id = ? AND user_id = ?", (self.goal_id, self.owner_id))
-        self.cog.db.commit()
+        await self.cog.db.execute("DELETE FROM user_goals WHERE id = ? AND user_id = ?", (self.goal_id, self.owner_id))
         await interaction.response.edit_message(content=f"Deleted **{self.goal_title}**.", embed=None, view=None)
 
     @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
@@ -269,7 +262,7 @@ class PaginatedEmbedsView(discord.ui.View):
         if str(interaction.user.id) != self.owner_id:
             await interaction.response.send_message("This button belongs to another hunter.", ephemeral=True)
             return
-        count, names = self.cog.add_missing_to_backlog(self.user_goal_id, interaction.user)
+        count, names = await self.cog.add_missing_to_backlog(self.user_goal_id, interaction.user)
         for child in self.children:
             if isinstance(child, discord.ui.Button) and child.label == "Add to Backlog":
                 child.disabled = True
@@ -292,16 +285,14 @@ class PaginatedEmbedsView(discord.ui.View):
 class GoalSystem(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.db = sqlite3.connect(DB_PATH)
-        self.db.row_factory = sqlite3.Row
-        self.db.execute("PRAGMA foreign_keys = ON")
-        self._create_schema()
+        self.db = get_database()
+        self.backlog_cache = get_backlog_cache()
 
-    def cog_unload(self) -> None:
-        self.db.close()
+    async def cog_load(self) -> None:
+        await self.db.write(self._create_schema)
 
-    def _create_schema(self) -> None:
-        self.db.executescript(
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS goal_templates (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -375,18 +366,18 @@ class GoalSystem(commands.Cog):
             CREATE INDEX IF NOT EXISTS idx_user_goal_items_goal ON user_goal_items(user_goal_id, is_hidden);
             """
         )
-        self.db.commit()
-        self._migrate_goal_type_checks()
-        self.db.executescript(
+        conn.commit()
+        self._migrate_goal_type_checks(conn)
+        conn.executescript(
             """
             CREATE INDEX IF NOT EXISTS idx_user_goals_owner ON user_goals(user_id, is_active);
             CREATE INDEX IF NOT EXISTS idx_user_goals_template ON user_goals(source_template_id, sync_enabled);
             CREATE INDEX IF NOT EXISTS idx_user_goal_items_goal ON user_goal_items(user_goal_id, is_hidden);
             """
         )
-        self.db.commit()
+        conn.commit()
 
-    def _migrate_goal_type_checks(self) -> None:
+    def _migrate_goal_type_checks(self, conn: sqlite3.Connection) -> None:
         """Rebuild old/damaged goal tables after adding Event and Personal types.
 
         SQLite rewrites child foreign-key definitions when a parent table is
@@ -479,7 +470,7 @@ class GoalSystem(commands.Cog):
         }
 
         def table_sql(table: str) -> str:
-            row = self.db.execute(
+            row = conn.execute(
                 "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
             ).fetchone()
             return row["sql"] if row and row["sql"] else ""
@@ -488,7 +479,7 @@ class GoalSystem(commands.Cog):
             base = f"{table}_rebuild_fix"
             candidate = base
             suffix = 1
-            while self.db.execute(
+            while conn.execute(
                 "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (candidate,)
             ).fetchone():
                 suffix += 1
@@ -498,13 +489,13 @@ class GoalSystem(commands.Cog):
         def rebuild(table: str) -> None:
             create_sql, columns = table_defs[table]
             temp_table = temp_name_for(table)
-            self.db.execute(f"ALTER TABLE {table} RENAME TO {temp_table}")
-            self.db.execute(create_sql)
-            self.db.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {temp_table}")
-            self.db.execute(f"DROP TABLE {temp_table}")
+            conn.execute(f"ALTER TABLE {table} RENAME TO {temp_table}")
+            conn.execute(create_sql)
+            conn.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {temp_table}")
+            conn.execute(f"DROP TABLE {temp_table}")
 
-        self.db.commit()
-        self.db.execute("PRAGMA foreign_keys = OFF")
+        conn.commit()
+        conn.execute("PRAGMA foreign_keys = OFF")
         try:
             if "event" not in table_sql("goal_templates") or "personal" not in table_sql("goal_templates"):
                 rebuild("goal_templates")
@@ -525,12 +516,12 @@ class GoalSystem(commands.Cog):
             user_goal_items_sql = table_sql("user_goal_items")
             if "_old_goal_type_check" in user_goal_items_sql or "_rebuild_fix" in user_goal_items_sql:
                 rebuild("user_goal_items")
-            self.db.commit()
+            conn.commit()
         except Exception:
-            self.db.rollback()
+            conn.rollback()
             raise
         finally:
-            self.db.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA foreign_keys = ON")
 
     @staticmethod
     def _goal_type_value(value: object) -> str:
@@ -562,30 +553,30 @@ class GoalSystem(commands.Cog):
         )
         return False
 
-    def _find_user_goal(self, user_id: str, title: str) -> sqlite3.Row | None:
-        return self.db.execute(
+    async def _find_user_goal(self, user_id: str, title: str) -> sqlite3.Row | None:
+        return await self.db.fetchone(
             "SELECT * FROM user_goals WHERE user_id = ? AND title = ? COLLATE NOCASE AND is_active = 1",
             (user_id, title.strip()),
-        ).fetchone()
+        )
 
-    def _find_template(self, goal_type: str, title: str, active_only: bool = True) -> sqlite3.Row | None:
+    async def _find_template(self, goal_type: str, title: str, active_only: bool = True) -> sqlite3.Row | None:
         suffix = " AND is_active = 1" if active_only else ""
-        return self.db.execute(
+        return await self.db.fetchone(
             f"SELECT * FROM goal_templates WHERE goal_type = ? AND title = ? COLLATE NOCASE{suffix}",
             (goal_type, title.strip()),
-        ).fetchone()
+        )
 
     def _insert_user_items(
-        self, goal_id: int, items: list[tuple[str | None, str]], personal: bool,
+        self, conn: sqlite3.Connection, goal_id: int, items: list[tuple[str | None, str]], personal: bool,
     ) -> tuple[int, list[str]]:
         existing = {
-            row[0] for row in self.db.execute(
+            row[0] for row in conn.execute(
                 "SELECT normalized_game_name FROM user_goal_items WHERE user_goal_id = ?", (goal_id,)
             )
         }
         added = 0
         skipped: list[str] = []
-        next_order = self.db.execute(
+        next_order = conn.execute(
             "SELECT COALESCE(MAX(sort_order), -1) + 1 FROM user_goal_items WHERE user_goal_id = ?", (goal_id,)
         ).fetchone()[0]
         for offset, (slot, game) in enumerate(items):
@@ -593,7 +584,7 @@ class GoalSystem(commands.Cog):
             if normalized in existing:
                 skipped.append(game)
                 continue
-            self.db.execute(
+            conn.execute(
                 """INSERT INTO user_goal_items
                    (user_goal_id, game_name, normalized_game_name, slot_label, sort_order, is_personal_addition)
                    VALUES (?, ?, ?, ?, ?, ?)""",
@@ -603,79 +594,80 @@ class GoalSystem(commands.Cog):
             added += 1
         return added, skipped
 
-    def _goal_items_with_status(self, goal_id: int, user_id: str) -> list[dict]:
-        backlog_rows = self.db.execute(
-            "SELECT id, game_name, status FROM solo_backlogs WHERE user_id = ?", (user_id,)
+    def _goal_items_with_status(self, conn: sqlite3.Connection, goal_id: int, user_id: str) -> list[dict]:
+        # A linked backlog row wins; otherwise the item matches on the backlog's
+        # (user_id, normalized_game_name) key, which is unique per user.
+        rows = conn.execute(
+            """SELECT i.*,
+                      COALESCE(linked.id, named.id) AS backlog_id,
+                      CASE WHEN linked.id IS NOT NULL THEN linked.status ELSE named.status END AS backlog_status
+               FROM user_goal_items i
+               LEFT JOIN solo_backlogs linked
+                      ON linked.id = i.linked_solo_backlog_id AND linked.user_id = ?
+               LEFT JOIN solo_backlogs named
+                      ON named.user_id = ? AND named.normalized_game_name = i.normalized_game_name
+               WHERE i.user_goal_id = ? AND i.is_hidden = 0
+               ORDER BY CASE WHEN i.slot_label IS NULL THEN 1 ELSE 0 END, i.slot_label, i.sort_order, i.id""",
+            (user_id, user_id, goal_id),
         ).fetchall()
-        by_id = {row["id"]: row for row in backlog_rows}
-        by_name = {normalize_game_name(row["game_name"]): row for row in backlog_rows}
         results: list[dict] = []
-        rows = self.db.execute(
-            """SELECT * FROM user_goal_items
-               WHERE user_goal_id = ? AND is_hidden = 0
-               ORDER BY CASE WHEN slot_label IS NULL THEN 1 ELSE 0 END, slot_label, sort_order, id""",
-            (goal_id,),
-        ).fetchall()
         for row in rows:
-            backlog = by_id.get(row["linked_solo_backlog_id"])
-            if backlog is None:
-                backlog = by_name.get(row["normalized_game_name"])
-            results.append({
-                **dict(row),
-                "status": row["manual_status"] or (backlog["status"] if backlog else "missing"),
-                "backlog_id": backlog["id"] if backlog else None,
-            })
+            item = dict(row)
+            backlog_status = item.pop("backlog_status")
+            item["status"] = item["manual_status"] or (backlog_status if item["backlog_id"] is not None else "missing")
+            results.append(item)
         return results
 
-    def _progress(self, goal: sqlite3.Row) -> tuple[int, int, list[dict]]:
-        items = self._goal_items_with_status(goal["id"], goal["user_id"])
+    def _progress(self, conn: sqlite3.Connection, goal: sqlite3.Row) -> tuple[int, int, list[dict]]:
+        items = self._goal_items_with_status(conn, goal["id"], goal["user_id"])
         completed = sum(item["status"] == "completed" for item in items)
         total = max(26, len(items)) if goal["goal_type"] == "az" else len(items)
         return completed, total, items
 
-    def _missing_items(self, goal_id: int, user_id: str) -> list[dict]:
-        return [item for item in self._goal_items_with_status(goal_id, user_id) if item["status"] == "missing"]
+    def _missing_items(self, conn: sqlite3.Connection, goal_id: int, user_id: str) -> list[dict]:
+        return [item for item in self._goal_items_with_status(conn, goal_id, user_id) if item["status"] == "missing"]
+
+    async def add_missing_to_backlog(self, goal_id: int, user: discord.abc.User) -> tuple[int, list[str]]:
+        added = await self.db.write(self._add_missing_to_backlog, goal_id, str(user.id), str(user))
+        if added[0]:
+            self.backlog_cache.invalidate(user.id)
+        return added
 
-    def add_missing_to_backlog(self, goal_id: int, user: discord.abc.User) -> tuple[int, list[str]]:
-        user_id = str(user.id)
-        goal = self.db.execute("SELECT * FROM user_goals WHERE id = ? AND user_id = ?", (goal_id, user_id)).fetchone()
+    def _add_missing_to_backlog(
+        self, conn: sqlite3.Connection, goal_id: int, user_id: str, user_name: str,
+    ) -> tuple[int, list[str]]:
+        goal = conn.execute("SELECT * FROM user_goals WHERE id = ? AND user_id = ?", (goal_id, user_id)).fetchone()
         if not goal:
             return 0, []
         names: list[str] = []
-        for item in self._missing_items(goal_id, user_id):
-            exists = self.db.execute(
-                "SELECT 1 FROM solo_backlogs WHERE user_id = ? AND LOWER(game_name) = LOWER(?)",
-                (user_id, item["game_name"]),
-            ).fetchone()
-            if exists:
-                continue
-            self.db.execute(
-                "INSERT INTO solo_backlogs (user_id, user_name, game_name, status) VALUES (?, ?, ?, 'not started')",
-                (user_id, str(user), item["game_name"]),
+        for item in self._missing_items(conn, goal_id, user_id):
+            conn.execute(
+                """INSERT INTO solo_backlogs (user_id, user_name, game_name, normalized_game_name, status)
+                   VALUES (?, ?, ?, ?, 'not started')""",
+                (user_id, user_name, item["game_name"], item["normalized_game_name"]),
             )
             names.append(item["game_name"])
-        self.db.commit()
         return len(names), names
 
-    def _sync_goal(self, goal: sqlite3.Row) -> tuple[list[str], list[str]]:
+    def _sync_goal(self, conn: sqlite3.Connection, goal: sqlite3.Row) -> tuple[list[str], list[str]]:
         added: list[str] = []
         newly_completed: list[str] = []
-        before = {item["normalized_game_name"]: item["status"] for item in self._goal_items_with_status(goal["id"], goal["user_id"])}
+        before = {item["normalized_game_name"]: item["status"] for item in self._goal_items_with_status(conn, goal["id"], goal["user_id"])}
         template_id = goal["source_template_id"]
         if template_id and goal["sync_enabled"]:
-            template_items = self.db.execute(
+            template_items = conn.execute(
                 "SELECT * FROM goal_template_items WHERE template_id = ? AND is_active = 1 ORDER BY sort_order, id",
                 (template_id,),
             ).fetchall()
             existing = {
-                row[0] for row in self.db.execute(
+                row[0] for row in conn.execute(
                     "SELECT normalized_game_name FROM user_goal_items WHERE user_goal_id = ?", (goal["id"],)
                 )
             }
             for item in template_items:
                 if item["normalized_game_name"] in existing:
                     continue
-                self.db.execute(
+                conn.execute(
                     """INSERT INTO user_goal_items
                        (user_goal_id, source_template_item_id, game_name, normalized_game_name, slot_label, sort_order)
                        VALUES (?, ?, ?, ?, ?, ?)""",
@@ -683,23 +675,22 @@ class GoalSystem(commands.Cog):
                 )
                 existing.add(item["normalized_game_name"])
                 added.append(item["game_name"])
-        self.db.execute(
+        conn.execute(
             "UPDATE user_goals SET user_name = ?, updated_at = CURRENT_TIMESTAMP, last_synced_at = CURRENT_TIMESTAMP WHERE id = ?",
             (goal["user_name"], goal["id"]),
         )
-        self.db.commit()
-        after = self._goal_items_with_status(goal["id"], goal["user_id"])
+        after = self._goal_items_with_status(conn, goal["id"], goal["user_id"])
         newly_completed = [
             item["game_name"] for item in after
             if item["status"] == "completed" and before.get(item["normalized_game_name"]) != "completed"
         ]
         return added, newly_completed
 
-    def _goal_embeds(self, goal: sqlite3.Row, user: discord.abc.User) -> tuple[list[discord.Embed], int]:
-        completed, total, items = self._progress(goal)
+    def _goal_embeds(self, conn: sqlite3.Connection, goal: sqlite3.Row, user: discord.abc.User) -> tuple[list[discord.Embed], int]:
+        completed, total, items = self._progress(conn, goal)
         template = None
         if goal["source_template_id"]:
-            template = self.db.execute("SELECT title FROM goal_templates WHERE id = ?", (goal["source_template_id"],)).fetchone()
+            template = conn.execute("SELECT title FROM goal_templates WHERE id = ?", (goal["source_template_id"],)).fetchone()
         source = f"Official template: {template['title']}" if template else "Custom goal"
         lines: list[str] = []
         slot_groups: dict[str, list[dict]] = defaultdict(list)
@@ -748,8 +739,8 @@ class GoalSystem(commands.Cog):
         missing = sum(item["status"] == "missing" for item in items)
         return embeds, missing
 
-    def _template_embeds(self, template: sqlite3.Row) -> list[discord.Embed]:
-        rows = self.db.execute(
+    def _template_embeds(self, conn: sqlite3.Connection, template: sqlite3.Row) -> list[discord.Embed]:
+        rows = conn.execute(
             """SELECT * FROM goal_template_items
                WHERE template_id = ? AND is_active = 1
                ORDER BY CASE WHEN slot_label IS NULL THEN 1 ELSE 0 END, slot_label, sort_order, id""",
@@ -774,7 +765,7 @@ class GoalSystem(commands.Cog):
         if not lines:
             lines = ["No active games are currently listed for this goal."]
 
-        copy_count = self.db.execute(
+        copy_count = conn.execute(
             "SELECT COUNT(*) FROM user_goals WHERE source_template_id = ? AND is_active = 1",
             (template["id"],),
         ).fetchone()[0]
@@ -822,7 +813,7 @@ class GoalSystem(commands.Cog):
         ephemeral: bool = True,
     ) -> None:
         display_user = display_user or interaction.user
-        embeds, missing = self._goal_embeds(goal, display_user)
+        embeds, missing = await self.db.read(self._goal_embeds, goal, display_user)
         can_add_to_backlog = (
             allow_backlog_button
             and bool(missing)
@@ -842,19 +833,21 @@ class GoalSystem(commands.Cog):
         if not items:
             await interaction.response.send_message("Add at least one valid game to create the goal.", ephemeral=True)
             return
-        try:
-            cursor = self.db.execute(
+        def create(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(
                 """INSERT INTO user_goals (user_id, user_name, goal_type, title, sync_enabled)
                    VALUES (?, ?, ?, ?, 0)""",
                 (str(interaction.user.id), str(interaction.user), goal_type, title),
             )
-            self._insert_user_items(cursor.lastrowid, items, personal=False)
-            self.db.commit()
+            self._insert_user_items(conn, cursor.lastrowid, items, personal=False)
+            return cursor.lastrowid
+
+        try:
+            goal_id = await self.db.write(create)
         except sqlite3.IntegrityError:
-            self.db.rollback()
             await interaction.response.send_message("You already have a goal with that title.", ephemeral=True)
             return
-        goal = self.db.execute("SELECT * FROM user_goals WHERE id = ?", (cursor.lastrowid,)).fetchone()
+        goal = await self.db.fetchone("SELECT * FROM user_goals WHERE id = ?", (goal_id,))
         await self._send_goal(interaction, goal)
 
     async def create_template(self, interaction: discord.Interaction, goal_type: str, title: str, raw: str) -> None:
@@ -865,23 +858,24 @@ class GoalSystem(commands.Cog):
         if not items:
             await interaction.response.send_message("Add at least one valid game to create the template.", ephemeral=True)
             return
-        try:
-            cursor = self.db.execute(
+        def create(conn: sqlite3.Connection) -> None:
+            cursor = conn.execute(
                 """INSERT INTO goal_templates
                    (goal_type, title, created_by_user_id, created_by_user_name)
                    VALUES (?, ?, ?, ?)""",
                 (goal_type, title, str(interaction.user.id), str(interaction.user)),
             )
             for order, (slot, game) in enumerate(items):
-                self.db.execute(
+                conn.execute(
                     """INSERT INTO goal_template_items
                        (template_id, game_name, normalized_game_name, slot_label, sort_order)
                        VALUES (?, ?, ?, ?, ?)""",
                     (cursor.lastrowid, game, normalize_game_name(game), slot, order),
                 )
-            self.db.commit()
+
+        try:
+            await self.db.write(create)
         except sqlite3.IntegrityError:
-            self.db.rollback()
             await interaction.response.send_message("An official goal with that type and title already exists.", ephemeral=True)
             return
         note = f" Skipped {len(skipped)} duplicate line(s)." if skipped else ""
@@ -890,22 +884,26 @@ class GoalSystem(commands.Cog):
         )
 
     async def add_user_items(self, interaction: discord.Interaction, goal_id: int, goal_type: str, raw: str) -> None:
-        goal = self.db.execute(
+        goal = await self.db.fetchone(
             "SELECT * FROM user_goals WHERE id = ? AND user_id = ? AND is_active = 1",
             (goal_id, str(interaction.user.id)),
-        ).fetchone()
+        )
         if not goal:
             await interaction.response.send_message("That goal is no longer available.", ephemeral=True)
             return
         if goal["is_template_copy"]:
-            template = self.db.execute("SELECT allow_personal_additions FROM goal_templates WHERE id = ?", (goal["source_template_id"],)).fetchone()
+            template = await self.db.fetchone("SELECT allow_personal_additions FROM goal_templates WHERE id = ?", (goal["source_template_id"],))
             if template and not template[0]:
                 await interaction.response.send_message("That official template does not allow personal additions.", ephemeral=True)
                 return
         items, parse_skipped = parse_goal_items(raw, goal_type)
-        added, duplicate_skipped = self._insert_user_items(goal_id, items, personal=bool(goal["is_template_copy"]))
-        self.db.execute("UPDATE user_goals SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (goal_id,))
-        self.db.commit()
+
+        def add(conn: sqlite3.Connection) -> tuple[int, list[str]]:
+            result = self._insert_user_items(conn, goal_id, items, personal=bool(goal["is_template_copy"]))
+            conn.execute("UPDATE user_goals SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (goal_id,))
+            return result
+
+        added, duplicate_skipped = await self.db.write(add)
         await interaction.response.send_message(
             f"Added {added} game{'s' if added != 1 else ''} to **{goal['title']}**."
             + (f" Skipped {len(parse_skipped) + len(duplicate_skipped)} duplicate/invalid line(s)." if parse_skipped or duplicate_skipped else ""),
@@ -916,60 +914,64 @@ class GoalSystem(commands.Cog):
         if not self._is_mod(interaction):
             await interaction.response.send_message("You no longer have permission to edit official goals.", ephemeral=True)
             return
-        template = self.db.execute("SELECT * FROM goal_templates WHERE id = ? AND is_active = 1", (template_id,)).fetchone()
+        template = await self.db.fetchone("SELECT * FROM goal_templates WHERE id = ? AND is_active = 1", (template_id,))
         if not template:
             await interaction.response.send_message("That official goal is no longer available.", ephemeral=True)
             return
         items, parse_skipped = parse_goal_items(raw, goal_type)
-        existing = {
-            row[0] for row in self.db.execute(
-                "SELECT normalized_game_name FROM goal_template_items WHERE template_id = ?", (template_id,)
-            )
-        }
-        next_order = self.db.execute(
-            "SELECT COALESCE(MAX(sort_order), -1) + 1 FROM goal_template_items WHERE template_id = ?", (template_id,)
-        ).fetchone()[0]
-        new_template_items: list[sqlite3.Row] = []
-        duplicate_count = len(parse_skipped)
-        for offset, (slot, game) in enumerate(items):
-            normalized = normalize_game_name(game)
-            if normalized in existing:
-                duplicate_count += 1
-                continue
-            cursor = self.db.execute(
-                """INSERT INTO goal_template_items
-                   (template_id, game_name, normalized_game_name, slot_label, sort_order)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (template_id, game, normalized, slot, next_order + offset),
-            )
-            new_template_items.append(self.db.execute("SELECT * FROM goal_template_items WHERE id = ?", (cursor.lastrowid,)).fetchone())
-            existing.add(normalized)
 
-        synced_goals: set[int] = set()
-        user_duplicate_count = 0
-        subscribed = self.db.execute(
-            "SELECT id FROM user_goals WHERE source_template_id = ? AND sync_enabled = 1 AND is_active = 1",
-            (template_id,),
-        ).fetchall()
-        for user_goal in subscribed:
-            user_existing = {
-                row[0] for row in self.db.execute(
-                    "SELECT normalized_game_name FROM user_goal_items WHERE user_goal_id = ?", (user_goal["id"],)
+        def add(conn: sqlite3.Connection) -> tuple[list[sqlite3.Row], set[int], int, int]:
+            existing = {
+                row[0] for row in conn.execute(
+                    "SELECT normalized_game_name FROM goal_template_items WHERE template_id = ?", (template_id,)
                 )
             }
-            for item in new_template_items:
-                if item["normalized_game_name"] in user_existing:
-                    user_duplicate_count += 1
+            next_order = conn.execute(
+                "SELECT COALESCE(MAX(sort_order), -1) + 1 FROM goal_template_items WHERE template_id = ?", (template_id,)
+            ).fetchone()[0]
+            new_template_items: list[sqlite3.Row] = []
+            duplicate_count = len(parse_skipped)
+            for offset, (slot, game) in enumerate(items):
+                normalized = normalize_game_name(game)
+                if normalized in existing:
+                    duplicate_count += 1
                     continue
-                self.db.execute(
-                    """INSERT INTO user_goal_items
-                       (user_goal_id, source_template_item_id, game_name, normalized_game_name, slot_label, sort_order)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (user_goal["id"], item["id"], item["game_name"], item["normalized_game_name"], item["slot_label"], item["sort_order"]),
+                cursor = conn.execute(
+                    """INSERT INTO goal_template_items
+                       (template_id, game_name, normalized_game_name, slot_label, sort_order)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (template_id, game, normalized, slot, next_order + offset),
                 )
-                synced_goals.add(user_goal["id"])
-        self.db.execute("UPDATE goal_templates SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (template_id,))
-        self.db.commit()
+                new_template_items.append(conn.execute("SELECT * FROM goal_template_items WHERE id = ?", (cursor.lastrowid,)).fetchone())
+                existing.add(normalized)
+
+            synced_goals: set[int] = set()
+            user_duplicate_count = 0
+            subscribed = conn.execute(
+                "SELECT id FROM user_goals WHERE source_template_id = ? AND sync_enabled = 1 AND is_active = 1",
+                (template_id,),
+            ).fetchall()
+            for user_goal in subscribed:
+                user_existing = {
+                    row[0] for row in conn.execute(
+                        "SELECT normalized_game_name FROM user_goal_items WHERE user_goal_id = ?", (user_goal["id"],)
+                    )
+                }
+                for item in new_template_items:
+                    if item["normalized_game_name"] in user_existing:
+                        user_duplicate_count += 1
+                        continue
+                    conn.execute(
+                        """INSERT INTO user_goal_items
+                           (user_goal_id, source_template_item_id, game_name, normalized_game_name, slot_label, sort_order)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        (user_goal["id"], item["id"], item["game_name"], item["normalized_game_name"], item["slot_label"], item["sort_order"]),
+                    )
+                    synced_goals.add(user_goal["id"])
+            conn.execute("UPDATE goal_templates SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (template_id,))
+            return new_template_items, synced_goals, duplicate_count, user_duplicate_count
+
+        new_template_items, synced_goals, duplicate_count, user_duplicate_count = await self.db.write(add)
         await interaction.response.send_message(
             f"Added {len(new_template_items)} game{'s' if len(new_template_items) != 1 else ''} to official **{template['title']}**.\n"
             f"Synced to {len(synced_goals)} user goal{'s' if len(synced_goals) != 1 else ''}; "
@@ -984,23 +986,26 @@ class GoalSystem(commands.Cog):
         if not title:
             await interaction.response.send_message("Give your goal a title.", ephemeral=True)
             return
-        if self._find_user_goal(str(interaction.user.id), title):
+        if await self._find_user_goal(str(interaction.user.id), title):
             await interaction.response.send_message("You already have a goal with that title.", ephemeral=True)
             return
         await interaction.response.send_modal(GoalItemsModal(self, goaltype.value, title))
 
     @app_commands.command(name="mygoals", description="Show all of your personal goals and progress.")
     async def mygoals(self, interaction: discord.Interaction) -> None:
-        goals = self.db.execute(
-            "SELECT * FROM user_goals WHERE user_id = ? AND is_active = 1 ORDER BY goal_type, title",
-            (str(interaction.user.id),),
-        ).fetchall()
+        def load(conn: sqlite3.Connection) -> list[tuple[sqlite3.Row, int, int]]:
+            goals = conn.execute(
+                "SELECT * FROM user_goals WHERE user_id = ? AND is_active = 1 ORDER BY goal_type, title",
+                (str(interaction.user.id),),
+            ).fetchall()
+            return [(goal, *self._progress(conn, goal)[:2]) for goal in goals]
+
+        goals = await self.db.read(load)
         if not goals:
             await interaction.response.send_message("You do not have any goals yet. Try `/newgoal` or `/copygoal`.", ephemeral=True)
             return
         grouped: dict[str, list[str]] = defaultdict(list)
-        for goal in goals:
-            completed, total, _ = self._progress(goal)
+        for goal, completed, total in goals:
             grouped[goal["goal_type"]].append(f"**{goal['title']}** — {completed}/{total} complete")
         embed = discord.Embed(title=f"{interaction.user.display_name}'s Goals", color=0x4F8CFF)
         for goal_type in GOAL_TYPES:
@@ -1013,7 +1018,7 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="mygoal", description="Show one of your goals with live backlog progress.")
     async def mygoal(self, interaction: discord.Interaction, goaltitle: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), goaltitle)
+        goal = await self._find_user_goal(str(interaction.user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal in your list.", ephemeral=True)
             return
@@ -1025,7 +1030,7 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="showgoal", description="Show another member's public goal progress.")
     async def showgoal(self, interaction: discord.Interaction, user: discord.User, goaltitle: str) -> None:
-        goal = self._find_user_goal(str(user.id), goaltitle)
+        goal = await self._find_user_goal(str(user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal for that hunter.", ephemeral=True)
             return
@@ -1047,32 +1052,35 @@ class GoalSystem(commands.Cog):
     @app_commands.command(name="copygoal", description="Copy an official goal template into your goals.")
     @app_commands.choices(goaltype=GOAL_TYPE_CHOICES)
     async def copygoal(self, interaction: discord.Interaction, goaltype: app_commands.Choice[str], goaltitle: str) -> None:
-        template = self._find_template(goaltype.value, goaltitle)
+        template = await self._find_template(goaltype.value, goaltitle)
         if not template:
             await interaction.response.send_message("I could not find that official goal template.", ephemeral=True)
             return
-        if self._find_user_goal(str(interaction.user.id), template["title"]):
+        if await self._find_user_goal(str(interaction.user.id), template["title"]):
             await interaction.response.send_message("You already have a goal with that title.", ephemeral=True)
             return
-        cursor = self.db.execute(
-            """INSERT INTO user_goals
-               (user_id, user_name, goal_type, title, source_template_id, is_template_copy, sync_enabled)
-               VALUES (?, ?, ?, ?, ?, 1, ?)""",
-            (str(interaction.user.id), str(interaction.user), template["goal_type"], template["title"], template["id"], template["sync_enabled_by_default"]),
-        )
-        goal_id = cursor.lastrowid
-        template_items = self.db.execute(
-            "SELECT * FROM goal_template_items WHERE template_id = ? AND is_active = 1 ORDER BY sort_order, id", (template["id"],)
-        ).fetchall()
-        for item in template_items:
-            self.db.execute(
-                """INSERT INTO user_goal_items
-                   (user_goal_id, source_template_item_id, game_name, normalized_game_name, slot_label, sort_order)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (goal_id, item["id"], item["game_name"], item["normalized_game_name"], item["slot_label"], item["sort_order"]),
+        def copy(conn: sqlite3.Connection) -> int:
+            cursor = conn.execute(
+                """INSERT INTO user_goals
+                   (user_id, user_name, goal_type, title, source_template_id, is_template_copy, sync_enabled)
+                   VALUES (?, ?, ?, ?, ?, 1, ?)""",
+                (str(interaction.user.id), str(interaction.user), template["goal_type"], template["title"], template["id"], template["sync_enabled_by_default"]),
             )
-        self.db.commit()
-        goal = self.db.execute("SELECT * FROM user_goals WHERE id = ?", (goal_id,)).fetchone()
+            goal_id = cursor.lastrowid
+            template_items = conn.execute(
+                "SELECT * FROM goal_template_items WHERE template_id = ? AND is_active = 1 ORDER BY sort_order, id", (template["id"],)
+            ).fetchall()
+            for item in template_items:
+                conn.execute(
+                    """INSERT INTO user_goal_items
+                       (user_goal_id, source_template_item_id, game_name, normalized_game_name, slot_label, sort_order)
+                       VALUES (?, ?, ?, ?, ?, ?)""",
+                    (goal_id, item["id"], item["game_name"], item["normalized_game_name"], item["slot_label"], item["sort_order"]),
+                )
+            return goal_id
+
+        goal_id = await self.db.write(copy)
+        goal = await self.db.fetchone("SELECT * FROM user_goals WHERE id = ?", (goal_id,))
         await self._send_goal(interaction, goal)
 
     @copygoal.autocomplete("goaltitle")
@@ -1081,7 +1089,7 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="addtogoal", description="Add one or more games to one of your goals.")
     async def addtogoal(self, interaction: discord.Interaction, goaltitle: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), goaltitle)
+        goal = await self._find_user_goal(str(interaction.user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal in your list.", ephemeral=True)
             return
@@ -1093,24 +1101,23 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="removefromgoal", description="Remove a custom item or hide an official item from your goal.")
     async def removefromgoal(self, interaction: discord.Interaction, goaltitle: str, game: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), goaltitle)
+        goal = await self._find_user_goal(str(interaction.user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal in your list.", ephemeral=True)
             return
-        item = self.db.execute(
+        item = await self.db.fetchone(
             """SELECT * FROM user_goal_items WHERE user_goal_id = ?
                AND game_name = ? COLLATE NOCASE AND is_hidden = 0""", (goal["id"], game.strip())
-        ).fetchone()
+        )
         if not item:
             await interaction.response.send_message("I could not find that game in the goal.", ephemeral=True)
             return
         if item["source_template_item_id"]:
-            self.db.execute("UPDATE user_goal_items SET is_hidden = 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (item["id"],))
+            await self.db.execute("UPDATE user_goal_items SET is_hidden = 1, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (item["id"],))
             action = "Hidden"
         else:
-            self.db.execute("DELETE FROM user_goal_items WHERE id = ?", (item["id"],))
+            await self.db.execute("DELETE FROM user_goal_items WHERE id = ?", (item["id"],))
             action = "Removed"
-        self.db.commit()
         await interaction.response.send_message(f"{action} **{item['game_name']}** from **{goal['title']}**.", ephemeral=True)
 
     @removefromgoal.autocomplete("goaltitle")
@@ -1120,28 +1127,26 @@ class GoalSystem(commands.Cog):
     @removefromgoal.autocomplete("game")
     async def removegoal_game_autocomplete(self, interaction: discord.Interaction, current: str):
         title = getattr(interaction.namespace, "goaltitle", "")
-        goal = self._find_user_goal(str(interaction.user.id), title) if title else None
+        goal = await self._find_user_goal(str(interaction.user.id), title) if title else None
         if not goal:
             return []
-        rows = self.db.execute(
+        rows = await self.db.fetchall(
             """SELECT game_name FROM user_goal_items WHERE user_goal_id = ? AND is_hidden = 0
                AND game_name LIKE ? COLLATE NOCASE ORDER BY sort_order, game_name LIMIT 25""",
             (goal["id"], f"%{current}%"),
-        ).fetchall()
+        )
         return [app_commands.Choice(name=row[0][:100], value=row[0]) for row in rows]
 
     @app_commands.command(name="renamegoal", description="Rename one of your personal goals.")
     async def renamegoal(self, interaction: discord.Interaction, oldtitle: str, newtitle: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), oldtitle)
+        goal = await self._find_user_goal(str(interaction.user.id), oldtitle)
         title = self._clean_title(newtitle)
         if not goal or not title:
             await interaction.response.send_message("Check the old goal title and provide a valid new title.", ephemeral=True)
             return
         try:
-            self.db.execute("UPDATE user_goals SET title = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (title, goal["id"]))
-            self.db.commit()
+            await self.db.execute("UPDATE user_goals SET title = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (title, goal["id"]))
         except sqlite3.IntegrityError:
-            self.db.rollback()
             await interaction.response.send_message("You already have a goal with that title.", ephemeral=True)
             return
         await interaction.response.send_message(f"Renamed **{goal['title']}** to **{title}**.", ephemeral=True)
@@ -1152,7 +1157,7 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="deletegoal", description="Delete or abandon one of your goals.")
     async def deletegoal(self, interaction: discord.Interaction, goaltitle: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), goaltitle)
+        goal = await self._find_user_goal(str(interaction.user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal in your list.", ephemeral=True)
             return
@@ -1165,13 +1170,17 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="syncgoal", description="Refresh a goal from your backlog and its official template.")
     async def syncgoal(self, interaction: discord.Interaction, goaltitle: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), goaltitle)
+        goal = await self._find_user_goal(str(interaction.user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal in your list.", ephemeral=True)
             return
-        added, completed = self._sync_goal(goal)
-        refreshed = self.db.execute("SELECT * FROM user_goals WHERE id = ?", (goal["id"],)).fetchone()
-        done, total, _ = self._progress(refreshed)
+        added, completed = await self.db.write(self._sync_goal, goal)
+
+        def progress(conn: sqlite3.Connection) -> tuple[int, int, list[dict]]:
+            refreshed = conn.execute("SELECT * FROM user_goals WHERE id = ?", (goal["id"],)).fetchone()
+            return self._progress(conn, refreshed)
+
+        done, total, _ = await self.db.read(progress)
         parts = [f"Synced **{goal['title']}**.", f"Current progress: **{done}/{total} completed**"]
         if completed:
             parts.append("New completions found: " + ", ".join(completed))
@@ -1187,11 +1196,11 @@ class GoalSystem(commands.Cog):
 
     @app_commands.command(name="addmissinghunts", description="Add a goal's missing games to your solo backlog.")
     async def addmissinghunts(self, interaction: discord.Interaction, goaltitle: str) -> None:
-        goal = self._find_user_goal(str(interaction.user.id), goaltitle)
+        goal = await self._find_user_goal(str(interaction.user.id), goaltitle)
         if not goal:
             await interaction.response.send_message("I could not find that goal in your list.", ephemeral=True)
             return
-        count, names = self.add_missing_to_backlog(goal["id"], interaction.user)
+        count, names = await self.add_missing_to_backlog(goal["id"], interaction.user)
         await interaction.response.send_message(
             f"Added {count} missing hunt{'s' if count != 1 else ''} to your solo backlog as **Not Started**."
             + ("\n" + summarize_names(names) if names else ""), ephemeral=True
@@ -1208,11 +1217,11 @@ class GoalSystem(commands.Cog):
     @app_commands.command(name="viewgamesingoal", description="Preview the games in an official goal before copying it.")
     @app_commands.choices(goaltype=GOAL_TYPE_CHOICES)
     async def viewgamesingoal(self, interaction: discord.Interaction, goaltype: app_commands.Choice[str], goaltitle: str) -> None:
-        template = self._find_template(goaltype.value, goaltitle)
+        template = await self._find_template(goaltype.value, goaltitle)
         if not template:
             await interaction.response.send_message("I could not find that official goal template.", ephemeral=True)
             return
-        embeds = self._template_embeds(template)
+        embeds = await self.db.read(self._template_embeds, template)
         view = PaginatedEmbedsView(embeds) if len(embeds) > 1 else None
         await interaction.response.send_message(embed=embeds[0], view=view, ephemeral=False)
 
@@ -1236,7 +1245,7 @@ class GoalSystem(commands.Cog):
     async def modaddtogoal(self, interaction: discord.Interaction, goaltype: app_commands.Choice[str], goaltitle: str) -> None:
         if not await self._require_mod(interaction):
             return
-        template = self._find_template(goaltype.value, goaltitle)
+        template = await self._find_template(goaltype.value, goaltitle)
         if not template:
             await interaction.response.send_message("I could not find that official goal.", ephemeral=True)
             return
@@ -1251,23 +1260,26 @@ class GoalSystem(commands.Cog):
     async def modremovefromgoal(self, interaction: discord.Interaction, goaltype: app_commands.Choice[str], goaltitle: str, game: str) -> None:
         if not await self._require_mod(interaction):
             return
-        template = self._find_template(goaltype.value, goaltitle)
+        template = await self._find_template(goaltype.value, goaltitle)
         if not template:
             await interaction.response.send_message("I could not find that official goal.", ephemeral=True)
             return
-        item = self.db.execute(
+        item = await self.db.fetchone(
             """SELECT * FROM goal_template_items WHERE template_id = ? AND game_name = ? COLLATE NOCASE
                AND is_active = 1""", (template["id"], game.strip())
-        ).fetchone()
+        )
         if not item:
             await interaction.response.send_message("I could not find that active game in the template.", ephemeral=True)
             return
-        self.db.execute("UPDATE goal_template_items SET is_active = 0 WHERE id = ?", (item["id"],))
-        cursor = self.db.execute(
-            "UPDATE user_goal_items SET is_hidden = 1, updated_at = CURRENT_TIMESTAMP WHERE source_template_item_id = ?",
-            (item["id"],),
-        )
-        self.db.commit()
+
+        def archive(conn: sqlite3.Connection) -> sqlite3.Cursor:
+            conn.execute("UPDATE goal_template_items SET is_active = 0 WHERE id = ?", (item["id"],))
+            return conn.execute(
+                "UPDATE user_goal_items SET is_hidden = 1, updated_at = CURRENT_TIMESTAMP WHERE source_template_item_id = ?",
+                (item["id"],),
+            )
+
+        cursor = await self.db.write(archive)
         await interaction.response.send_message(
             f"Archived **{item['game_name']}** in **{template['title']}** and hid it from {cursor.rowcount} linked goal copy/copies. Solo backlogs were unchanged.",
             ephemeral=True,
@@ -1281,38 +1293,39 @@ class GoalSystem(commands.Cog):
     async def modremove_game_autocomplete(self, interaction: discord.Interaction, current: str):
         goal_type = self._goal_type_value(getattr(interaction.namespace, "goaltype", ""))
         title = getattr(interaction.namespace, "goaltitle", "")
-        template = self._find_template(goal_type, title) if goal_type and title else None
+        template = await self._find_template(goal_type, title) if goal_type and title else None
         if not template:
             return []
-        rows = self.db.execute(
+        rows = await self.db.fetchall(
             """SELECT game_name FROM goal_template_items WHERE template_id = ? AND is_active = 1
                AND game_name LIKE ? COLLATE NOCASE ORDER BY sort_order, game_name LIMIT 25""",
             (template["id"], f"%{current}%"),
-        ).fetchall()
+        )
         return [app_commands.Choice(name=row[0][:100], value=row[0]) for row in rows]
 
     @app_commands.command(name="modrenamegoal", description="Rename an official goal without breaking linked copies.")
     async def modrenamegoal(self, interaction: discord.Interaction, oldtitle: str, newtitle: str) -> None:
         if not await self._require_mod(interaction):
             return
-        templates = self.db.execute(
+        templates = await self.db.fetchall(
             "SELECT * FROM goal_templates WHERE title = ? COLLATE NOCASE AND is_active = 1", (oldtitle.strip(),)
-        ).fetchall()
+        )
         if len(templates) != 1:
             await interaction.response.send_message("The old title must identify exactly one active official goal.", ephemeral=True)
             return
         template = templates[0]
         title = self._clean_title(newtitle)
-        try:
-            self.db.execute("UPDATE goal_templates SET title = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (title, template["id"]))
-            self.db.execute(
+        def rename(conn: sqlite3.Connection) -> None:
+            conn.execute("UPDATE goal_templates SET title = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (title, template["id"]))
+            conn.execute(
                 """UPDATE user_goals SET title = ?, updated_at = CURRENT_TIMESTAMP
                    WHERE source_template_id = ? AND title = ? COLLATE NOCASE""",
                 (title, template["id"], template["title"]),
             )
-            self.db.commit()
+
+        try:
+            await self.db.write(rename)
         except sqlite3.IntegrityError:
-            self.db.rollback()
             await interaction.response.send_message("That rename would create a duplicate template or user goal title.", ephemeral=True)
             return
         await interaction.response.send_message(f"Renamed official **{template['title']}** to **{title}**; personal custom names were preserved.", ephemeral=True)
@@ -1326,13 +1339,13 @@ class GoalSystem(commands.Cog):
     async def _send_template_list(
         self, interaction: discord.Interaction, moderator: bool, *, ephemeral: bool
     ) -> None:
-        rows = self.db.execute(
+        rows = await self.db.fetchall(
             """SELECT t.*, COUNT(DISTINCT i.id) AS item_count, COUNT(DISTINCT ug.id) AS copy_count
                FROM goal_templates t
                LEFT JOIN goal_template_items i ON i.template_id = t.id AND i.is_active = 1
                LEFT JOIN user_goals ug ON ug.source_template_id = t.id AND ug.is_active = 1
                WHERE t.is_active = 1 GROUP BY t.id ORDER BY t.goal_type, t.title"""
-        ).fetchall()
+        )
         if not rows:
             await interaction.response.send_message("There are no official goal templates yet.", ephemeral=True)
             return
@@ -1349,22 +1362,22 @@ class GoalSystem(commands.Cog):
         await interaction.response.send_message(embed=embed, ephemeral=ephemeral)
 
     async def _user_goal_choices(self, interaction: discord.Interaction, current: str, user_id: str | None = None):
-        rows = self.db.execute(
+        rows = await self.db.fetchall(
             """SELECT title FROM user_goals WHERE user_id = ? AND is_active = 1
                AND title LIKE ? COLLATE NOCASE ORDER BY title LIMIT 25""",
             (user_id or str(interaction.user.id), f"%{current}%"),
-        ).fetchall()
+        )
         return [app_commands.Choice(name=row[0][:100], value=row[0]) for row in rows]
 
     async def _template_choices(self, interaction: discord.Interaction, current: str):
         goal_type = self._goal_type_value(getattr(interaction.namespace, "goaltype", ""))
         if goal_type not in GOAL_TYPES:
             return []
-        rows = self.db.execute(
+        rows = await self.db.fetchall(
             """SELECT title FROM goal_templates WHERE goal_type = ? AND is_active = 1
                AND title LIKE ? COLLATE NOCASE ORDER BY title LIMIT 25""",
             (goal_type, f"%{current}%"),
-        ).fetchall()
+        )
         return [app_commands.Choice(name=row[0][:100], value=row[0]) for row in rows]
 
 
@@ -0,0 +1,207 @@
+"""Per-user hunt statistics, kept current by triggers on ``solo_backlogs``.
+
+Marks evaluation needs a handful of aggregates per user — completions,
+give-ups, completions per month and weekly streaks. Computing them from
+``solo_backlogs`` took seven scans per evaluation, so they are rolled up
+instead:
+
+* ``user_hunt_stats`` — one row per user: counters, the number of months
+  with a completion, and the longest weekly streak;
+* ``user_completion_months`` — completions per calendar month ('YYYY-MM');
+* ``user_completion_weeks`` — completions per week (``WEEK_INDEX_SQL``).
+
+Triggers apply every insert, delete and status/date change on
+``solo_backlogs`` to the rollup in the same transaction, whichever command
+(or cog, or bulk import) made it, so the tables can never drift from the
+backlog. A completion counts when the row has status 'completed' and a
+parseable ``completion_date``. Rows that are not and were not completed
+don't fire the triggers at all, so adding games — including bulk imports —
+costs nothing extra.
+
+Abandoned hunts are not a backlog state: /giveup deletes the row, and so
+does removing a mistyped game. /giveup counts them itself with
+``record_abandoned_hunts`` in the same write as its delete.
+
+Streaks are runs of consecutive weeks with at least one completion. Weeks are
+numbered Monday-to-Sunday from 1970-01-05, so runs carry across year ends.
+``rebuild_hunt_stats`` recomputes everything set-based; the migration uses it
+to seed existing databases.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+# Whole weeks since Monday 1970-01-05 (julian day 2440591.5).
+WEEK_INDEX_SQL = "CAST((julianday({date}) - 2440591.5) / 7 AS INTEGER)"
+MONTH_SQL = "strftime('%Y-%m', {date})"
+
+
+def create_hunt_stats_tables(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_hunt_stats (
+            user_id TEXT PRIMARY KEY,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            abandoned_count INTEGER NOT NULL DEFAULT 0,
+            active_months INTEGER NOT NULL DEFAULT 0,
+            longest_weekly_streak INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_completion_months (
+            user_id TEXT NOT NULL,
+            month TEXT NOT NULL,
+            completed INTEGER NOT NULL,
+            PRIMARY KEY (user_id, month)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_completion_weeks (
+            user_id TEXT NOT NULL,
+            week INTEGER NOT NULL,
+            completed INTEGER NOT NULL,
+            PRIMARY KEY (user_id, week)
+        ) WITHOUT ROWID
+    """)
+
+
+def _apply_row(row: str, sign: int) -> str:
+    """Trigger statements adding (sign=1) or removing (sign=-1) one backlog row."""
+    month = MONTH_SQL.format(date=f"{row}.completion_date")
+    week = WEEK_INDEX_SQL.format(date=f"{row}.completion_date")
+    counted = f"{row}.status = 'completed' AND {row}.completion_date IS NOT NULL"
+    statements = [
+        f"INSERT OR IGNORE INTO user_hunt_stats (user_id) SELECT {row}.user_id WHERE {row}.status = 'completed'",
+        f"""UPDATE user_hunt_stats
+            SET completed_count = completed_count + {sign}
+            WHERE user_id = {row}.user_id AND {row}.status = 'completed'""",
+    ]
+    for table, column, bucket in (
+        ("user_completion_months", "month", month),
+        ("user_completion_weeks", "week", week),
+    ):
+        statements.append(f"""
+            INSERT INTO {table} (user_id, {column}, completed)
+            SELECT {row}.user_id, {bucket}, {sign}
+            WHERE {counted} AND {bucket} IS NOT NULL
+            ON CONFLICT (user_id, {column}) DO UPDATE SET completed = completed + excluded.completed""")
+        statements.append(f"DELETE FROM {table} WHERE user_id = {row}.user_id AND completed <= 0 AND {counted}")
+    return ";\n".join(statements) + ";\n"
+
+
+def _refresh_derived(row: str) -> str:
+    """Recompute active months and the longest streak for the row's user (only if it was a completion)."""
+    runs = f"""
+        SELECT COUNT(*) AS weeks, grp
+        FROM (
+            SELECT week - ROW_NUMBER() OVER (ORDER BY week) AS grp
+            FROM user_completion_weeks
+            WHERE user_id = {row}.user_id
+        )
+        GROUP BY grp"""
+    return f"""
+        UPDATE user_hunt_stats SET
+            active_months = (SELECT COUNT(*) FROM user_completion_months WHERE user_id = {row}.user_id),
+            longest_weekly_streak = (SELECT COALESCE(MAX(weeks), 0) FROM ({runs}))
+        WHERE user_id = {row}.user_id AND {row}.status = 'completed';
+"""
+
+
+def create_hunt_stats_triggers(conn: sqlite3.Connection) -> None:
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_solo_backlogs_stats_insert
+        AFTER INSERT ON solo_backlogs
+        WHEN NEW.status = 'completed'
+        BEGIN
+            {_apply_row("NEW", 1)}
+            {_refresh_derived("NEW")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_solo_backlogs_stats_delete
+        AFTER DELETE ON solo_backlogs
+        WHEN OLD.status = 'completed'
+        BEGIN
+            {_apply_row("OLD", -1)}
+            {_refresh_derived("OLD")}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_solo_backlogs_stats_update
+        AFTER UPDATE OF user_id, status, completion_date ON solo_backlogs
+        WHEN OLD.status = 'completed' OR NEW.status = 'completed'
+        BEGIN
+            {_apply_row("OLD", -1)}
+            {_apply_row("NEW", 1)}
+            {_refresh_derived("OLD")}
+            {_refresh_derived("NEW")}
+        END
+    """)
+
+
+def record_abandoned_hunts(conn: sqlite3.Connection, user_id: str, count: int = 1) -> None:
+    """Count ``count`` given-up hunts for ``user_id``."""
+    conn.execute("INSERT OR IGNORE INTO user_hunt_stats (user_id) VALUES (?)", (user_id,))
+    conn.execute(
+        "UPDATE user_hunt_stats SET abandoned_count = abandoned_count + ? WHERE user_id = ?", (count, user_id)
+    )
+
+
+def rebuild_hunt_stats(conn: sqlite3.Connection) -> int:
+    """Recompute every user's rollup from solo_backlogs in a few set-based passes.
+
+    Abandoned counts are kept: deleted rows cannot be recounted. Returns the
+    number of users with stats.
+    """
+    conn.execute("DELETE FROM user_completion_months")
+    conn.execute(f"""
+        INSERT INTO user_completion_months (user_id, month, completed)
+        SELECT user_id, {MONTH_SQL.format(date="completion_date")} AS month, COUNT(*)
+        FROM solo_backlogs
+        WHERE status = 'completed' AND month IS NOT NULL
+        GROUP BY user_id, month
+    """)
+    conn.execute("DELETE FROM user_completion_weeks")
+    conn.execute(f"""
+        INSERT INTO user_completion_weeks (user_id, week, completed)
+        SELECT user_id, {WEEK_INDEX_SQL.format(date="completion_date")} AS week, COUNT(*)
+        FROM solo_backlogs
+        WHERE status = 'completed' AND week IS NOT NULL
+        GROUP BY user_id, week
+    """)
+
+    conn.execute("INSERT OR IGNORE INTO user_hunt_stats (user_id) SELECT DISTINCT user_id FROM solo_backlogs")
+    conn.execute("""
+        UPDATE user_hunt_stats SET
+            completed_count = 0, active_months = 0, longest_weekly_streak = 0
+    """)
+    conn.execute("""
+        UPDATE user_hunt_stats SET completed_count = c.n
+        FROM (SELECT user_id, COUNT(*) AS n FROM solo_backlogs WHERE status = 'completed' GROUP BY user_id) AS c
+        WHERE c.user_id = user_hunt_stats.user_id
+    """)
+    conn.execute("""
+        UPDATE user_hunt_stats SET active_months = m.n
+        FROM (SELECT user_id, COUNT(*) AS n FROM user_completion_months GROUP BY user_id) AS m
+        WHERE m.user_id = user_hunt_stats.user_id
+    """)
+    # Gaps and islands: week - row_number() is constant within a run of
+    # consecutive weeks.
+    conn.execute("""
+        UPDATE user_hunt_stats SET longest_weekly_streak = r.longest
+        FROM (
+            SELECT user_id, MAX(weeks) AS longest
+            FROM (
+                SELECT user_id, grp, COUNT(*) AS weeks
+                FROM (
+                    SELECT user_id, week - ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY week) AS grp
+                    FROM user_completion_weeks
+                )
+                GROUP BY user_id, grp
+            )
+            GROUP BY user_id
+        ) AS r
+        WHERE r.user_id = user_hunt_stats.user_id
+    """)
+    return int(conn.execute("SELECT COUNT(*) FROM user_hunt_stats").fetchone()[0])
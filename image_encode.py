@@ -0,0 +1,100 @@
+"""Encoding rendered cards and boards for upload.
+
+Renderers hand back an ``EncodedImage`` — the file bytes plus a matching
+extension — which the bot wraps in ``discord.File(io.BytesIO(...))``; nothing
+touches the disk and two users with the same display name can no longer race
+on one output path.
+
+The format is configurable through the environment:
+
+* ``CARD_FORMAT`` — ``png`` (default), ``jpeg`` or ``webp``;
+* ``CARD_PNG_COMPRESS_LEVEL`` — zlib level 0-9 for PNG (default 3; on card
+  art it is both faster and smaller than Pillow's default of 6);
+* ``CARD_QUALITY`` — starting quality for JPEG/WebP (default 85);
+* ``CARD_MAX_BYTES`` — upload budget (default 8 MiB).
+
+If the first encode is over budget, PNG falls back to JPEG, then the quality
+steps down to ``MIN_QUALITY`` and, failing that, the image is scaled down.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from typing import NamedTuple
+
+from PIL import Image
+
+
+MIN_QUALITY = 40
+QUALITY_STEP = 10
+DOWNSCALE = 0.75
+MAX_DOWNSCALES = 4
+
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+
+class EncoderSettings(NamedTuple):
+    format: str = "png"
+    png_compress_level: int = 3
+    quality: int = 85
+    max_bytes: int = 8 * 1024 * 1024
+
+    @classmethod
+    def from_env(cls) -> "EncoderSettings":
+        fmt = os.getenv("CARD_FORMAT", cls._field_defaults["format"]).lower()
+        if fmt == "jpg":
+            fmt = "jpeg"
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"CARD_FORMAT must be one of {', '.join(EXTENSIONS)}, not {fmt!r}")
+        return cls(
+            format=fmt,
+            png_compress_level=int(os.getenv("CARD_PNG_COMPRESS_LEVEL", str(cls._field_defaults["png_compress_level"]))),
+            quality=int(os.getenv("CARD_QUALITY", str(cls._field_defaults["quality"]))),
+            max_bytes=int(os.getenv("CARD_MAX_BYTES", str(cls._field_defaults["max_bytes"]))),
+        )
+
+
+class EncodedImage(NamedTuple):
+    data: bytes
+    extension: str
+
+    def filename(self, stem: str) -> str:
+        return f"{stem}.{self.extension}"
+
+
+CARD_ENCODER = EncoderSettings.from_env()
+
+
+def _save(image: Image.Image, fmt: str, settings: EncoderSettings, quality: int) -> bytes:
+    buf = io.BytesIO()
+    if fmt == "png":
+        image.save(buf, "PNG", compress_level=settings.png_compress_level)
+    elif fmt == "jpeg":
+        # JPEG has no alpha; cards are opaque, so dropping it loses nothing.
+        image.convert("RGB").save(buf, "JPEG", quality=quality, optimize=True)
+    else:
+        image.save(buf, "WEBP", quality=quality, method=4)
+    return buf.getvalue()
+
+
+def encode_image(image: Image.Image, settings: EncoderSettings = CARD_ENCODER) -> EncodedImage:
+    """Encode ``image`` per ``settings``, degrading as needed to stay under ``max_bytes``."""
+    data = _save(image, settings.format, settings, settings.quality)
+    if len(data) <= settings.max_bytes:
+        return EncodedImage(data, EXTENSIONS[settings.format])
+
+    fmt = "jpeg" if settings.format == "png" else settings.format
+    for _ in range(MAX_DOWNSCALES + 1):
+        quality = settings.quality
+        while True:
+            data = _save(image, fmt, settings, quality)
+            if len(data) <= settings.max_bytes:
+                return EncodedImage(data, EXTENSIONS[fmt])
+            if quality <= MIN_QUALITY:
+                break
+            quality = max(MIN_QUALITY, quality - QUALITY_STEP)
+        width, height = image.size
+        image = image.resize((max(1, int(width * DOWNSCALE)), max(1, int(height * DOWNSCALE))), Image.LANCZOS)
+
+    raise ValueError(f"could not encode image under {settings.max_bytes} bytes")
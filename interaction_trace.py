@@ -0,0 +1,185 @@
+"""Opt-in trace of every app command and autocomplete, for capacity planning.
+
+The ``logs`` table records what audited commands did, but not their full
+arguments or how long they took. With ``INTERACTION_TRACE_FILE`` set,
+``InstrumentedTree`` hands every interaction it dispatches to a
+``TraceRecorder``, which appends one compact JSON line per interaction:
+
+    {"t":1760781234.512,"k":"command","n":"finishhunt","u":"1234","un":"hunter",
+     "g":"5678","p":{"game_name":"Elden Ring"},"w":41.2,"f":3.8,"db":3,"ok":1}
+
+``t`` is when Discord created the interaction (epoch seconds) and ``k`` the
+kind (command, autocomplete or context_menu). ``n`` is the command name,
+``u``/``un`` the invoker's id and name and ``g`` the guild (null in DMs).
+``p`` holds the raw option values as Discord sent them: user options are ids
+and choices their values. Autocompletes add ``fo``, the option being typed.
+``w`` is the handler wall time and ``f`` the time to the first response, in
+ms, ``db`` the database calls and ``ok`` the outcome. Buttons and modal
+submits are not app commands and are not traced.
+
+Lines are buffered and appended by a background task every
+``TRACE_FLUSH_INTERVAL_SECONDS``, off the event loop. At most
+``TRACE_BUFFER_MAX`` lines wait; beyond that new ones are dropped and
+counted. The file is only ever appended to, so it can be copied or rotated
+(moved aside) while the bot runs. benchmarks/replay_trace.py replays it
+against a copy of the database.
+
+The trace holds user ids and everything they typed. Leave it off unless a
+capacity test needs it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from typing import Any
+
+import discord
+
+
+INTERACTION_TRACE_FILE = os.getenv("INTERACTION_TRACE_FILE", "")
+TRACE_FLUSH_INTERVAL_SECONDS = float(os.getenv("TRACE_FLUSH_INTERVAL_SECONDS", "5"))
+TRACE_BUFFER_MAX = int(os.getenv("TRACE_BUFFER_MAX", "5000"))
+
+# Option types that only nest other options.
+_SUBCOMMAND_TYPES = (1, 2)
+
+
+def interaction_params(data: dict) -> tuple[dict[str, Any], str | None]:
+    """Raw option values of an interaction payload, and the focused option (autocomplete only)."""
+    options = data.get("options") or []
+    while len(options) == 1 and options[0].get("type") in _SUBCOMMAND_TYPES:
+        options = options[0].get("options") or []
+    params: dict[str, Any] = {}
+    focused = None
+    for option in options:
+        params[option["name"]] = option.get("value")
+        if option.get("focused"):
+            focused = option["name"]
+    if "target_id" in data:
+        params["target"] = data["target_id"]
+    return params, focused
+
+
+def _append(path: str, lines: list[str]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write("".join(lines))
+
+
+class TraceRecorder:
+    def __init__(
+        self,
+        path: str,
+        *,
+        flush_interval: float = TRACE_FLUSH_INTERVAL_SECONDS,
+        max_buffer: int = TRACE_BUFFER_MAX,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_buffer = max(1, max_buffer)
+        self._lines: deque[str] = deque()
+        self._task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._closing: asyncio.Event | None = None
+        self.written = 0
+        self.dropped = 0
+
+    def record(
+        self,
+        interaction: discord.Interaction,
+        kind: str,
+        name: str,
+        *,
+        wall_ms: float,
+        first_response_ms: float | None,
+        db_calls: int,
+        ok: bool,
+    ) -> None:
+        """Buffer one line for ``interaction``; never blocks."""
+        if len(self._lines) >= self.max_buffer:
+            self.dropped += 1
+            return
+        params, focused = interaction_params(interaction.data or {})  # type: ignore[arg-type]
+        entry: dict[str, Any] = {
+            "t": round(interaction.created_at.timestamp(), 3),
+            "k": kind,
+            "n": name,
+            "u": str(interaction.user.id),
+            "un": str(interaction.user),
+            "g": str(interaction.guild_id) if interaction.guild_id else None,
+            "p": params,
+        }
+        if focused is not None:
+            entry["fo"] = focused
+        entry["w"] = round(wall_ms, 1)
+        entry["f"] = round(first_response_ms, 1) if first_response_ms is not None else None
+        entry["db"] = db_calls
+        entry["ok"] = int(ok)
+        self._lines.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def start(self) -> None:
+        """Start the background writer on the running loop (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="interaction-trace-writer")
+
+    async def _run(self) -> None:
+        while not self._closing.is_set():
+            try:
+                await asyncio.wait_for(self._closing.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except OSError as e:
+                print(f"Could not append to the interaction trace {self.path}: {e!r}")
+
+    async def flush(self) -> int:
+        """Append everything buffered so far; returns the number of lines written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            if not self._lines:
+                return 0
+            lines = list(self._lines)
+            self._lines.clear()
+            try:
+                await asyncio.to_thread(_append, self.path, lines)
+            except OSError:
+                # Usually nothing was appended (disk full, file locked): keep
+                # the lines for the next attempt, within the buffer limit.
+                self._lines.extendleft(reversed(lines))
+                while len(self._lines) > self.max_buffer:
+                    self._lines.pop()
+                    self.dropped += 1
+                raise
+            self.written += len(lines)
+            return len(lines)
+
+    async def close(self) -> None:
+        """Stop the writer and append the remaining lines."""
+        if self._task is not None:
+            self._closing.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {"buffered": len(self._lines), "written": self.written, "dropped": self.dropped}
+
+
+_trace_recorder: TraceRecorder | None = None
+
+
+def get_trace_recorder() -> TraceRecorder | None:
+    """The shared recorder, or None when ``INTERACTION_TRACE_FILE`` is unset."""
+    global _trace_recorder
+    if _trace_recorder is None and INTERACTION_TRACE_FILE:
+        _trace_recorder = TraceRecorder(INTERACTION_TRACE_FILE)
+    return _trace_recorder
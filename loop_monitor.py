@@ -0,0 +1,164 @@
+"""Event-loop health: scheduling lag and stalls, with the code that caused them.
+
+Anything synchronous that runs on the loop — a SQLite call, Pillow work, a
+blocking HTTP request — delays every other interaction, and past three
+seconds Discord reports "interaction failed". ``LoopMonitor`` makes that
+visible:
+
+* a ticker task sleeps ``LOOP_MONITOR_INTERVAL_SECONDS`` at a time and records
+  how late it woke up. The last ``LOOP_LAG_WINDOW`` lags give the percentiles
+  and bucket counts shown in /healthcheck;
+* a watchdog thread notices when the ticker has not run for
+  ``LOOP_STALL_THRESHOLD_SECONDS`` beyond its interval. While the loop is
+  still blocked, it grabs the loop thread's stack, so the stall is recorded
+  with the handler that was running (the first project frame under the loop)
+  and where it was stuck. Once the loop recovers, the stall gets its full length.
+
+Interactions acknowledged too late are counted by ``command_metrics``, which
+already times the first response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, NamedTuple
+
+
+LOOP_MONITOR_INTERVAL_SECONDS = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", "0.25"))
+LOOP_STALL_THRESHOLD_SECONDS = float(os.getenv("LOOP_STALL_THRESHOLD_SECONDS", "0.2"))
+LOOP_LAG_WINDOW = int(os.getenv("LOOP_LAG_WINDOW", "2400"))
+STALL_HISTORY = 20
+STACK_DEPTH = 12
+
+# Upper bounds (ms) of the lag histogram buckets; the last bucket is open-ended.
+LAG_BUCKETS_MS = (5, 50, 250, 1000)
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Stall(NamedTuple):
+    at: float               # time.time() when the watchdog caught it
+    blocked_ms: float       # how long the loop was blocked (final once it recovered)
+    handler: str            # first project frame under the loop, e.g. "main.py:generate_card"
+    stack: str              # innermost frames at capture time
+
+
+def _describe(frame) -> tuple[str, str]:
+    frames = traceback.extract_stack(frame)
+    # Skip everything up to the loop running the current callback (main.py's
+    # bot.run is on the stack below it), then take the first project frame.
+    start = 0
+    for i, summary in enumerate(frames):
+        if summary.name == "_run" and summary.filename.endswith(os.path.join("asyncio", "events.py")):
+            start = i + 1
+    handler = "unknown"
+    for summary in frames[start:]:
+        if os.path.dirname(os.path.abspath(summary.filename)) == PROJECT_DIR:
+            handler = f"{os.path.basename(summary.filename)}:{summary.name}"
+            break
+    stack = "".join(traceback.format_list(frames[-STACK_DEPTH:]))
+    return handler, stack
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        *,
+        interval: float = LOOP_MONITOR_INTERVAL_SECONDS,
+        stall_threshold: float = LOOP_STALL_THRESHOLD_SECONDS,
+        window: int = LOOP_LAG_WINDOW,
+    ):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.lag_ms: deque[float] = deque(maxlen=window)
+        self.max_lag_ms = 0.0
+        self.stalls: deque[Stall] = deque(maxlen=STALL_HISTORY)
+        self.stall_count = 0
+        self._heartbeat = time.perf_counter()
+        self._captured_for: float | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start the ticker on the running loop and the watchdog thread (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _tick(self) -> None:
+        while True:
+            beat = self._heartbeat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, time.perf_counter() - beat - self.interval) * 1000
+            self.lag_ms.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            if self._captured_for == beat and self.stalls:
+                # The watchdog caught this one mid-stall; record its full length.
+                self.stalls[-1] = self.stalls[-1]._replace(blocked_ms=lag_ms)
+
+    def _watch(self) -> None:
+        poll = max(0.01, self.stall_threshold / 2)
+        while not self._stop.wait(poll):
+            beat = self._heartbeat
+            overdue = time.perf_counter() - beat - self.interval
+            if overdue < self.stall_threshold or self._captured_for == beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            handler, stack = _describe(frame)
+            self._captured_for = beat
+            self.stall_count += 1
+            self.stalls.append(Stall(time.time(), overdue * 1000, handler, stack))
+            print(f"Event loop blocked for {overdue * 1000:.0f} ms+ in {handler}:\n{stack}", file=sys.stderr)
+
+    def snapshot(self) -> dict[str, Any]:
+        lags = sorted(self.lag_ms)
+        buckets = [0] * (len(LAG_BUCKETS_MS) + 1)
+        for lag in lags:
+            for i, bound in enumerate(LAG_BUCKETS_MS):
+                if lag <= bound:
+                    buckets[i] += 1
+                    break
+            else:
+                buckets[-1] += 1
+        return {
+            "samples": len(lags),
+            "window_seconds": len(lags) * self.interval,
+            "lag_p50_ms": _percentile(lags, 50),
+            "lag_p95_ms": _percentile(lags, 95),
+            "lag_p99_ms": _percentile(lags, 99),
+            "lag_max_ms": self.max_lag_ms,
+            "lag_buckets": dict(zip([f"<={b}ms" for b in LAG_BUCKETS_MS] + [f">{LAG_BUCKETS_MS[-1]}ms"], buckets)),
+            "stalls": self.stall_count,
+            "last_stall": self.stalls[-1] if self.stalls else None,
+        }
+
+
+loop_monitor = LoopMonitor()
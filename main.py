@@ -9,13 +9,35 @@ import sqlite3
 import os
 import time
 from datetime import timedelta
-from datetime import datetime
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import random
-from PIL import Image, ImageDraw, ImageFont
-import requests
 import re
 import asyncio
+import io
+
+from database import DB_PATH, close_databases, get_database
+from migrations import apply_migrations
+from game_index import game_index
+from backlog_cache import UserBacklog, get_backlog_cache
+from az_builder import LETTERS, az_candidates, pick_az_games
+from backlog_import import import_backlog
+from backlog_keys import normalize_game_name
+from assets import assets
+from audit_log import create_audit_log_table, get_audit_log
+from interaction_trace import get_trace_recorder
+from banner import render_completion_banner, warm_banner_assets
+from hunt_stats import record_abandoned_hunts
+from marks import evaluate_and_unlock_marks, seed_hunting_marks
+from marks_backfill import backfill_marks, format_report
+from marks_board import load_slot_map, marks_boards
+from render_pool import RenderPool
+from avatar_cache import get_avatar_cache
+from loop_monitor import loop_monitor
+from query_profiler import SLOW_QUERY_MS, SQL_PROFILE, format_report as format_query_report, profiler as query_profiler
+from command_metrics import COMMAND_METRICS_FILE, InstrumentedTree, dump_metrics_periodically, format_command_stats
+from cover_cache import get_cover_cache
+from web_client import close_session
 
 
 # Load environment variables
@@ -26,118 +48,160 @@ start_time = time.time()
 TOKEN = os.getenv('DISCORD_TOKEN')
 STEAMGRIDDB_API_KEY = os.getenv('STEAMGRIDDB_API_KEY')
 
-# Database setup
-conn = sqlite3.connect('hunters_ledger.db')
-c = conn.cursor()
-
-# Database schema
-c.execute('''CREATE TABLE IF NOT EXISTS games (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                game_name TEXT UNIQUE,
-                platform TEXT
-            )''')
-
-c.execute('''CREATE TABLE IF NOT EXISTS user_games (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT,
-                user_name TEXT,
-                game_id INTEGER,
-                platform TEXT,
-                FOREIGN KEY (game_id) REFERENCES games(id)
-            )''')
-c.execute('''CREATE TABLE IF NOT EXISTS logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user TEXT NOT NULL,
-                command TEXT NOT NULL,
-                game_name TEXT
-            )''')
-c.execute('''CREATE TABLE IF NOT EXISTS solo_backlogs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                user_name TEXT NOT NULL,
-                game_name TEXT NOT NULL,
-                status TEXT CHECK(status IN ('not started', 'in progress', 'completed')) DEFAULT 'not started',
-                completion_date DATE,
-                rating INTEGER CHECK(rating BETWEEN 1 AND 5),
-                comments TEXT
-            )''')
-
-# --- Challenge tables (Next10 / A-Z Hunts) ---
-  
-c.execute('''
-CREATE TABLE IF NOT EXISTS next10_lists (
-    user_id TEXT PRIMARY KEY,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS next10_items (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id TEXT NOT NULL,
-    game_name TEXT NOT NULL,
-    completed INTEGER DEFAULT 0,
-    completed_at TIMESTAMP,
-    UNIQUE(user_id, game_name)
-)
-''')
+# Worker processes for banner/board rendering; decode the art first so the
+# forked workers start with it, and fork them before any other thread exists
+warm_banner_assets()
+render_pool = RenderPool()
+render_pool.start()
+
+# Database setup (shared with the cogs)
+db = get_database(DB_PATH)
+backlog_cache = get_backlog_cache()
+cover_cache = get_cover_cache()
+avatar_cache = get_avatar_cache()
+
+
+def init_schema(conn: sqlite3.Connection):
+    # Database schema
+    conn.execute('''CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    game_name TEXT UNIQUE,
+                    platform TEXT
+                )''')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS user_games (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT,
+                    user_name TEXT,
+                    game_id INTEGER,
+                    platform TEXT,
+                    FOREIGN KEY (game_id) REFERENCES games(id)
+                )''')
+    # The audit table with every column the buffered writer inserts
+    create_audit_log_table(conn)
+    conn.execute('''CREATE TABLE IF NOT EXISTS solo_backlogs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    game_name TEXT NOT NULL,
+                    status TEXT CHECK(status IN ('not started', 'in progress', 'completed')) DEFAULT 'not started',
+                    completion_date DATE,
+                    rating INTEGER CHECK(rating BETWEEN 1 AND 5),
+                    comments TEXT
+                )''')
+
+    # --- Challenge tables (Next10 / A-Z Hunts) ---
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS next10_lists (
+        user_id TEXT PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS next10_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        game_name TEXT NOT NULL,
+        completed INTEGER DEFAULT 0,
+        completed_at TIMESTAMP,
+        UNIQUE(user_id, game_name)
+    )
+    ''')
 
-c.execute('''
-CREATE TABLE IF NOT EXISTS az_lists (
-    user_id TEXT PRIMARY KEY,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-)
-''')
-
-c.execute('''
-CREATE TABLE IF NOT EXISTS az_items (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    user_id TEXT NOT NULL,
-    letter TEXT NOT NULL,
-    game_name TEXT,                 -- NULL means NA
-    completed INTEGER DEFAULT 0,
-    completed_at TIMESTAMP,
-    UNIQUE(user_id, letter)
-)
-''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS az_lists (
+        user_id TEXT PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS az_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        letter TEXT NOT NULL,
+        game_name TEXT,                 -- NULL means NA
+        completed INTEGER DEFAULT 0,
+        completed_at TIMESTAMP,
+        UNIQUE(user_id, letter)
+    )
+    ''')
 
-c.execute('''
-CREATE TABLE IF NOT EXISTS challenge_stats (
-    user_id TEXT PRIMARY KEY,
-    next10_completed_count INTEGER DEFAULT 0,
-    az_completed_count INTEGER DEFAULT 0
-)
-''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS challenge_stats (
+        user_id TEXT PRIMARY KEY,
+        next10_completed_count INTEGER DEFAULT 0,
+        az_completed_count INTEGER DEFAULT 0
+    )
+    ''')
 
-# --- Marks of the Hunt ---
+    # --- Marks of the Hunt ---
 
-c.execute("""
-CREATE TABLE IF NOT EXISTS hunting_marks (
-    key TEXT PRIMARY KEY,
-    slot_index INTEGER NOT NULL,        -- fixed position on board (0..N-1)
-    is_hidden INTEGER DEFAULT 0          -- 1 = secret mark not shown in empty slot hints
-)
-""")
-
-c.execute("""
-CREATE TABLE IF NOT EXISTS user_hunting_marks (
-    user_id TEXT NOT NULL,
-    key TEXT NOT NULL,
-    unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    PRIMARY KEY (user_id, key),
-    FOREIGN KEY (key) REFERENCES hunting_marks(key)
-)
-""")
-conn.commit()
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS hunting_marks (
+        key TEXT PRIMARY KEY,
+        slot_index INTEGER NOT NULL,        -- fixed position on board (0..N-1)
+        is_hidden INTEGER DEFAULT 0          -- 1 = secret mark not shown in empty slot hints
+    )
+    """)
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS user_hunting_marks (
+        user_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (user_id, key),
+        FOREIGN KEY (key) REFERENCES hunting_marks(key)
+    )
+    """)
+
+
+db.write_sync(init_schema)
+db.write_sync(apply_migrations)
+audit_log = get_audit_log()
+trace_recorder = get_trace_recorder()
 
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="/", intents=intents)
+
+class LedgerBot(commands.Bot):
+    metrics_dump: asyncio.Task | None = None
+
+    async def setup_hook(self):
+        loop_monitor.start()
+        audit_log.start()
+        if trace_recorder is not None:
+            self.tree.trace = trace_recorder
+            trace_recorder.start()
+        if COMMAND_METRICS_FILE:
+            self.metrics_dump = asyncio.create_task(dump_metrics_periodically(self.tree.metrics))
+
+    async def close(self):
+        # Release shared resources before discord.py tears down the loop
+        if self.metrics_dump is not None:
+            self.metrics_dump.cancel()
+            try:
+                self.tree.metrics.write_prometheus(COMMAND_METRICS_FILE)
+            except OSError:
+                pass
+        await audit_log.close()
+        if trace_recorder is not None:
+            await trace_recorder.close()
+        loop_monitor.stop()
+        await close_session()
+        render_pool.close()
+        await super().close()
+
+bot = LedgerBot(command_prefix="/", intents=intents, tree_cls=InstrumentedTree)
 
 # Load extensions on startup
 @bot.event # Sync slash commands with Discord
 async def on_ready():
+    # (Re)build the game-name autocomplete index from the games table
+    game_index.load(row[0] for row in await db.fetchall("SELECT game_name FROM games"))
   # Register the bot's slash commands globally (across all servers) or for specific guilds
     if "calendar_invite" not in bot.extensions:
         await bot.load_extension("calendar_invite")  # Name of the Python file (no .py)
@@ -149,31 +213,33 @@ async def on_ready():
 # Command: Track a game with platform in the game title
 @bot.tree.command(name="trackhunt", description="Add a game to the list")
 async def track_hunt(interaction: discord.Interaction, game_name: str):
-    # Case-insensitive existence check to prevent A/a duplicates
-    c.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    row = c.fetchone()
+    user_id = str(interaction.user.id)
+    user_name = str(interaction.user)
 
-    if row:
-        await interaction.response.send_message(f"The game '{row[1]}' is already being tracked.")
-        return
+    def track(conn: sqlite3.Connection):
+        # Case-insensitive existence check to prevent A/a duplicates
+        row = conn.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,)).fetchone()
+        if row:
+            return row[1]
 
-    # Insert the game using the user's original casing
-    c.execute("INSERT INTO games (game_name) VALUES (?)", (game_name,))
-    conn.commit()
+        # Insert the game using the user's original casing
+        game_id = conn.execute("INSERT INTO games (game_name) VALUES (?)", (game_name,)).lastrowid
 
-    # Auto-join the creator to save an extra command
-    user_id = str(interaction.user.id)
-    user_name = str(interaction.user)
-    c.execute("SELECT id FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    game_id = c.fetchone()[0]
-    c.execute("INSERT INTO user_games (user_id, user_name, game_id) VALUES (?, ?, ?)", (user_id, user_name, game_id))
-    conn.commit()
+        # Auto-join the creator to save an extra command
+        conn.execute("INSERT INTO user_games (user_id, user_name, game_id) VALUES (?, ?, ?)", (user_id, user_name, game_id))
+        return None
+
+    existing_name = await db.write(track)
+    if existing_name:
+        await interaction.response.send_message(f"The game '{existing_name}' is already being tracked.")
+        return
+    game_index.add(game_name)
 
     await interaction.response.send_message(
         f"Game '{game_name}' has been added and you've been added to its hunters."
     )
 
-def log_command(
+async def log_command(
     interaction: discord.Interaction,
     command: str,
     game_name: str | None = None,
@@ -183,11 +249,8 @@ def log_command(
     user_id = str(interaction.user.id)             # Discord snowflake
     location = "DM" if interaction.guild is None else f"GUILD:{interaction.guild.id}"
 
-    c.execute("""
-        INSERT INTO logs (user, command, game_name, user_id, location, extra)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (user_display, command, game_name, user_id, location, extra))
-    conn.commit()
+    # Queued; the audit log writes it with the next batch
+    audit_log.record(user_display, command, game_name, user_id, location, extra)
 
 
 
@@ -225,8 +288,8 @@ class PlatformView(discord.ui.View):  # Replace ui.View with discord.ui.View
 
 # Process platform selection
 async def process_platform(interaction: discord.Interaction, game_name: str, platform: str):
-    c.execute("INSERT INTO games (game_name, platform) VALUES (?, ?)", (game_name, platform))
-    conn.commit()
+    await db.execute("INSERT INTO games (game_name, platform) VALUES (?, ?)", (game_name, platform))
+    game_index.add(game_name)
     await interaction.response.send_message(
         f"Game '{game_name}' has been added to the list under '{platform}'.",
         ephemeral=True
@@ -244,19 +307,17 @@ class JoinHuntView(discord.ui.View):
         user_id = str(interaction.user.id)
         user_name = str(interaction.user)
 
-        c.execute("SELECT 1 FROM user_games WHERE user_id = ? AND game_id = ?", (user_id, self.game_id))
-        if c.fetchone():
+        if await db.fetchone("SELECT 1 FROM user_games WHERE user_id = ? AND game_id = ?", (user_id, self.game_id)):
             await interaction.response.send_message(
                 f"{interaction.user.mention}, you're already hunting '{self.game_name}'.",
                 ephemeral=True
             )
             return
 
-        c.execute(
+        await db.execute(
             "INSERT INTO user_games (user_id, user_name, game_id) VALUES (?, ?, ?)",
             (user_id, user_name, self.game_id)
         )
-        conn.commit()
         await interaction.response.send_message(
             f"{interaction.user.mention} joined the hunt for '{self.game_name}'.",
             ephemeral=True
@@ -305,6 +366,8 @@ async def _send_long(interaction: discord.Interaction, header: str, lines: list[
 
   
 # ---- Mass add modal for solo backlog ----
+MASS_HUNTS_DEFER_THRESHOLD = 50
+
 class MassHuntsModal(discord.ui.Modal, title="Mass add solo hunts"):
    # instructions = discord.ui.TextInput(
    #   label="How to use",
@@ -340,55 +403,28 @@ class MassHuntsModal(discord.ui.Modal, title="Mass add solo hunts"):
             parts = re.split(r"[,;\n]+", str(raw))
             return [p.strip() for p in parts if p.strip()]
 
-        def norm(s: str) -> str:
-            return " ".join(s.split()).lower()
-
         ns_raw = parse_list(str(self.not_started.value))
         ip_raw = parse_list(str(self.in_progress.value))
 
         # --- unchanged logic below ---
-        ns_map = {norm(g): g for g in ns_raw}
-        ip_map = {norm(g): g for g in ip_raw}
+        ns_map = {normalize_game_name(g): g for g in ns_raw}
+        ip_map = {normalize_game_name(g): g for g in ip_raw}
 
         # In progress wins if listed in both
         for key in set(ns_map.keys()) & set(ip_map.keys()):
             ns_map.pop(key, None)
 
-        added_ns, added_ip = [], []
-        moved_to_ns, moved_to_ip = [], []
-        unchanged = []
+        # Big pastes can take a moment; acknowledge within Discord's 3s window first
+        deferred = len(ns_map) + len(ip_map) > MASS_HUNTS_DEFER_THRESHOLD
+        if deferred:
+            await interaction.response.defer(ephemeral=True, thinking=True)
 
-        def upsert(game_display: str, target_status: str, added_list: list[str], moved_list: list[str]):
-            c.execute(
-                'SELECT game_name, status FROM solo_backlogs WHERE user_id = ? AND LOWER(game_name) = LOWER(?)',
-                (self._user_id, game_display)
-            )
-            row = c.fetchone()
-
-            if not row:
-                c.execute(
-                    'INSERT INTO solo_backlogs (user_id, user_name, game_name, status) VALUES (?, ?, ?, ?)',
-                    (self._user_id, self._user_name, game_display, target_status)
-                )
-                added_list.append(game_display)
-                return
-
-            existing_name, existing_status = row
-            if existing_status != target_status:
-                c.execute(
-                    'UPDATE solo_backlogs SET status = ?, user_name = ? WHERE user_id = ? AND LOWER(game_name) = LOWER(?)',
-                    (target_status, self._user_name, self._user_id, game_display)
-                )
-                moved_list.append(existing_name)
-            else:
-                unchanged.append(existing_name)
-
-        for g in ns_map.values():
-            upsert(g, "not started", added_ns, moved_to_ns)
-        for g in ip_map.values():
-            upsert(g, "in progress", added_ip, moved_to_ip)
+        added_ns, added_ip, moved_to_ns, moved_to_ip, unchanged = await db.write(
+            import_backlog, self._user_id, self._user_name, list(ns_map.values()), list(ip_map.values())
+        )
+        backlog_cache.invalidate(self._user_id)
 
-        conn.commit()
+        send = interaction.followup.send if deferred else interaction.response.send_message
 
         segments = []
         if added_ip:
@@ -401,38 +437,55 @@ class MassHuntsModal(discord.ui.Modal, title="Mass add solo hunts"):
             segments.append("**Moved to Not Started:** " + ", ".join(moved_to_ns))
 
         if not segments:
-            await interaction.response.send_message(
+            await send(
                 "Nothing to change. (Everything you entered is already in that status.)",
                 ephemeral=True
             )
             return
 
-        await interaction.response.send_message(
+        await send(
             "Updated your solo backlog:\n" + "\n".join(segments),
             ephemeral=True
         )
 
-def is_completed_for_user(user_id: str, game_name: str) -> bool:
-    c.execute('''
-        SELECT 1 FROM solo_backlogs
-        WHERE user_id = ? AND LOWER(game_name) = LOWER(?) AND status = "completed"
-        LIMIT 1
-    ''', (user_id, game_name))
-    return c.fetchone() is not None
+async def is_completed_for_user(user_id: str, game_name: str) -> bool:
+    return (await backlog_cache.get(user_id)).is_completed(game_name)
 
-def strike_if_done(user_id: str, game_name: str) -> str:
-    return f"~~{game_name}~~ ✅" if is_completed_for_user(user_id, game_name) else game_name
+# ---- Challenge list pipeline (Next10 / A–Z) ----
+# A list is read with one query and checked against the cached backlog
+# snapshot, so the number of queries per render does not depend on the list
+# length. Both match names on the backlog's normalised key (backlog_keys);
+# /synclists does the same checks against the database inside its write.
+
+def challenge_entries(backlog: UserBacklog, rows) -> list[tuple[str, str | None, str | None]]:
+    """(label, game_name, status) per list row; status is None if the game left the backlog."""
+    return [(label, name, backlog.status_of(name) if name else None) for label, name in rows]
+
+def render_challenge_lines(entries, fmt) -> tuple[list[str], int, int]:
+    """Format entries with ``fmt(label, text)``; returns (lines, completed, playable)."""
+    lines = []
+    done = 0
+    playable = 0
+    for label, name, status in entries:
+        if not name:
+            lines.append(fmt(label, "NA"))
+            continue
+        playable += 1
+        if status == "completed":
+            done += 1
+            lines.append(fmt(label, f"~~{name}~~ ✅"))
+        else:
+            lines.append(fmt(label, name))
+    return lines, done, playable
+
+async def ensure_challenge_stats_row(user_id: str):
+    await db.execute("INSERT OR IGNORE INTO challenge_stats (user_id) VALUES (?)", (user_id,))
 
-def ensure_challenge_stats_row(user_id: str):
-    c.execute("INSERT OR IGNORE INTO challenge_stats (user_id) VALUES (?)", (user_id,))
-    conn.commit()
 
-  
 # Command: Show all tracked hunts
 @bot.tree.command(name="showhunts", description="Show all games currently being managed")
 async def show_hunts(interaction: discord.Interaction):
-    c.execute("SELECT game_name FROM games ORDER BY game_name ASC")
-    games = [row[0] for row in c.fetchall()]
+    games = [row[0] for row in await db.fetchall("SELECT game_name FROM games ORDER BY game_name ASC")]
     if not games:
         await interaction.response.send_message("No games are currently being tracked.")
         return
@@ -458,15 +511,13 @@ async def show_hunts(interaction: discord.Interaction):
 @bot.tree.command(name="whohunts", description="Show who is playing a specific game with a user count")
 @app_commands.describe(game_name="Start typing to search...")
 async def who_hunts(interaction: discord.Interaction, game_name: str):
-    c.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    game = c.fetchone()
+    game = await db.fetchone("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
     if not game:
         await interaction.response.send_message(f"Game '{game_name}' not found.", ephemeral=True)
         return
 
     game_id, canonical_name = game
-    c.execute("SELECT user_name FROM user_games WHERE game_id = ?", (game_id,))
-    users = [u[0] for u in c.fetchall()]
+    users = [u[0] for u in await db.fetchall("SELECT user_name FROM user_games WHERE game_id = ?", (game_id,))]
 
     user_list = "\n".join(users) if users else "_No hunters yet_"
     view = JoinHuntView(game_id, canonical_name)
@@ -481,15 +532,13 @@ async def who_hunts(interaction: discord.Interaction, game_name: str):
         view=view
     )
 
-# Autocomplete for game names
+# Autocomplete for game names (served from the in-memory index, no SQLite)
+def game_name_choices(current: str) -> list[app_commands.Choice[str]]:
+    return [app_commands.Choice(name=name, value=name) for name in game_index.search(current)]
+
 @who_hunts.autocomplete("game_name")
 async def who_hunts_autocomplete(interaction: discord.Interaction, current: str):
-    like = f"%{current}%"
-    c.execute(
-        "SELECT game_name FROM games WHERE game_name LIKE ? COLLATE NOCASE ORDER BY game_name ASC LIMIT 25",
-        (like,)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    return game_name_choices(current)
 
 
 
@@ -502,29 +551,26 @@ async def join_hunt(interaction: discord.Interaction, game_name: str):
     user_name = str(interaction.user)
 
     # Case-insensitive lookup
-    c.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    game = c.fetchone()
+    game = await db.fetchone("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
     if not game:
         await interaction.response.send_message(f"Game '{game_name}' not found.", ephemeral=True)
         return
 
     game_id, canonical_name = game
-    c.execute(
+    if await db.fetchone(
         "SELECT 1 FROM user_games WHERE user_id = ? AND game_id = ?",
         (user_id, game_id)
-    )
-    if c.fetchone():
+    ):
         await interaction.response.send_message(
             f"{interaction.user.mention}, you're already hunting '{canonical_name}'.",
             ephemeral=True
         )
         return
 
-    c.execute(
+    await db.execute(
         "INSERT INTO user_games (user_id, user_name, game_id) VALUES (?, ?, ?)",
         (user_id, user_name, game_id)
     )
-    conn.commit()
     await interaction.response.send_message(
         f"{interaction.user.mention}, you've joined the hunt for '{canonical_name}'."
     )
@@ -535,11 +581,8 @@ async def join_hunt_autocomplete(
     interaction: discord.Interaction,
     current: str
 ) -> list[app_commands.Choice[str]]:
-    # Fetch up to 25 matching games (Discord limit) - case-insensitive
-    like = f"%{current}%"
-    c.execute("SELECT game_name FROM games WHERE game_name LIKE ? COLLATE NOCASE ORDER BY game_name ASC LIMIT 25", (like,))
-    rows = c.fetchall()
-    return [app_commands.Choice(name=r[0], value=r[0]) for r in rows]
+    # Up to 25 matching games (Discord limit) - case-insensitive
+    return game_name_choices(current)
 
 # Command: Leave a hunt
 @bot.tree.command(name="leavehunt", description="Remove yourself from a game's player list")
@@ -547,17 +590,15 @@ async def join_hunt_autocomplete(
 async def leave_hunt(interaction: discord.Interaction, game_name: str):
     user_id = str(interaction.user.id)
 
-    c.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    game = c.fetchone()
+    game = await db.fetchone("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
     if not game:
         await interaction.response.send_message(f"Game '{game_name}' not found.", ephemeral=True)
         return
 
     game_id, canonical_name = game
-    c.execute("DELETE FROM user_games WHERE user_id = ? AND game_id = ?", (user_id, game_id))
-    conn.commit()
+    cursor = await db.execute("DELETE FROM user_games WHERE user_id = ? AND game_id = ?", (user_id, game_id))
 
-    if c.rowcount:
+    if cursor.rowcount:
         await interaction.response.send_message(
             f"{interaction.user.mention}, you've left the hunt for '{canonical_name}'."
         )
@@ -569,24 +610,18 @@ async def leave_hunt(interaction: discord.Interaction, game_name: str):
 
 @leave_hunt.autocomplete('game_name')
 async def leave_hunt_autocomplete(interaction: discord.Interaction, current: str):
-    like = f"%{current}%"
-    c.execute(
-        "SELECT game_name FROM games WHERE game_name LIKE ? COLLATE NOCASE ORDER BY game_name ASC LIMIT 25",
-        (like,)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    return game_name_choices(current)
 
 
 # Command: Show games the user is hunting
 @bot.tree.command(name="showmyhunts", description="Show all games you are added to")
 async def show_my_hunts(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
-    c.execute('''SELECT g.game_name 
+    games = await db.fetchall('''SELECT g.game_name 
                  FROM games g 
                  JOIN user_games ug ON g.id = ug.game_id 
                  WHERE ug.user_id = ? 
                  ORDER BY g.game_name ASC''', (user_id,))
-    games = c.fetchall()
     if games:
         game_list = "\n".join([game[0] for game in games])
         await interaction.response.send_message(f"**Your Hunts:**\n{game_list}")
@@ -597,12 +632,11 @@ async def show_my_hunts(interaction: discord.Interaction):
 @bot.tree.command(name="showhunter", description="Show all games a user is added to")
 async def show_hunter(interaction: Interaction, user: discord.User):
     user_id = str(user.id)
-    c.execute('''SELECT g.game_name 
+    games = await db.fetchall('''SELECT g.game_name 
                  FROM games g 
                  JOIN user_games ug ON g.id = ug.game_id 
                  WHERE ug.user_id = ? 
                  ORDER BY g.game_name ASC''', (user_id,))
-    games = c.fetchall()
     if games:
         game_list = "\n".join([game[0] for game in games])
         await interaction.response.send_message(f"**Games {user.mention} is hunting:**\n{game_list}")
@@ -612,13 +646,12 @@ async def show_hunter(interaction: Interaction, user: discord.User):
 # Command: Show the top 5 most popular games
 @bot.tree.command(name="mosthunted", description="Show the top 5 most popular games")
 async def most_hunted(interaction: Interaction):
-    c.execute('''SELECT g.game_name, COUNT(ug.user_id) as player_count 
+    games = await db.fetchall('''SELECT g.game_name, COUNT(ug.user_id) as player_count 
                  FROM games g 
                  JOIN user_games ug ON g.id = ug.game_id 
                  GROUP BY g.game_name 
                  ORDER BY player_count DESC 
                  LIMIT 5''')
-    games = c.fetchall()
     if games:
         game_list = "\n".join([f"{game[0]} - {game[1]} hunters" for game in games])
         await interaction.response.send_message(f"**Top 5 Most Hunted Games:**\n{game_list}")
@@ -628,11 +661,10 @@ async def most_hunted(interaction: Interaction):
 # Command: Show games with no hunters
 @bot.tree.command(name="nothunted", description="Show a list of games with no users signed up")
 async def not_hunted(interaction: Interaction):
-    c.execute('''SELECT g.game_name 
+    games = await db.fetchall('''SELECT g.game_name 
                  FROM games g 
                  LEFT JOIN user_games ug ON g.id = ug.game_id 
                  WHERE ug.game_id IS NULL''')
-    games = c.fetchall()
     if games:
         game_list = "\n".join([game[0] for game in games])
         await interaction.response.send_message(f"**Games with No Hunters:**\n{game_list}")
@@ -643,9 +675,9 @@ async def not_hunted(interaction: Interaction):
 @bot.tree.command(name="changehunt", description="Rename a game in the database")
 @commands.has_permissions(administrator=True)
 async def change_hunt(interaction: Interaction, old_name: str, new_name: str):
-    c.execute("UPDATE games SET game_name = ? WHERE game_name = ?", (new_name, old_name))
-    if conn.total_changes > 0:
-        conn.commit()
+    cursor = await db.execute("UPDATE games SET game_name = ? WHERE game_name = ?", (new_name, old_name))
+    if cursor.rowcount > 0:
+        game_index.rename(old_name, new_name)
         await interaction.response.send_message(f"Game '{old_name}' has been renamed to '{new_name}'.")
     else:
         await interaction.response.send_message(f"Game '{old_name}' not found.")
@@ -670,19 +702,18 @@ class ConfirmForgetView(discord.ui.View):
             return
 
         # Count and remove all signups, then the game
-        c.execute("SELECT COUNT(*) FROM user_games WHERE game_id = ?", (self.game_id,))
-        links_before = int(c.fetchone()[0] or 0)
+        def forget(conn: sqlite3.Connection):
+            links_before = int(conn.execute("SELECT COUNT(*) FROM user_games WHERE game_id = ?", (self.game_id,)).fetchone()[0] or 0)
+            links_deleted = conn.execute("DELETE FROM user_games WHERE game_id = ?", (self.game_id,)).rowcount
+            game_deleted = conn.execute("DELETE FROM games WHERE id = ?", (self.game_id,)).rowcount
+            return links_before, links_deleted, game_deleted
 
-        c.execute("DELETE FROM user_games WHERE game_id = ?", (self.game_id,))
-        links_deleted = c.rowcount
-
-        c.execute("DELETE FROM games WHERE id = ?", (self.game_id,))
-        game_deleted = c.rowcount
-
-        conn.commit()
+        links_before, links_deleted, game_deleted = await db.write(forget)
+        if game_deleted:
+            game_index.remove(self.canonical_name)
 
         # ✅ Log the confirmed deletion
-        log_command(
+        await log_command(
             interaction,
             "forgethunt_OK_CONFIRMED",
             game_name=self.canonical_name,
@@ -699,7 +730,7 @@ class ConfirmForgetView(discord.ui.View):
             return
 
         # (Optional but useful) log cancellations too
-        log_command(
+        await log_command(
             interaction,
             "forgethunt_CANCELLED",
             game_name=self.canonical_name,
@@ -716,29 +747,30 @@ async def forget_hunt(interaction: discord.Interaction, game_name: str):
     requester_id = str(interaction.user.id)
 
     # Find the game (case-insensitive)
-    c.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    game = c.fetchone()
+    game = await db.fetchone("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
     if not game:
-        log_command(interaction, "forgethunt_NOT_FOUND", game_name=game_name)
+        await log_command(interaction, "forgethunt_NOT_FOUND", game_name=game_name)
         await interaction.response.send_message(f"Game '{game_name}' not found.", ephemeral=True)
         return
 
     game_id, canonical_name = game
 
     # Who's hunting?
-    c.execute("SELECT user_id FROM user_games WHERE game_id = ?", (game_id,))
-    hunters = [u[0] for u in c.fetchall()]
+    hunters = [u[0] for u in await db.fetchall("SELECT user_id FROM user_games WHERE game_id = ?", (game_id,))]
     others_count = len([u for u in hunters if u != requester_id])
 
     # If the requester is the only hunter, remove immediately
     if others_count == 0:
-        c.execute("DELETE FROM user_games WHERE game_id = ?", (game_id,))
-        links_deleted = c.rowcount
-        c.execute("DELETE FROM games WHERE id = ?", (game_id,))
-        game_deleted = c.rowcount
-        conn.commit()
+        def forget(conn: sqlite3.Connection):
+            links_deleted = conn.execute("DELETE FROM user_games WHERE game_id = ?", (game_id,)).rowcount
+            game_deleted = conn.execute("DELETE FROM games WHERE id = ?", (game_id,)).rowcount
+            return links_deleted, game_deleted
+
+        links_deleted, game_deleted = await db.write(forget)
+        if game_deleted:
+            game_index.remove(canonical_name)
 
-        log_command(
+        await log_command(
             interaction,
             "forgethunt_OK_ONLY_HUNTER",
             game_name=canonical_name,
@@ -751,7 +783,7 @@ async def forget_hunt(interaction: discord.Interaction, game_name: str):
         return
 
     # Otherwise, ask for confirmation
-    log_command(
+    await log_command(
         interaction,
         "forgethunt_CONFIRM_SHOWN",
         game_name=canonical_name,
@@ -768,12 +800,7 @@ async def forget_hunt(interaction: discord.Interaction, game_name: str):
 
 @forget_hunt.autocomplete('game_name')
 async def forget_hunt_autocomplete(interaction: discord.Interaction, current: str):
-    like = f"%{current}%"
-    c.execute(
-        "SELECT game_name FROM games WHERE game_name LIKE ? COLLATE NOCASE ORDER BY game_name ASC LIMIT 25",
-        (like,)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    return game_name_choices(current)
 
 
 # Command: Remove a user from all games (Admin Only)
@@ -781,8 +808,7 @@ async def forget_hunt_autocomplete(interaction: discord.Interaction, current: st
 @commands.has_permissions(administrator=True)
 async def forget_hunter(interaction: Interaction, user: discord.User):
     user_id = str(user.id)
-    c.execute("DELETE FROM user_games WHERE user_id = ?", (user_id,))
-    conn.commit()
+    await db.execute("DELETE FROM user_games WHERE user_id = ?", (user_id,))
     await interaction.response.send_message(f"{user.mention} has been removed from all games.")
 
 
@@ -815,8 +841,7 @@ async def remove_hunter(interaction: discord.Interaction, game_name: str, hunter
         await interaction.response.send_message("Only admins can remove another hunter from a hunt.", ephemeral=True)
         return
 
-    c.execute("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
-    game = c.fetchone()
+    game = await db.fetchone("SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)", (game_name,))
     if not game:
         await interaction.response.send_message(f"Game '{game_name}' not found.", ephemeral=True)
         return
@@ -826,7 +851,7 @@ async def remove_hunter(interaction: discord.Interaction, game_name: str, hunter
 
     if not hunter_id:
         like = f"%{hunter}%"
-        c.execute(
+        matches = await db.fetchall(
             """SELECT user_id, user_name
                FROM user_games
                WHERE game_id = ? AND user_name LIKE ? COLLATE NOCASE
@@ -834,7 +859,6 @@ async def remove_hunter(interaction: discord.Interaction, game_name: str, hunter
                LIMIT 2""",
             (game_id, like)
         )
-        matches = c.fetchall()
         if len(matches) == 1:
             hunter_id = str(matches[0][0])
         else:
@@ -844,11 +868,10 @@ async def remove_hunter(interaction: discord.Interaction, game_name: str, hunter
             )
             return
 
-    c.execute(
+    signup = await db.fetchone(
         "SELECT user_name FROM user_games WHERE game_id = ? AND user_id = ?",
         (game_id, hunter_id)
     )
-    signup = c.fetchone()
     if not signup:
         await interaction.response.send_message(
             f"<@{hunter_id}> is not signed up for '{canonical_name}'.",
@@ -856,8 +879,7 @@ async def remove_hunter(interaction: discord.Interaction, game_name: str, hunter
         )
         return
 
-    c.execute("DELETE FROM user_games WHERE game_id = ? AND user_id = ?", (game_id, hunter_id))
-    conn.commit()
+    await db.execute("DELETE FROM user_games WHERE game_id = ? AND user_id = ?", (game_id, hunter_id))
 
     await interaction.response.send_message(
         f"Removed <@{hunter_id}> from the hunt for '{canonical_name}'."
@@ -866,12 +888,7 @@ async def remove_hunter(interaction: discord.Interaction, game_name: str, hunter
 
 @remove_hunter.autocomplete("game_name")
 async def remove_hunter_game_autocomplete(interaction: discord.Interaction, current: str):
-    like = f"%{current}%"
-    c.execute(
-        "SELECT game_name FROM games WHERE game_name LIKE ? COLLATE NOCASE ORDER BY game_name ASC LIMIT 25",
-        (like,)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    return game_name_choices(current)
 
 
 @remove_hunter.autocomplete("hunter")
@@ -880,10 +897,9 @@ async def remove_hunter_user_autocomplete(interaction: discord.Interaction, curr
     selected_game = getattr(interaction.namespace, "game_name", None)
 
     if selected_game:
-        c.execute("SELECT id FROM games WHERE LOWER(game_name) = LOWER(?)", (selected_game,))
-        game = c.fetchone()
+        game = await db.fetchone("SELECT id FROM games WHERE LOWER(game_name) = LOWER(?)", (selected_game,))
         if game:
-            c.execute(
+            rows = await db.fetchall(
                 """SELECT user_id, user_name
                    FROM user_games
                    WHERE game_id = ?
@@ -892,13 +908,12 @@ async def remove_hunter_user_autocomplete(interaction: discord.Interaction, curr
                    LIMIT 25""",
                 (game[0], like, like)
             )
-            rows = c.fetchall()
             return [
                 app_commands.Choice(name=f"{row[1]} ({row[0]})"[:100], value=str(row[0]))
                 for row in rows
             ]
 
-    c.execute(
+    rows = await db.fetchall(
         """SELECT user_id, MIN(user_name)
            FROM user_games
            WHERE user_name LIKE ? COLLATE NOCASE OR user_id LIKE ?
@@ -909,7 +924,7 @@ async def remove_hunter_user_autocomplete(interaction: discord.Interaction, curr
     )
     return [
         app_commands.Choice(name=f"{row[1]} ({row[0]})"[:100], value=str(row[0]))
-        for row in c.fetchall()
+        for row in rows
     ]
 
 
@@ -919,16 +934,15 @@ async def remove_hunter_user_autocomplete(interaction: discord.Interaction, curr
 # Command: /newhunt
 @bot.tree.command(name="newhunt", description="Add a game to your solo backlog with the status 'not started.'")
 async def new_hunt(interaction: discord.Interaction, game_name: str):
-    # Check if the game already exists for the user
-    c.execute('SELECT COUNT(*) FROM solo_backlogs WHERE user_id = ? AND game_name = ?', (interaction.user.id, game_name))
-    if c.fetchone()[0] > 0:
+    # Add the game unless the user already has it; the (user_id, normalized_game_name)
+    # unique index catches case and punctuation variants too
+    cursor = await db.execute(
+        'INSERT OR IGNORE INTO solo_backlogs (user_id, user_name, game_name, normalized_game_name) VALUES (?, ?, ?, ?)',
+        (interaction.user.id, interaction.user.name, game_name, normalize_game_name(game_name)))
+    if cursor.rowcount == 0:
         await interaction.response.send_message(f"Game '{game_name}' is already in your solo backlog.")
         return
-
-    # Add the game if it doesn't exist
-    c.execute('INSERT INTO solo_backlogs (user_id, user_name, game_name) VALUES (?, ?, ?)',
-              (interaction.user.id, interaction.user.name, game_name))
-    conn.commit()
+    backlog_cache.invalidate(interaction.user.id)
     await interaction.response.send_message(f"Game '{game_name}' added to your solo backlog with status 'not started'.")
 
 
@@ -937,14 +951,13 @@ async def my_solo_hunts(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
 
     # Fetch active hunts
-    c.execute("""
+    rows = await db.fetchall("""
         SELECT game_name, status
         FROM solo_backlogs
         WHERE user_id = ?
           AND status IN ("in progress", "not started")
         ORDER BY game_name COLLATE NOCASE ASC
     """, (user_id,))
-    rows = c.fetchall()
 
     if not rows:
         await interaction.response.send_message("You don't have any solo hunts yet.")
@@ -993,13 +1006,13 @@ async def my_solo_hunts(interaction: discord.Interaction):
 @bot.tree.command(name="starthunt", description="Set a game's status to 'in progress.'")
 @app_commands.describe(game_name="Select a game from your 'not started' solo backlog")
 async def start_hunt(interaction: discord.Interaction, game_name: str):
-    c.execute('''
+    cursor = await db.execute('''
         UPDATE solo_backlogs 
         SET status = "in progress" 
         WHERE user_id = ? AND game_name = ? AND status = "not started"
     ''', (interaction.user.id, game_name))
-    conn.commit()
-    if c.rowcount:
+    backlog_cache.invalidate(interaction.user.id)
+    if cursor.rowcount:
         await interaction.response.send_message(f"Game '{game_name}' is now 'in progress'.")
     else:
         await interaction.response.send_message(f"Cannot start '{game_name}': either it doesn't exist or it's already started.")
@@ -1007,25 +1020,31 @@ async def start_hunt(interaction: discord.Interaction, game_name: str):
 
 @start_hunt.autocomplete('game_name')
 async def starthunt_autocomplete(interaction: discord.Interaction, current: str):
-    user_id = str(interaction.user.id)
-    like = f"%{current}%"
-    c.execute(
-        '''SELECT game_name FROM solo_backlogs
-           WHERE user_id = ? AND status = 'not started' AND game_name LIKE ? COLLATE NOCASE
-           ORDER BY game_name ASC LIMIT 25''',
-        (user_id, like)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    backlog = await backlog_cache.get(interaction.user.id)
+    return [app_commands.Choice(name=name, value=name) for name in backlog.search("not started", current)]
 
 
 # Command: /giveup - Remove a game from your solo backlog.
 @bot.tree.command(name="giveup", description="Remove a game from your solo backlog.")
 async def give_up(interaction: discord.Interaction, game_name: str):
-    c.execute('DELETE FROM solo_backlogs WHERE user_id = ? AND game_name = ?', (interaction.user.id, game_name))
-    conn.commit()
-    if c.rowcount:
-      # ✅ Only evaluate after a successful finish
-#        evaluate_and_unlock_marks(user_id)
+    user_id = str(interaction.user.id)
+
+    def give_up_game(conn: sqlite3.Connection) -> int:
+        unfinished = conn.execute(
+            "SELECT COUNT(*) FROM solo_backlogs WHERE user_id = ? AND game_name = ? AND status != 'completed'",
+            (user_id, game_name)).fetchone()[0]
+        cursor = conn.execute('DELETE FROM solo_backlogs WHERE user_id = ? AND game_name = ?', (user_id, game_name))
+        if cursor.rowcount:
+            # Giving up an unfinished game is what counts towards the Broken Oath mark
+            if unfinished:
+                record_abandoned_hunts(conn, user_id, unfinished)
+            # ✅ Only evaluate after a successful give-up
+            evaluate_and_unlock_marks(conn, user_id)
+        return cursor.rowcount
+
+    removed = await db.write(give_up_game)
+    backlog_cache.invalidate(interaction.user.id)
+    if removed:
         await interaction.response.send_message(f"Game '{game_name}' has been removed from your solo backlog.")
     else:
         await interaction.response.send_message(f"Cannot find the game '{game_name}' in your solo backlog.")
@@ -1034,28 +1053,28 @@ async def give_up(interaction: discord.Interaction, game_name: str):
 # Command: /finishhunt
 @bot.tree.command(name="finishhunt", description="Set a game's status to 'completed.'")
 async def finish_hunt(interaction: discord.Interaction, game_name: str):
-    # Update the game's status to 'completed' with the current date
-    c.execute('UPDATE solo_backlogs SET status = "completed", completion_date = DATE("now") WHERE user_id = ? AND game_name = ? AND status = "in progress"',
-              (interaction.user.id, game_name))
-    conn.commit()
-    if c.rowcount:
-      # ✅ Only evaluate after a successful finish
-#        evaluate_and_unlock_marks(user_id)
+    user_id = str(interaction.user.id)
+
+    def finish_game(conn: sqlite3.Connection) -> int:
+        # Update the game's status to 'completed' with the current date
+        cursor = conn.execute('UPDATE solo_backlogs SET status = "completed", completion_date = DATE("now") WHERE user_id = ? AND game_name = ? AND status = "in progress"',
+                              (user_id, game_name))
+        if cursor.rowcount:
+            # ✅ Only evaluate after a successful finish
+            evaluate_and_unlock_marks(conn, user_id)
+        return cursor.rowcount
+
+    finished = await db.write(finish_game)
+    backlog_cache.invalidate(interaction.user.id)
+    if finished:
         await interaction.response.send_message(f"Game '{game_name}' is now 'completed'.")
     else:
         await interaction.response.send_message(f"Cannot finish '{game_name}': either it doesn't exist or it's not in progress.")
 
 @finish_hunt.autocomplete('game_name')
 async def finishhunt_autocomplete(interaction: discord.Interaction, current: str):
-    user_id = str(interaction.user.id)
-    like = f"%{current}%"
-    c.execute(
-        '''SELECT game_name FROM solo_backlogs
-           WHERE user_id = ? AND status = 'in progress' AND game_name LIKE ? COLLATE NOCASE
-           ORDER BY game_name ASC LIMIT 25''',
-        (user_id, like)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    backlog = await backlog_cache.get(interaction.user.id)
+    return [app_commands.Choice(name=name, value=name) for name in backlog.search("in progress", current)]
 
 
 
@@ -1140,8 +1159,7 @@ async def my_finished_hunts(interaction: discord.Interaction, month: int = None,
 
     query += ' ORDER BY completion_date DESC, game_name COLLATE NOCASE ASC'
 
-    c.execute(query, tuple(params))
-    rows = c.fetchall()
+    rows = await db.fetchall(query, params)
 
     if not rows:
         await interaction.response.send_message("No completed games found for that period.", ephemeral=True)
@@ -1160,13 +1178,13 @@ async def my_finished_hunts(interaction: discord.Interaction, month: int = None,
 # Command: /givemeahunt
 @bot.tree.command(name="givemeahunt", description="Randomly select a hunt from your backlog and set it to 'in progress.'")
 async def give_me_a_hunt(interaction: discord.Interaction):
-    c.execute('SELECT game_name FROM solo_backlogs WHERE user_id = ? AND status = "not started"', (interaction.user.id,))
-    games = [game[0] for game in c.fetchall()]
+    rows = await db.fetchall('SELECT game_name FROM solo_backlogs WHERE user_id = ? AND status = "not started"', (interaction.user.id,))
+    games = [game[0] for game in rows]
     if games:
         selected_game = random.choice(games)
-        c.execute('UPDATE solo_backlogs SET status = "in progress" WHERE user_id = ? AND game_name = ?',
-                  (interaction.user.id, selected_game))
-        conn.commit()
+        await db.execute('UPDATE solo_backlogs SET status = "in progress" WHERE user_id = ? AND game_name = ?',
+                         (interaction.user.id, selected_game))
+        backlog_cache.invalidate(interaction.user.id)
         await interaction.response.send_message(f"Your next hunt: '{selected_game}' is now 'in progress'.")
     else:
         await interaction.response.send_message("No games available in your backlog to hunt.")
@@ -1174,10 +1192,10 @@ async def give_me_a_hunt(interaction: discord.Interaction):
 # Command: /ratehunt
 @bot.tree.command(name="ratehunt", description="Rate a completed game and leave optional comments.")
 async def rate_hunt(interaction: discord.Interaction, game_name: str, rating: int, comments: str = None):
-    c.execute('UPDATE solo_backlogs SET rating = ?, comments = ? WHERE user_id = ? AND game_name = ? AND status = "completed"',
-              (rating, comments, interaction.user.id, game_name))
-    conn.commit()
-    if c.rowcount:
+    cursor = await db.execute('UPDATE solo_backlogs SET rating = ?, comments = ? WHERE user_id = ? AND game_name = ? AND status = "completed"',
+                              (rating, comments, interaction.user.id, game_name))
+    backlog_cache.invalidate(interaction.user.id)
+    if cursor.rowcount:
         await interaction.response.send_message(f"Rating added for '{game_name}': {rating}/5. {comments if comments else ''}")
     else:
         await interaction.response.send_message(f"Cannot rate '{game_name}': either it doesn't exist or it hasn't been completed.")
@@ -1185,8 +1203,7 @@ async def rate_hunt(interaction: discord.Interaction, game_name: str, rating: in
 # Command: /huntfeedback
 @bot.tree.command(name="huntfeedback", description="View feedback and ratings left by others for a specific game.")
 async def hunt_feedback(interaction: discord.Interaction, game_name: str):
-    c.execute('SELECT user_name, rating, comments FROM solo_backlogs WHERE game_name = ? AND rating IS NOT NULL', (game_name,))
-    feedback = c.fetchall()
+    feedback = await db.fetchall('SELECT user_name, rating, comments FROM solo_backlogs WHERE game_name = ? AND rating IS NOT NULL', (game_name,))
     if feedback:
         response = "\n".join([f"{fb[0]}: {fb[1]}/5 - {fb[2]}" for fb in feedback])
         await interaction.response.send_message(f"Feedback for '{game_name}':\n{response}")
@@ -1388,8 +1405,8 @@ async def help_command(interaction: discord.Interaction):
 @bot.tree.command(name="whoadded", description="Check who added a specific game (Admin only).")
 @commands.has_permissions(administrator=True)
 async def who_added(interaction: discord.Interaction, game_name: str):
-    c.execute("SELECT user FROM logs WHERE command = 'trackhunt' AND game_name = ?", (game_name,))
-    users = c.fetchall()
+    await audit_log.flush()
+    users = await audit_log.db.fetchall("SELECT user FROM logs WHERE command = 'trackhunt' AND game_name = ?", (game_name,))
     if users:
         user_list = "\n".join([user[0] for user in users])
         await interaction.response.send_message(f"Users who added '{game_name}':\n{user_list}")
@@ -1408,8 +1425,7 @@ async def call_hunters(
     message: str | None = None
 ):
     # Case-insensitive game lookup
-    c.execute('SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)', (game_name,))
-    game = c.fetchone()
+    game = await db.fetchone('SELECT id, game_name FROM games WHERE LOWER(game_name) = LOWER(?)', (game_name,))
     if not game:
         await send_safely(interaction, f"Game '{game_name}' not found.", ephemeral=True)
         return
@@ -1417,8 +1433,7 @@ async def call_hunters(
     game_id, canonical_name = game
 
     # Fetch hunters
-    c.execute('SELECT user_id FROM user_games WHERE game_id = ?', (game_id,))
-    rows = c.fetchall()
+    rows = await db.fetchall('SELECT user_id FROM user_games WHERE game_id = ?', (game_id,))
     if not rows:
         await send_safely(interaction, f"No hunters are signed up for '{canonical_name}'.", ephemeral=True)
         return
@@ -1448,12 +1463,7 @@ async def call_hunters_autocomplete(
     interaction: discord.Interaction,
     current: str
 ) -> list[app_commands.Choice[str]]:
-    like = f"%{current}%"
-    c.execute(
-        "SELECT game_name FROM games WHERE game_name LIKE ? COLLATE NOCASE ORDER BY game_name ASC LIMIT 25",
-        (like,)
-    )
-    return [app_commands.Choice(name=row[0], value=row[0]) for row in c.fetchall()]
+    return game_name_choices(current)
 
 # Command: Show bot version and information
 @bot.tree.command(name="botversion", description="Show bot version and additional information")
@@ -1466,7 +1476,7 @@ async def bot_version(interaction: Interaction):
 async def healthcheck(interaction: Interaction):
     try:
         # Check database connection
-        c.execute("SELECT 1")
+        await db.fetchone("SELECT 1")
         db_status = "✅ A Hunters Ledger is running smoothly!"
     except Exception as e:
         db_status = f"❌ Error: {str(e)}"
@@ -1478,12 +1488,44 @@ async def healthcheck(interaction: Interaction):
     # Get registered commands
     command_count = len(bot.tree.get_commands())
 
+    # Banner renderer load
+    render = render_pool.metrics.snapshot()
+
+    # Event-loop lag and interactions Discord gave up on
+    loop = loop_monitor.snapshot()
+    total_lag = max(1, loop["samples"])
+    window = loop["window_seconds"]
+    window_label = f"{window / 60:.0f} min" if window >= 120 else f"{window:.0f} s"
+    histogram = " · ".join(f"{bucket} {count * 100 / total_lag:.0f}%" for bucket, count in loop["lag_buckets"].items())
+    last_stall = loop["last_stall"]
+    stall_note = (
+        f", last {last_stall.blocked_ms:.0f} ms in `{last_stall.handler}` "
+        f"<t:{int(last_stall.at)}:R>"
+        if last_stall else ""
+    )
+    metrics = bot.tree.metrics
+    last_miss = metrics.ack_misses[-1] if metrics.ack_misses else None
+    miss_note = (
+        f", last /{last_miss.name} "
+        + (f"after {last_miss.ack_ms / 1000:.1f}s" if last_miss.ack_ms is not None else "never answered")
+        + f" <t:{int(last_miss.at)}:R>"
+        if last_miss else ""
+    )
+
     # Construct the health report
     health_report = (
         "**A Hunters Ledger Health Check:**\n"
         f"- **Uptime:** {uptime}\n"
         f"- **Database:** {db_status}\n"
         f"- **Registered Commands:** {command_count}\n"
+        f"- **Card Renders:** {render['completed']} done, {render['queue_depth']} queued "
+        f"(p50 {render['render_p50_ms']:.0f} ms, p95 {render['render_p95_ms']:.0f} ms, "
+        f"{render['timed_out']} timed out, {render['rejected']} rejected)\n"
+        f"- **Event Loop Lag:** p50 {loop['lag_p50_ms']:.0f} ms, p95 {loop['lag_p95_ms']:.0f} ms, "
+        f"p99 {loop['lag_p99_ms']:.0f} ms, max {loop['lag_max_ms']:.0f} ms "
+        f"(last {window_label}: {histogram})\n"
+        f"- **Loop Stalls:** {loop['stalls']}{stall_note}\n"
+        f"- **Missed 3s Acks:** {metrics.ack_missed_total}{miss_note}\n"
     )
     
     await interaction.response.send_message(health_report)
@@ -1493,79 +1535,6 @@ async def healthcheck(interaction: Interaction):
 # ==== Imports ====
 
 
-# ==== Resource Paths ====
-RESOURCE_PATH = "resources/"
-DEFAULT_BACKGROUND = "background.jpg"
-FONT_PATH = os.path.join(RESOURCE_PATH, "MedievalSharp.ttf")
-
-# ==== Font Sizes ====
-GAME_NAME_FONT_SIZE = 72
-TEXT_FONT_SIZE = 48
-FOOTER_FONT_SIZE = 30
-
-# ==== Avatar Settings ====
-AVATAR_SIZE = (100, 100)
-AVATAR_POSITION = (100, 150)
-
-# ==== Game Cover Settings ====
-COVER_SIZE = (345, 518)
-COVER_POSITION = (850, 110)
-
-# ==== Utilities ====
-def get_scaled_font(text, base_size, max_width, font_path, draw_context):
-    """Returns a font that fits within max_width and the final font size."""
-    font_size = base_size
-    font = ImageFont.truetype(font_path, font_size)
-    while font_size > 40:
-        bbox = draw_context.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        if text_width <= max_width:
-            break
-        font_size -= 2
-        font = ImageFont.truetype(font_path, font_size)
-    return font, font_size
-
-
-def draw_text_with_outline(draw, position, text, font, fill="white", outline="black", outline_thickness=3):
-    """Draw text with an outline for visibility."""
-    x, y = position
-    for dx in range(-outline_thickness, outline_thickness + 1):
-        for dy in range(-outline_thickness, outline_thickness + 1):
-            if dx or dy:
-                draw.text((x + dx, y + dy), text, font=font, fill=outline)
-    draw.text(position, text, font=font, fill=fill)
-
-def fetch_steamgriddb_cover(game_name):
-    """Fetch a 600x900 game cover from SteamGridDB."""
-    headers = {"Authorization": f"Bearer {STEAMGRIDDB_API_KEY}"}
-    search_url = f"https://www.steamgriddb.com/api/v2/search/autocomplete/{game_name}"
-    response = requests.get(search_url, headers=headers)
-
-    if response.status_code != 200 or not response.json().get("data"):
-        print(f"Game '{game_name}' not found on SteamGridDB.")
-        return None
-
-    game_id = response.json()["data"][0]["id"]
-    image_url = f"https://www.steamgriddb.com/api/v2/grids/game/{game_id}?dimensions=600x900"
-    response = requests.get(image_url, headers=headers)
-
-    if response.status_code != 200 or not response.json().get("data"):
-        print(f"No 600x900 images found for '{game_name}'.")
-        return None
-
-    return response.json()["data"][0]["url"]
-
-def download_image(url, save_path):
-    """Download an image from a URL to a local file."""
-    if url:
-        response = requests.get(url, stream=True)
-        if response.status_code == 200:
-            with open(save_path, "wb") as file:
-                for chunk in response.iter_content(1024):
-                    file.write(chunk)
-            return save_path
-    return None
-
 # ==== Banner Generation ====
 
 
@@ -1573,75 +1542,21 @@ ALLOWED_GENRES = {"fps", "horror", "racing", "rpg", "strategy"}
 
 async def generate_completion_banner(game_name, user_name, completion_date, avatar_url, genre=None):
     try:
-        # Background image
-        background_file = f"background_{genre.lower()}.jpg" if genre else DEFAULT_BACKGROUND
-        background_path = os.path.join(RESOURCE_PATH, background_file)
-        if not os.path.exists(background_path):
-            background_path = os.path.join(RESOURCE_PATH, DEFAULT_BACKGROUND)
-
-        background = Image.open(background_path).convert('RGBA')
-
-        # Icons
-        xbox_logo = Image.open(os.path.join(RESOURCE_PATH, "xbox_logo.png")).convert('RGBA')
-        calendar_icon = Image.open(os.path.join(RESOURCE_PATH, "calendar_icon.png")).convert('RGBA')
-        for icon in [xbox_logo, calendar_icon]:
-            icon.thumbnail((50, 50))
-
-        # Avatar processing
-        response = requests.get(avatar_url, stream=True)
-        avatar = Image.open(response.raw).convert("RGBA").resize(AVATAR_SIZE, Image.LANCZOS)
-        mask = Image.new("L", AVATAR_SIZE, 0)
-        ImageDraw.Draw(mask).ellipse((0, 0, *AVATAR_SIZE), fill=255)
-
-        # Game cover
-        game_cover = None
-        cover_url = fetch_steamgriddb_cover(game_name)
-        if cover_url:
-            cover_path = download_image(cover_url, os.path.join(RESOURCE_PATH, f"{game_name}_cover.jpg"))
-            if cover_path:
-                game_cover = Image.open(cover_path).convert("RGBA").resize(COVER_SIZE, Image.LANCZOS)
-
-        # Load and resize comp_banner image
-        comp_banner = Image.open(os.path.join(RESOURCE_PATH, "completion_banner.png")).convert("RGBA")
-        comp_banner = comp_banner.resize((400, 70), Image.LANCZOS)
-
-        # Create drawing context
-        draw = ImageDraw.Draw(background)
-        text_font = ImageFont.truetype(FONT_PATH, TEXT_FONT_SIZE)
-        footer_font = ImageFont.truetype(FONT_PATH, FOOTER_FONT_SIZE)
-
-        # Get scaled game name font and its actual size
-        game_font, actual_font_size = get_scaled_font(game_name, GAME_NAME_FONT_SIZE, 550, FONT_PATH, draw)
-
-        # Define element positions
-        positions = {
-            "game_name": (215, 150 + actual_font_size // 2),  # Vertical adjustment for centering
-            "xbox_logo": (125, 280),
-            "user_name": (185, 275),
-            "calendar_icon": (125, 360),
-            "completion_date": (185, 355),
-            "comp_banner": (125, 425),
-        }
-
-        # Draw elements
-        draw_text_with_outline(draw, positions["game_name"], game_name, game_font)
-        background.paste(xbox_logo, positions["xbox_logo"], xbox_logo)
-        draw_text_with_outline(draw, positions["user_name"], user_name, text_font)
-        background.paste(calendar_icon, positions["calendar_icon"], calendar_icon)
-        draw_text_with_outline(draw, positions["completion_date"], completion_date, text_font)
-        background.paste(comp_banner, positions["comp_banner"], comp_banner)
-        background.paste(avatar, AVATAR_POSITION, mask)
-
-        # Paste game cover if available
-        if game_cover:
-            background.paste(game_cover, COVER_POSITION, game_cover)
-
-        output_path = os.path.join(RESOURCE_PATH, f'completion_{user_name}.png')
-        background.save(output_path)
-        return output_path
+        # Network first (async, pooled connections), then the Pillow work in a worker process
+        avatar_bytes, cover_bytes = await asyncio.gather(
+            avatar_cache.get(avatar_url),
+            cover_cache.get(game_name, STEAMGRIDDB_API_KEY),
+        )
+        if not avatar_bytes:
+            raise RuntimeError(f"could not download avatar {avatar_url}")
+
+        return await render_pool.run(
+            render_completion_banner,
+            game_name, user_name, completion_date, avatar_bytes, cover_bytes, genre,
+        )
 
     except Exception as e:
-        print(f"Error generating banner: {e}")
+        print(f"Error generating banner: {e!r}")
         return None
 
 # ==== Discord Slash Command ====
@@ -1653,7 +1568,8 @@ async def generate_completion_banner(game_name, user_name, completion_date, avat
 async def generate_card(interaction: discord.Interaction, game_name: str, genre: str = None):
     user_id = str(interaction.user.id)
     user_name = interaction.user.display_name
-    avatar_url = interaction.user.display_avatar.url
+    # The banner draws the avatar at 100x100; 128 is the smallest CDN size above that
+    avatar_url = interaction.user.display_avatar.with_size(128).url
 
     # Validate/normalise genre
     genre_clean = None
@@ -1669,17 +1585,15 @@ async def generate_card(interaction: discord.Interaction, game_name: str, genre:
 
     await interaction.response.defer()
 
-    # Case-insensitive lookup + ensure completed
-    c.execute("""
+    # Lookup on the normalised name key + ensure completed
+    row = await db.fetchone("""
         SELECT completion_date
         FROM solo_backlogs
         WHERE user_id = ?
-          AND LOWER(game_name) = LOWER(?)
+          AND normalized_game_name = ?
           AND status = 'completed'
         LIMIT 1
-    """, (user_id, game_name))
-
-    row = c.fetchone()
+    """, (user_id, normalize_game_name(game_name)))
     if not row:
         await interaction.followup.send(
             f"You have not completed '{game_name}', so a card cannot be generated.",
@@ -1704,7 +1618,7 @@ async def generate_card(interaction: discord.Interaction, game_name: str, genre:
         date_str = "Completed"
 
     # IMPORTANT: pass date_str (string), not the datetime object
-    banner_path = await generate_completion_banner(
+    banner = await generate_completion_banner(
         game_name=game_name,
         user_name=user_name,
         completion_date=date_str,
@@ -1712,15 +1626,11 @@ async def generate_card(interaction: discord.Interaction, game_name: str, genre:
         genre=genre_clean
     )
 
-    if banner_path:
+    if banner:
         await interaction.followup.send(
             f"Here is your completion card, {interaction.user.mention}! 🎉",
-            file=discord.File(banner_path)
+            file=discord.File(io.BytesIO(banner.data), filename=banner.filename("completion_card"))
         )
-        try:
-            os.remove(banner_path)
-        except OSError:
-            pass
     else:
         await interaction.followup.send(
             "Error generating the completion card. Please try again later.",
@@ -1731,18 +1641,8 @@ async def generate_card(interaction: discord.Interaction, game_name: str, genre:
 # ---- Autocomplete: completed games, most recent first ----
 @generate_card.autocomplete("game_name")
 async def generatecard_game_autocomplete(interaction: discord.Interaction, current: str):
-    user_id = str(interaction.user.id)
-    like = f"%{current}%"
-    c.execute('''
-        SELECT game_name
-        FROM solo_backlogs
-        WHERE user_id = ?
-          AND status = "completed"
-          AND game_name LIKE ? COLLATE NOCASE
-        ORDER BY completion_date IS NULL, completion_date DESC, game_name COLLATE NOCASE ASC
-        LIMIT 25
-    ''', (user_id, like))
-    return [app_commands.Choice(name=r[0], value=r[0]) for r in c.fetchall()]
+    backlog = await backlog_cache.get(interaction.user.id)
+    return [app_commands.Choice(name=name, value=name) for name in backlog.search_completed(current)]
 
 
 # ---- Autocomplete: genre "autoselect" ----
@@ -1757,46 +1657,48 @@ async def generatecard_genre_autocomplete(interaction: discord.Interaction, curr
 @bot.tree.command(name="mynext10", description="Create (if needed) and view your Next 10 hunts challenge list.")
 async def my_next10(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
-    ensure_challenge_stats_row(user_id)
+    await ensure_challenge_stats_row(user_id)
 
     # Does a list exist?
-    c.execute("SELECT 1 FROM next10_lists WHERE user_id = ?", (user_id,))
-    has_list = c.fetchone() is not None
+    has_list = await db.fetchone("SELECT 1 FROM next10_lists WHERE user_id = ?", (user_id,)) is not None
 
     if not has_list:
-        # Pull eligible games: not started or in progress
-        c.execute('''
-            SELECT game_name
-            FROM solo_backlogs
-            WHERE user_id = ? AND status IN ("not started", "in progress")
-        ''', (user_id,))
-        pool = [r[0] for r in c.fetchall()]
-        if len(pool) < 1:
+        def create_list(conn: sqlite3.Connection) -> bool:
+            # Pull eligible games: not started or in progress
+            pool = [r[0] for r in conn.execute('''
+                SELECT game_name
+                FROM solo_backlogs
+                WHERE user_id = ? AND status IN ("not started", "in progress")
+            ''', (user_id,))]
+            if len(pool) < 1:
+                return False
+
+            random.shuffle(pool)
+            picked = pool[:10]
+
+            conn.execute("INSERT INTO next10_lists (user_id) VALUES (?)", (user_id,))
+            for g in picked:
+                conn.execute(
+                    "INSERT OR IGNORE INTO next10_items (user_id, game_name) VALUES (?, ?)",
+                    (user_id, g)
+                )
+            return True
+
+        if not await db.write(create_list):
             await interaction.response.send_message(
                 "You don't have any solo hunts in **Not Started** or **In Progress** to build a Next 10 list.",
                 ephemeral=True
             )
             return
 
-        random.shuffle(pool)
-        picked = pool[:10]
-
-        c.execute("INSERT INTO next10_lists (user_id) VALUES (?)", (user_id,))
-        for g in picked:
-            c.execute(
-                "INSERT OR IGNORE INTO next10_items (user_id, game_name) VALUES (?, ?)",
-                (user_id, g)
-            )
-        conn.commit()
-
     # Load list
-    c.execute('''
+    rows = await db.fetchall('''
         SELECT game_name
         FROM next10_items
         WHERE user_id = ?
         ORDER BY id ASC
     ''', (user_id,))
-    items = [r[0] for r in c.fetchall()]
+    items = [r[0] for r in rows]
 
     if not items:
         # Safety: list exists but items missing
@@ -1807,20 +1709,21 @@ async def my_next10(interaction: discord.Interaction):
         return
 
     # Build display with strike-through if now completed
-    display_lines = [f"{i+1}. {strike_if_done(user_id, name)}" for i, name in enumerate(items)]
-    completed_now = sum(1 for name in items if is_completed_for_user(user_id, name))
+    backlog = await backlog_cache.get(user_id)
+    entries = challenge_entries(backlog, [(f"{i+1}.", name) for i, name in enumerate(items)])
+    display_lines, completed_now, _ = render_challenge_lines(entries, lambda label, text: f"{label} {text}")
 
     # If all complete -> stamp + prompt reset
     if completed_now == len(items):
-        c.execute('''
-            UPDATE challenge_stats
-            SET next10_completed_count = next10_completed_count + 1
-            WHERE user_id = ?
-        ''', (user_id,))
-        conn.commit()
+        def stamp(conn: sqlite3.Connection) -> int:
+            conn.execute('''
+                UPDATE challenge_stats
+                SET next10_completed_count = next10_completed_count + 1
+                WHERE user_id = ?
+            ''', (user_id,))
+            return conn.execute("SELECT next10_completed_count FROM challenge_stats WHERE user_id = ?", (user_id,)).fetchone()[0]
 
-        c.execute("SELECT next10_completed_count FROM challenge_stats WHERE user_id = ?", (user_id,))
-        count = c.fetchone()[0]
+        count = await db.write(stamp)
 
         msg = (
             f"🏁 **Next 10 complete!**\n"
@@ -1838,130 +1741,71 @@ async def my_next10(interaction: discord.Interaction):
 async def reset_next10(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
 
-    c.execute("DELETE FROM next10_items WHERE user_id = ?", (user_id,))
-    c.execute("DELETE FROM next10_lists WHERE user_id = ?", (user_id,))
-    conn.commit()
+    def reset(conn: sqlite3.Connection):
+        conn.execute("DELETE FROM next10_items WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM next10_lists WHERE user_id = ?", (user_id,))
+
+    await db.write(reset)
 
     await interaction.response.send_message(
         "✅ Your Next 10 list has been cleared. Run `/mynext10` to generate a new one.",
         ephemeral=True
     )
 
-import string
-
-def normalise_title_for_az(title: str) -> str:
-    """
-    Normalises a game title for A–Z challenges by removing common
-    leading articles like 'The ' and 'A '.
-    """
-    if not title:
-        return title
-
-    t = title.strip()
-
-    for prefix in ("the ", "a "):
-        if t.lower().startswith(prefix):
-            return t[len(prefix):].lstrip()
-
-    return t
-
-
-def pick_game_for_letter(user_id: str, letter: str) -> str | None:
-    letter = letter.upper()
-
-    # Only eligible games (not started / in progress)
-    c.execute('''
-        SELECT game_name
-        FROM solo_backlogs
-        WHERE user_id = ?
-          AND status IN ("not started", "in progress")
-    ''', (user_id,))
-
-    candidates = []
-    for (game_name,) in c.fetchall():
-        normalised = normalise_title_for_az(game_name)
-        if normalised and normalised[0].upper() == letter:
-            candidates.append(game_name)
-
-    if not candidates:
-        return None
-
-    return random.choice(candidates)
-
-
 @bot.tree.command(name="azhunts", description="Create (if needed) and view your A–Z hunts list.")
 async def az_hunts(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
-    ensure_challenge_stats_row(user_id)
+    await ensure_challenge_stats_row(user_id)
 
-    c.execute("SELECT 1 FROM az_lists WHERE user_id = ?", (user_id,))
-    has_list = c.fetchone() is not None
+    def build_or_fill(conn: sqlite3.Connection):
+        has_list = conn.execute("SELECT 1 FROM az_lists WHERE user_id = ?", (user_id,)).fetchone() is not None
 
-    if not has_list:
-        c.execute("INSERT INTO az_lists (user_id) VALUES (?)", (user_id,))
-        for letter in string.ascii_uppercase:
-            game = pick_game_for_letter(user_id, letter)
-            c.execute(
+        if not has_list:
+            conn.execute("INSERT INTO az_lists (user_id) VALUES (?)", (user_id,))
+            picks = pick_az_games(az_candidates(conn, user_id), LETTERS)
+            conn.executemany(
                 "INSERT OR REPLACE INTO az_items (user_id, letter, game_name) VALUES (?, ?, ?)",
-                (user_id, letter, game)  # game can be None => NA
+                [(user_id, letter, game) for letter, game in picks.items()]  # game can be None => NA
             )
-        conn.commit()
-    else:
-        # Try to populate any NAs
-        c.execute('''
-            SELECT letter
-            FROM az_items
-            WHERE user_id = ? AND (game_name IS NULL OR game_name = "")
-        ''', (user_id,))
-        na_letters = [r[0] for r in c.fetchall()]
-        changed = False
-        for letter in na_letters:
-            game = pick_game_for_letter(user_id, letter)
-            if game:
-                c.execute('''
+        else:
+            # Try to populate any NAs
+            na_letters = [r[0] for r in conn.execute('''
+                SELECT letter
+                FROM az_items
+                WHERE user_id = ? AND (game_name IS NULL OR game_name = "")
+            ''', (user_id,))]
+            if na_letters:
+                picks = pick_az_games(az_candidates(conn, user_id), na_letters)
+                conn.executemany('''
                     UPDATE az_items
                     SET game_name = ?
                     WHERE user_id = ? AND letter = ?
-                ''', (game, user_id, letter))
-                changed = True
-        if changed:
-            conn.commit()
+                ''', [(game, user_id, letter) for letter, game in picks.items() if game])
+
+    await db.write(build_or_fill)
 
     # Load list A–Z
-    c.execute('''
+    rows = await db.fetchall('''
         SELECT letter, game_name
         FROM az_items
         WHERE user_id = ?
         ORDER BY letter ASC
     ''', (user_id,))
-    rows = c.fetchall()
 
-    lines = []
-    playable_total = 0
-    playable_done = 0
-
-    for letter, game_name in rows:
-        if not game_name:
-            lines.append(f"**{letter}:** NA")
-            continue
-
-        playable_total += 1
-        if is_completed_for_user(user_id, game_name):
-            playable_done += 1
-            lines.append(f"**{letter}:** ~~{game_name}~~ ✅")
-        else:
-            lines.append(f"**{letter}:** {game_name}")
+    backlog = await backlog_cache.get(user_id)
+    entries = challenge_entries(backlog, [(letter, game_name) for letter, game_name in rows])
+    lines, playable_done, playable_total = render_challenge_lines(entries, lambda letter, text: f"**{letter}:** {text}")
 
     if playable_total > 0 and playable_done == playable_total:
-        c.execute('''
-            UPDATE challenge_stats
-            SET az_completed_count = az_completed_count + 1
-            WHERE user_id = ?
-        ''', (user_id,))
-        conn.commit()
+        def stamp(conn: sqlite3.Connection) -> int:
+            conn.execute('''
+                UPDATE challenge_stats
+                SET az_completed_count = az_completed_count + 1
+                WHERE user_id = ?
+            ''', (user_id,))
+            return conn.execute("SELECT az_completed_count FROM challenge_stats WHERE user_id = ?", (user_id,)).fetchone()[0]
 
-        c.execute("SELECT az_completed_count FROM challenge_stats WHERE user_id = ?", (user_id,))
-        count = c.fetchone()[0]
+        count = await db.write(stamp)
         await interaction.response.send_message(
             f"🏁 **A–Z complete!** You’ve finished your A–Z list **{count}** time(s).\n"
             f"Run `/resetaz` to generate a fresh A–Z list.",
@@ -1977,9 +1821,11 @@ async def az_hunts(interaction: discord.Interaction):
 async def reset_az(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
 
-    c.execute("DELETE FROM az_items WHERE user_id = ?", (user_id,))
-    c.execute("DELETE FROM az_lists WHERE user_id = ?", (user_id,))
-    conn.commit()
+    def reset(conn: sqlite3.Connection):
+        conn.execute("DELETE FROM az_items WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM az_lists WHERE user_id = ?", (user_id,))
+
+    await db.write(reset)
 
     await interaction.response.send_message(
         "✅ Your A–Z list has been cleared. Run `/azhunts` to generate a new one.",
@@ -1988,297 +1834,7 @@ async def reset_az(interaction: discord.Interaction):
 
 # Hunter's Marks
 
-def seed_hunting_marks():
-    marks = [
-        # key, slot_index, is_hidden
-        ("MARK_FIRST_BLOOD", 0, 0),
-        ("MARK_50",          1, 0),
-        ("MARK_100",         2, 0),
-        ("MARK_150",         3, 0),
-        ("MARK_FOCUSED_MONTH", 4, 0),
-        ("MARK_NEXT10",        5, 0),
-        ("MARK_AZ",            6, 0),
-        ("MARK_RELENTLESS",    7, 0),
-        ("MARK_LONG_HUNT",     8, 0),
-        ("MARK_HAVEN_TOUCHED", 9, 0),
-
-        # Hidden 11th
-        ("MARK_BROKEN_OATH", 10, 1),
-    ]
-    for key, slot, hidden in marks:
-        c.execute(
-            "INSERT OR IGNORE INTO hunting_marks (key, slot_index, is_hidden) VALUES (?, ?, ?)",
-            (key, slot, hidden)
-        )
-    conn.commit()
-
-seed_hunting_marks()
-
-from datetime import datetime, timedelta
-
-def get_total_completed_hunts(user_id: str) -> int:
-    c.execute("""
-        SELECT COUNT(*)
-        FROM solo_backlogs
-        WHERE user_id = ? AND status = 'completed'
-    """, (user_id,))
-    return int(c.fetchone()[0] or 0)
-
-def get_total_abandoned_hunts(user_id: str) -> int:
-    c.execute("""
-        SELECT COUNT(*)
-        FROM solo_backlogs
-        WHERE user_id = ? AND status = 'abandoned'
-    """, (user_id,))
-    return int(c.fetchone()[0] or 0)
-
-def get_completed_in_month(user_id: str, year: int, month: int) -> int:
-    c.execute("""
-        SELECT COUNT(*)
-        FROM solo_backlogs
-        WHERE user_id = ?
-          AND status = 'completed'
-          AND completion_date IS NOT NULL
-          AND strftime('%Y', completion_date) = ?
-          AND strftime('%m', completion_date) = ?
-    """, (user_id, str(year), f"{month:02d}"))
-    return int(c.fetchone()[0] or 0)
-
-def get_next10_completed_count(user_id: str) -> int:
-    # from challenge_stats you already added
-    c.execute("""
-        SELECT next10_completed_count
-        FROM challenge_stats
-        WHERE user_id = ?
-    """, (user_id,))
-    row = c.fetchone()
-    return int(row[0] or 0) if row else 0
-
-def get_az_completed_count(user_id: str) -> int:
-    c.execute("""
-        SELECT az_completed_count
-        FROM challenge_stats
-        WHERE user_id = ?
-    """, (user_id,))
-    row = c.fetchone()
-    return int(row[0] or 0) if row else 0
-
-def get_months_with_any_completion(user_id: str) -> int:
-    c.execute("""
-        SELECT COUNT(DISTINCT strftime('%Y-%m', completion_date))
-        FROM solo_backlogs
-        WHERE user_id = ?
-          AND status = 'completed'
-          AND completion_date IS NOT NULL
-    """, (user_id,))
-    return int(c.fetchone()[0] or 0)
-
-def get_longest_weekly_streak(user_id: str) -> int:
-    """
-    Simple streak measure: number of consecutive weeks with >=1 completion,
-    ending at the most recent completed week.
-
-    You can swap this later for daily streaks; this is more forgiving and realistic.
-    """
-    c.execute("""
-        SELECT completion_date
-        FROM solo_backlogs
-        WHERE user_id = ?
-          AND status = 'completed'
-          AND completion_date IS NOT NULL
-        ORDER BY completion_date ASC
-    """, (user_id,))
-    dates = [r[0] for r in c.fetchall()]
-    if not dates:
-        return 0
-
-    # map to ISO year-week
-    weeks = []
-    for d in dates:
-        try:
-            dt = datetime.strptime(d, "%Y-%m-%d")
-        except Exception:
-            continue
-        weeks.append(dt.isocalendar()[:2])  # (year, week)
-
-    weeks = sorted(set(weeks))
-    if not weeks:
-        return 0
-
-    # compute longest consecutive run overall
-    longest = 1
-    cur = 1
-
-    def week_index(yw):
-        y, w = yw
-        return y * 53 + w  # safe monotonic-ish index
-
-    for i in range(1, len(weeks)):
-        if week_index(weeks[i]) == week_index(weeks[i-1]) + 1:
-            cur += 1
-            longest = max(longest, cur)
-        else:
-            cur = 1
-    return longest
-
-def unlock_mark(user_id: str, key: str) -> bool:
-    c.execute("""
-        INSERT OR IGNORE INTO user_hunting_marks (user_id, key)
-        VALUES (?, ?)
-    """, (user_id, key))
-    conn.commit()
-    return c.rowcount > 0
-
-def evaluate_and_unlock_marks(user_id: str) -> list[str]:
-    """
-    Secret rules live here. This function can be called:
-    - after /finishhunt
-    - after /giveup
-    - whenever user runs /myhuntingmarks
-    so it supports retroactive unlocks naturally.
-    """
-    newly = []
-
-    total_completed = get_total_completed_hunts(user_id)
-    total_abandoned = get_total_abandoned_hunts(user_id)
-
-    now = datetime.utcnow()
-    # current month in UTC (fine for “calendar month” unless you want local time)
-    month_completed = get_completed_in_month(user_id, now.year, now.month)
-
-    next10_count = get_next10_completed_count(user_id)
-    az_count = get_az_completed_count(user_id)
-
-    months_with_completions = get_months_with_any_completion(user_id)
-    weekly_streak = get_longest_weekly_streak(user_id)
-
-    # --- Public marks ---
-    if total_completed >= 1:
-        if unlock_mark(user_id, "MARK_FIRST_BLOOD"):
-            newly.append("MARK_FIRST_BLOOD")
-
-    if total_completed >= 50:
-        if unlock_mark(user_id, "MARK_50"):
-            newly.append("MARK_50")
-
-    if total_completed >= 100:
-        if unlock_mark(user_id, "MARK_100"):
-            newly.append("MARK_100")
-
-    if total_completed >= 150:
-        if unlock_mark(user_id, "MARK_150"):
-            newly.append("MARK_150")
-
-    if month_completed >= 10:
-        if unlock_mark(user_id, "MARK_FOCUSED_MONTH"):
-            newly.append("MARK_FOCUSED_MONTH")
-
-    if next10_count >= 1:
-        if unlock_mark(user_id, "MARK_NEXT10"):
-            newly.append("MARK_NEXT10")
-
-    if az_count >= 1:
-        if unlock_mark(user_id, "MARK_AZ"):
-            newly.append("MARK_AZ")
-
-    # “Relentless” – stick with it over time (example: 6 distinct months)
-    if months_with_completions >= 6:
-        if unlock_mark(user_id, "MARK_RELENTLESS"):
-            newly.append("MARK_RELENTLESS")
-
-    # “Long Hunt” – example: 8-week streak
-    if weekly_streak >= 8:
-        if unlock_mark(user_id, "MARK_LONG_HUNT"):
-            newly.append("MARK_LONG_HUNT")
-
-    # “Haven Touched” – composite prestige (example)
-    # (This one is secret by design; users just see it appear eventually.)
-    if (
-        total_completed >= 100
-        and next10_count >= 1
-        and az_count >= 1
-        and months_with_completions >= 6
-    ):
-        if unlock_mark(user_id, "MARK_HAVEN_TOUCHED"):
-            newly.append("MARK_HAVEN_TOUCHED")
-
-    # --- Hidden mark (negative behaviour / spice) ---
-    # Example: abandon 20+ hunts
-    if total_abandoned >= 20:
-        if unlock_mark(user_id, "MARK_BROKEN_OATH"):
-            newly.append("MARK_BROKEN_OATH")
-
-    return newly
-
-MARK_SLOTS = {
-    0: (120, 140),
-    1: (320, 140),
-    2: (520, 140),
-    3: (720, 140),
-    4: (120, 340),
-    5: (320, 340),
-    6: (520, 340),
-    7: (720, 340),
-    8: (220, 540),
-    9: (620, 540),
-    10: (420, 540),  # hidden mark slot (example placement)
-}
-
-from PIL import Image, ImageDraw, ImageFont
-import os
-
-RES_MARKS_DIR = os.path.join("resources", "marks")
-
-def build_hunting_marks_board(unlocked_keys: list[str]) -> str:
-    board_path = os.path.join(RES_MARKS_DIR, "board.png")
-    if not os.path.exists(board_path):
-        raise FileNotFoundError("Missing resources/marks/board.png")
-
-    board = Image.open(board_path).convert("RGBA")
-    draw = ImageDraw.Draw(board)
-
-    # If nothing unlocked, add the single line of text
-    if not unlocked_keys:
-        msg = "Your marks are earned through dedication, not disclosure."
-        # Pick a font you already ship, or use a default
-        font_path = os.path.join("resources", "fonts", "Cinzel-Regular.ttf")
-        font = ImageFont.truetype(font_path, 34) if os.path.exists(font_path) else ImageFont.load_default()
-
-        # center it
-        w, h = board.size
-        tw, th = draw.textbbox((0, 0), msg, font=font)[2:]
-        x = (w - tw) // 2
-        y = h - 120
-        # subtle outline for readability
-        for ox, oy in [(-2,0),(2,0),(0,-2),(0,2)]:
-            draw.text((x+ox, y+oy), msg, font=font, fill="black")
-        draw.text((x, y), msg, font=font, fill="white")
-    else:
-        # Draw unlocked badges
-        # Load slot indexes for each key
-        c.execute("SELECT key, slot_index FROM hunting_marks")
-        slot_map = {k: i for (k, i) in c.fetchall()}
-
-        for key in unlocked_keys:
-            slot = slot_map.get(key)
-            if slot is None:
-                continue
-            pos = MARK_SLOTS.get(slot)
-            if not pos:
-                continue
-
-            badge_path = os.path.join(RES_MARKS_DIR, f"{key}.png")
-            if not os.path.exists(badge_path):
-                # If badge missing, just skip (so you can add art later)
-                continue
-
-            badge = Image.open(badge_path).convert("RGBA")
-            board.alpha_composite(badge, dest=pos)
-
-    out_path = os.path.join("temp", f"hunting_marks_{os.urandom(6).hex()}.png")
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    board.save(out_path, "PNG")
-    return out_path
+db.write_sync(seed_hunting_marks)
 
 #@bot.tree.command(name="myhuntingmarks", description="View your Marks of the Hunt.")
 #async def my_hunting_marks(interaction: discord.Interaction):
@@ -2287,30 +1843,25 @@ def build_hunting_marks_board(unlocked_keys: list[str]) -> str:
 #    await interaction.response.defer(ephemeral=True)
 #
 #    # retroactive + current evaluation
-#    evaluate_and_unlock_marks(user_id)
+#    await db.write(evaluate_and_unlock_marks, user_id)
 #
-#    c.execute("""
+#    rows = await db.fetchall("""
 #        SELECT key
 #        FROM user_hunting_marks
 #        WHERE user_id = ?
 #    """, (user_id,))
-#    unlocked = [r[0] for r in c.fetchall()]
+#    unlocked = [r[0] for r in rows]
 #
 #    try:
-#        img_path = build_hunting_marks_board(unlocked)
+#        board = await marks_boards.get(unlocked, lambda: db.read(load_slot_map), render_pool.run)
 #    except Exception as e:
 #        await interaction.followup.send(f"Error generating marks board: {e}", ephemeral=True)
 #        return
 #
 #    await interaction.followup.send(
-#        file=discord.File(img_path),
+#        file=discord.File(io.BytesIO(board.data), filename=board.filename("hunting_marks")),
 #        ephemeral=True
 #    )
-#
-#    try:
-#        os.remove(img_path)
-#    except OSError:
-#        pass
 
 #Database backup
 TIDE44_ID = 420996360699904000
@@ -2321,21 +1872,18 @@ def is_tide44(interaction: discord.Interaction) -> bool:
 import sqlite3
 import os
 from datetime import datetime
-DB_PATH = "hunters_ledger.db"
 
-def backup_database(db_path: str, backup_dir: str = "backups") -> str:
+def backup_database(conn: sqlite3.Connection, backup_dir: str = "backups") -> str:
     os.makedirs(backup_dir, exist_ok=True)
     stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     backup_path = os.path.join(backup_dir, f"hunters_ledger_backup_{stamp}.sqlite")
 
-    # Use SQLite backup API (safe even if the bot is running)
-    src = sqlite3.connect(db_path)
+    # Use SQLite backup API from a pooled reader (safe even if the bot is running)
     dst = sqlite3.connect(backup_path)
     try:
-        src.backup(dst)
+        conn.backup(dst)
     finally:
         dst.close()
-        src.close()
 
     return backup_path
 
@@ -2348,11 +1896,11 @@ async def backupdb(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
     try:
-        path = backup_database(DB_PATH, backup_dir="backups")
+        path = await db.read(backup_database, "backups")
 
         # If you added the new log columns, this will record DM/GUILD too
         try:
-            log_command(interaction, "backupdb", extra=f"OK {path}")
+            await log_command(interaction, "backupdb", extra=f"OK {path}")
         except Exception:
             # Don't fail backup if logging fails
             pass
@@ -2361,149 +1909,240 @@ async def backupdb(interaction: discord.Interaction):
 
     except Exception as e:
         try:
-            log_command(interaction, "backupdb", extra=f"FAILED {e}")
+            await log_command(interaction, "backupdb", extra=f"FAILED {e}")
         except Exception:
             pass
         await interaction.followup.send(f"❌ Backup failed: {e}", ephemeral=True)
 
-# synclists
-@bot.tree.command(
-    name="synclists",
-    description="Sync your Next10 and A–Z lists with your current solo backlog (removes games you've given up)."
-)
-async def synclists(interaction: discord.Interaction):
-    user_id = str(interaction.user.id)
+@bot.tree.command(name="backfillmarks", description="Owner-only: Re-evaluate Marks of the Hunt for every user.")
+@app_commands.describe(rebuild_stats="Recompute everyone's hunt stats from their backlogs first")
+async def backfillmarks(interaction: discord.Interaction, rebuild_stats: bool = False):
+    if not is_tide44(interaction):
+        await interaction.response.send_message("❌ This command is owner-only.", ephemeral=True)
+        return
 
     await interaction.response.defer(ephemeral=True)
 
-    # -------- Next10: remove entries that no longer exist in solo_backlogs --------
-    c.execute("""
-        SELECT game_name
-        FROM next10_items
-        WHERE user_id = ?
-    """, (user_id,))
-    next10_games = [r[0] for r in c.fetchall()]
+    # Progress arrives on the writer thread; the loop shows the latest figures
+    # in the deferred response, at most every couple of seconds
+    loop = asyncio.get_running_loop()
+    latest: dict[str, tuple[int, int, float]] = {}
 
-    removed_next10 = []
-    for g in next10_games:
-        c.execute("""
-            SELECT 1
-            FROM solo_backlogs
-            WHERE user_id = ?
-              AND LOWER(game_name) = LOWER(?)
-            LIMIT 1
-        """, (user_id, g))
+    def show(done: int, total: int, elapsed: float) -> None:
+        loop.call_soon_threadsafe(latest.__setitem__, "progress", (done, total, elapsed))
 
-        if c.fetchone() is None:
-            c.execute("""
-                DELETE FROM next10_items
-                WHERE user_id = ?
-                  AND LOWER(game_name) = LOWER(?)
-            """, (user_id, g))
-            if c.rowcount:
-                removed_next10.append(g)
+    async def report_progress():
+        shown = None
+        while True:
+            await asyncio.sleep(2)
+            progress = latest.get("progress")
+            if progress is None or progress == shown:
+                continue
+            shown = progress
+            done, total, elapsed = progress
+            try:
+                await interaction.edit_original_response(
+                    content=f"⏳ Backfilling marks: {done:,}/{total:,} users in {elapsed:.1f}s"
+                )
+            except discord.HTTPException:
+                pass
 
-    # -------- A-Z: null out letters whose game no longer exists --------
-    c.execute("""
-        SELECT letter, game_name
-        FROM az_items
-        WHERE user_id = ?
-        ORDER BY letter ASC
-    """, (user_id,))
-    az_rows = c.fetchall()
+    def backfill(conn: sqlite3.Connection):
+        return backfill_marks(conn, rebuild_stats=rebuild_stats, progress=show)
+
+    progress_task = asyncio.create_task(report_progress())
+    try:
+        report = await db.write(backfill)
+    except Exception as e:
+        try:
+            await log_command(interaction, "backfillmarks", extra=f"FAILED {e}")
+        except Exception:
+            pass
+        await interaction.followup.send(f"❌ Backfill failed: {e}", ephemeral=True)
+        return
+    finally:
+        progress_task.cancel()
 
-    cleared_az = []
-    filled_az = []
+    try:
+        await log_command(interaction, "backfillmarks", extra=f"OK {report.users} users, {report.unlocked} unlocks")
+    except Exception:
+        pass
+    await interaction.followup.send(f"✅ Backfill complete.\n```\n{format_report(report)}\n```", ephemeral=True)
 
-    for letter, game_name in az_rows:
-        if not game_name:
-            continue
+@bot.tree.command(name="commandstats", description="Owner-only: Slowest commands, database load and background queues.")
+async def commandstats(interaction: discord.Interaction):
+    if not is_tide44(interaction):
+        await interaction.response.send_message("❌ This command is owner-only.", ephemeral=True)
+        return
 
-        c.execute("""
-            SELECT 1
-            FROM solo_backlogs
-            WHERE user_id = ?
-              AND LOWER(game_name) = LOWER(?)
-            LIMIT 1
-        """, (user_id, game_name))
+    metrics = bot.tree.metrics
+    audit = audit_log.stats()
+    render = render_pool.metrics.snapshot()
+    report = (
+        "**Commands** (ms, slowest p95 first; db/call = database calls per invocation)\n"
+        f"```\n{format_command_stats(metrics, limit=10, kind='command')}\n```\n"
+        "**Autocomplete**\n"
+        f"```\n{format_command_stats(metrics, limit=5, kind='autocomplete')}\n```\n"
+        f"- **Audit log:** {audit['queued']} queued, {audit['written']} written, {audit['dropped']} dropped\n"
+        f"- **Card renders:** {render['completed']} done, {render['queue_depth']} queued, "
+        f"p95 {render['render_p95_ms']:.0f} ms\n"
+    )
+    if trace_recorder is not None:
+        trace = trace_recorder.stats()
+        report += f"- **Interaction trace:** {trace['written']} written, {trace['buffered']} buffered, {trace['dropped']} dropped\n"
 
-        if c.fetchone() is None:
-            c.execute("""
-                UPDATE az_items
-                SET game_name = NULL
-                WHERE user_id = ? AND letter = ?
-            """, (user_id, letter))
-            cleared_az.append(f"{letter} ({game_name})")
+    await interaction.response.send_message(report[:2000], ephemeral=True)
 
-    # -------- Repopulate NA letters --------
-    c.execute("""
-        SELECT letter
-        FROM az_items
-        WHERE user_id = ?
-          AND (game_name IS NULL OR game_name = "")
-        ORDER BY letter ASC
-    """, (user_id,))
-    na_letters = [r[0] for r in c.fetchall()]
+@bot.tree.command(name="slowqueries", description="Owner-only: The SQL statements costing the most time, with query plans.")
+@app_commands.describe(
+    sort_by="Rank by total time (default), worst single run, run count or VM steps",
+    limit="How many statements to list (default 10)",
+    reset="Clear the collected statistics afterwards",
+)
+@app_commands.choices(sort_by=[
+    app_commands.Choice(name="total time", value="total"),
+    app_commands.Choice(name="max time", value="max"),
+    app_commands.Choice(name="run count", value="count"),
+    app_commands.Choice(name="vm steps", value="steps"),
+])
+async def slowqueries(
+    interaction: discord.Interaction,
+    sort_by: app_commands.Choice[str] | None = None,
+    limit: app_commands.Range[int, 1, 50] = 10,
+    reset: bool = False,
+):
+    if not is_tide44(interaction):
+        await interaction.response.send_message("❌ This command is owner-only.", ephemeral=True)
+        return
+    if not SQL_PROFILE:
+        await interaction.response.send_message(
+            "SQL profiling is off. Restart the bot with `SQL_PROFILE=1` to collect statistics.",
+            ephemeral=True,
+        )
+        return
 
-    for letter in na_letters:
-        game = pick_game_for_letter(user_id, letter)
-        if game:
-            c.execute("""
-                UPDATE az_items
-                SET game_name = ?
-                WHERE user_id = ? AND letter = ?
-            """, (game, user_id, letter))
-            filled_az.append(f"{letter} → {game}")
+    by = sort_by.value if sort_by else "total"
+    entries = query_profiler.top(limit, by=by)
+    summary = format_query_report(entries[:5], plans=False, width=200)
+    report = (
+        f"SQL profile since {datetime.fromtimestamp(query_profiler.since, timezone.utc):%Y-%m-%d %H:%M} UTC, "
+        f"top {len(entries)} by {by}; plans captured for statements >= {SLOW_QUERY_MS:g} ms\n\n"
+        + format_query_report(entries)
+    )
+    if reset:
+        query_profiler.reset()
 
-    # -------- Refill Next10 up to 10 --------
-    c.execute("""
-        SELECT game_name
-        FROM next10_items
-        WHERE user_id = ?
-    """, (user_id,))
-    current_next10 = [r[0] for r in c.fetchall()]
+    await interaction.response.send_message(
+        f"```\n{summary[:1800]}\n```",
+        file=discord.File(io.BytesIO(report.encode("utf-8")), filename="slow_queries.txt"),
+        ephemeral=True,
+    )
 
-    slots_needed = 10 - len(current_next10)
-    added_next10 = []
+# synclists
+@bot.tree.command(
+    name="synclists",
+    description="Sync your Next10 and A–Z lists with your current solo backlog (removes games you've given up)."
+)
+async def synclists(interaction: discord.Interaction):
+    user_id = str(interaction.user.id)
 
-    if slots_needed > 0:
-        current_lower = [g.lower() for g in current_next10]
+    await interaction.response.defer(ephemeral=True)
 
-        if current_lower:
-            placeholders = ",".join("?" for _ in current_lower)
-            query = f"""
-                SELECT game_name
-                FROM solo_backlogs
-                WHERE user_id = ?
-                  AND status != 'completed'
-                  AND LOWER(game_name) NOT IN ({placeholders})
-                ORDER BY RANDOM()
-                LIMIT ?
-            """
-            params = [user_id] + current_lower + [slots_needed]
-        else:
-            query = """
-                SELECT game_name
-                FROM solo_backlogs
-                WHERE user_id = ?
-                  AND status != 'completed'
+    # Entries match the backlog on its (user_id, normalized_game_name) key, the
+    # same way /syncgoal does, so "Spider-Man" in a list keeps "spider man" in
+    # the backlog. The key is computed in Python, so each list's entries go in
+    # as a VALUES table and are anti-joined against the key index in one
+    # statement; round-trips don't grow with the backlog or list sizes.
+    def gone_from_backlog(conn: sqlite3.Connection, entries: list[tuple]) -> set:
+        """Refs of the (ref, game_name) entries whose game is no longer in the backlog."""
+        if not entries:
+            return set()
+        return {r[0] for r in conn.execute(f"""
+            WITH entries(ref, key) AS (VALUES {", ".join(["(?, ?)"] * len(entries))})
+            SELECT e.ref
+            FROM entries e
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM solo_backlogs b
+                WHERE b.user_id = ?
+                  AND b.normalized_game_name = e.key
+            )
+        """, (*(value for ref, name in entries for value in (ref, normalize_game_name(name))), user_id))}
+
+    def sync(conn: sqlite3.Connection):
+        # -------- Next10: remove entries that no longer exist in solo_backlogs --------
+        next10 = conn.execute(
+            "SELECT id, game_name FROM next10_items WHERE user_id = ? ORDER BY id ASC", (user_id,)
+        ).fetchall()
+        gone = gone_from_backlog(conn, next10)
+        removed_next10 = [game_name for row_id, game_name in next10 if row_id in gone]
+        if gone:
+            conn.executemany("DELETE FROM next10_items WHERE id = ?", [(row_id,) for row_id in gone])
+        listed = [game_name for row_id, game_name in next10 if row_id not in gone]
+
+        # -------- A-Z: null out letters whose game no longer exists --------
+        az = conn.execute("""
+            SELECT letter, game_name
+            FROM az_items
+            WHERE user_id = ?
+              AND game_name IS NOT NULL AND game_name != ''
+            ORDER BY letter ASC
+        """, (user_id,)).fetchall()
+        gone = gone_from_backlog(conn, az)
+        cleared_az = [f"{letter} ({game_name})" for letter, game_name in az if letter in gone]
+        if gone:
+            conn.executemany(
+                "UPDATE az_items SET game_name = NULL WHERE user_id = ? AND letter = ?",
+                [(user_id, letter) for letter in gone],
+            )
+
+        # -------- Repopulate NA letters --------
+        na_letters = [r[0] for r in conn.execute("""
+            SELECT letter
+            FROM az_items
+            WHERE user_id = ?
+              AND (game_name IS NULL OR game_name = "")
+            ORDER BY letter ASC
+        """, (user_id,))]
+
+        filled_az = []
+        if na_letters:
+            picks = pick_az_games(az_candidates(conn, user_id), na_letters)
+            refills = [(game, user_id, letter) for letter, game in picks.items() if game]
+            conn.executemany("""
+                UPDATE az_items
+                SET game_name = ?
+                WHERE user_id = ? AND letter = ?
+            """, refills)
+            filled_az.extend(f"{letter} → {game}" for game, _, letter in refills)
+
+        # -------- Refill Next10 up to 10 --------
+        slots_needed = 10 - len(listed)
+        added_next10 = []
+
+        if slots_needed > 0:
+            # VALUES needs at least one row; a NULL key matches nothing.
+            keys = sorted({normalize_game_name(name) for name in listed}) or [None]
+            added_next10 = [r[0] for r in conn.execute(f"""
+                WITH listed(key) AS (VALUES {", ".join(["(?)"] * len(keys))})
+                SELECT b.game_name
+                FROM solo_backlogs b
+                WHERE b.user_id = ?
+                  AND b.status != 'completed'
+                  AND NOT EXISTS (SELECT 1 FROM listed l WHERE l.key = b.normalized_game_name)
                 ORDER BY RANDOM()
                 LIMIT ?
-            """
-            params = [user_id, slots_needed]
+            """, (*keys, user_id, slots_needed))]
 
-        c.execute(query, params)
-        new_games = [r[0] for r in c.fetchall()]
-
-        for g in new_games:
-            c.execute("""
+            conn.executemany("""
                 INSERT INTO next10_items (user_id, game_name)
                 VALUES (?, ?)
-            """, (user_id, g))
-            added_next10.append(g)
+            """, [(user_id, g) for g in added_next10])
+
+        return removed_next10, added_next10, cleared_az, filled_az, na_letters
 
-    # Commit EVERYTHING (even if no refill happened)
-    conn.commit()
+    # Everything is applied in one transaction (even if no refill happened)
+    removed_next10, added_next10, cleared_az, filled_az, na_letters = await db.write(sync)
 
     # -------- Response --------
     parts = ["🧹 **Sync complete**"]
@@ -2530,5 +2169,7 @@ async def synclists(interaction: discord.Interaction):
     await interaction.followup.send("\n".join(parts), ephemeral=True)
 
 
-# Run the bot
-bot.run(TOKEN)
+# Run the bot (importing main, e.g. from benchmarks/, only builds it)
+if __name__ == "__main__":
+    bot.run(TOKEN)
+    close_databases()
@@ -0,0 +1,147 @@
+"""Marks of the Hunt: the catalogue, the unlock rules and the evaluator.
+
+The rules only look at a user's rolled-up statistics (see ``hunt_stats``)
+and challenge counters, so evaluating one user is one read, one lookup of
+what they already hold and at most one ``executemany`` — all inside the
+caller's write transaction. That is cheap enough to run inline after every
+/finishhunt and /giveup, and it supports retroactive unlocks naturally.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from typing import NamedTuple
+
+
+# key, slot_index, is_hidden
+MARKS = [
+    ("MARK_FIRST_BLOOD", 0, 0),
+    ("MARK_50",          1, 0),
+    ("MARK_100",         2, 0),
+    ("MARK_150",         3, 0),
+    ("MARK_FOCUSED_MONTH", 4, 0),
+    ("MARK_NEXT10",        5, 0),
+    ("MARK_AZ",            6, 0),
+    ("MARK_RELENTLESS",    7, 0),
+    ("MARK_LONG_HUNT",     8, 0),
+    ("MARK_HAVEN_TOUCHED", 9, 0),
+
+    # Hidden 11th
+    ("MARK_BROKEN_OATH", 10, 1),
+]
+
+
+class MarkStats(NamedTuple):
+    total_completed: int = 0
+    total_abandoned: int = 0
+    month_completed: int = 0
+    months_with_completions: int = 0
+    weekly_streak: int = 0
+    next10_count: int = 0
+    az_count: int = 0
+
+
+def seed_hunting_marks(conn: sqlite3.Connection):
+    conn.executemany(
+        "INSERT OR IGNORE INTO hunting_marks (key, slot_index, is_hidden) VALUES (?, ?, ?)",
+        MARKS,
+    )
+
+
+def current_month() -> str:
+    # current month in UTC (fine for “calendar month” unless you want local time)
+    return datetime.utcnow().strftime("%Y-%m")
+
+
+# user_id followed by the MarkStats fields, for each user produced by {users}
+# (which may take parameters before the month).
+MARK_STATS_SQL = """
+    SELECT
+        u.user_id,
+        COALESCE(s.completed_count, 0),
+        COALESCE(s.abandoned_count, 0),
+        COALESCE(m.completed, 0),
+        COALESCE(s.active_months, 0),
+        COALESCE(s.longest_weekly_streak, 0),
+        COALESCE(c.next10_completed_count, 0),
+        COALESCE(c.az_completed_count, 0)
+    FROM {users} AS u
+    LEFT JOIN user_hunt_stats AS s ON s.user_id = u.user_id
+    LEFT JOIN user_completion_months AS m ON m.user_id = u.user_id AND m.month = ?
+    LEFT JOIN challenge_stats AS c ON c.user_id = u.user_id
+"""
+
+
+def read_mark_stats(conn: sqlite3.Connection, user_id: str, month: str) -> MarkStats:
+    row = conn.execute(
+        MARK_STATS_SQL.format(users="(SELECT CAST(? AS TEXT) AS user_id)"), (user_id, month)
+    ).fetchone()
+    return MarkStats(*row[1:])
+
+
+def earned_marks(stats: MarkStats) -> list[str]:
+    """Every mark the stats qualify for, in catalogue order. Secret rules live here."""
+    earned = []
+
+    # --- Public marks ---
+    if stats.total_completed >= 1:
+        earned.append("MARK_FIRST_BLOOD")
+    if stats.total_completed >= 50:
+        earned.append("MARK_50")
+    if stats.total_completed >= 100:
+        earned.append("MARK_100")
+    if stats.total_completed >= 150:
+        earned.append("MARK_150")
+    if stats.month_completed >= 10:
+        earned.append("MARK_FOCUSED_MONTH")
+    if stats.next10_count >= 1:
+        earned.append("MARK_NEXT10")
+    if stats.az_count >= 1:
+        earned.append("MARK_AZ")
+
+    # “Relentless” – stick with it over time (example: 6 distinct months)
+    if stats.months_with_completions >= 6:
+        earned.append("MARK_RELENTLESS")
+
+    # “Long Hunt” – example: 8-week streak
+    if stats.weekly_streak >= 8:
+        earned.append("MARK_LONG_HUNT")
+
+    # “Haven Touched” – composite prestige (example)
+    # (This one is secret by design; users just see it appear eventually.)
+    if (
+        stats.total_completed >= 100
+        and stats.next10_count >= 1
+        and stats.az_count >= 1
+        and stats.months_with_completions >= 6
+    ):
+        earned.append("MARK_HAVEN_TOUCHED")
+
+    # --- Hidden mark (negative behaviour / spice) ---
+    # Example: abandon 20+ hunts
+    if stats.total_abandoned >= 20:
+        earned.append("MARK_BROKEN_OATH")
+
+    return earned
+
+
+def evaluate_and_unlock_marks(conn: sqlite3.Connection, user_id: str) -> list[str]:
+    """Unlock every mark ``user_id`` now qualifies for; returns the newly unlocked keys.
+
+    Run it as one unit of work: ``await db.write(evaluate_and_unlock_marks, user_id)``,
+    or from inside another write that changed the user's backlog.
+    """
+    user_id = str(user_id)
+    earned = earned_marks(read_mark_stats(conn, user_id, current_month()))
+    if not earned:
+        return []
+
+    held = {key for (key,) in conn.execute("SELECT key FROM user_hunting_marks WHERE user_id = ?", (user_id,))}
+    newly = [key for key in earned if key not in held]
+    if newly:
+        conn.executemany(
+            "INSERT OR IGNORE INTO user_hunting_marks (user_id, key) VALUES (?, ?)",
+            [(user_id, key) for key in newly],
+        )
+    return newly
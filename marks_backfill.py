@@ -0,0 +1,125 @@
+"""Re-evaluate Marks of the Hunt for every user at once.
+
+Marks unlock retroactively, but ``evaluate_and_unlock_marks`` works one user
+at a time. After a rule change (or to seed marks for an existing community)
+``backfill_marks`` does the whole thing in one write transaction:
+
+1. optionally rebuilds the ``hunt_stats`` rollup from ``solo_backlogs``
+   (grouped aggregates and a window-function pass for the streaks);
+2. reads every user's statistics with one joined query, streamed in chunks;
+3. applies the same ``earned_marks`` rules in memory;
+4. inserts the missing unlocks with ``executemany``.
+
+Progress and throughput go to an optional callback. It is exposed as the
+owner-only /backfillmarks command and can run offline against a database
+file:
+
+    python marks_backfill.py [--db hunters_ledger.db] [--rebuild-stats]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import time
+from collections import Counter
+from typing import Callable, NamedTuple
+
+from hunt_stats import rebuild_hunt_stats
+from marks import MARK_STATS_SQL, MarkStats, current_month, earned_marks
+
+
+CHUNK_SIZE = 5000
+
+# progress(users_done, users_total, seconds_elapsed)
+Progress = Callable[[int, int, float], None]
+
+ALL_USERS = "(SELECT user_id FROM user_hunt_stats UNION SELECT user_id FROM challenge_stats)"
+
+
+class BackfillReport(NamedTuple):
+    users: int
+    unlocked: int
+    by_mark: dict[str, int]
+    seconds: float
+
+    @property
+    def users_per_second(self) -> float:
+        return self.users / self.seconds if self.seconds else float(self.users)
+
+
+def backfill_marks(
+    conn: sqlite3.Connection,
+    *,
+    rebuild_stats: bool = False,
+    month: str | None = None,
+    progress: Progress | None = None,
+) -> BackfillReport:
+    """Unlock every mark every user qualifies for; run as one write unit of work."""
+    started = time.perf_counter()
+    month = month or current_month()
+
+    if rebuild_stats:
+        rebuild_hunt_stats(conn)
+
+    total = int(conn.execute(f"SELECT COUNT(*) FROM {ALL_USERS}").fetchone()[0])
+    held = set(conn.execute("SELECT user_id, key FROM user_hunting_marks"))
+
+    by_mark: Counter[str] = Counter()
+    done = 0
+    cursor = conn.execute(MARK_STATS_SQL.format(users=ALL_USERS), (month,))
+    while True:
+        rows = cursor.fetchmany(CHUNK_SIZE)
+        if not rows:
+            break
+        inserts = []
+        for row in rows:
+            user_id = row[0]
+            for key in earned_marks(MarkStats(*row[1:])):
+                if (user_id, key) not in held:
+                    inserts.append((user_id, key))
+                    by_mark[key] += 1
+        if inserts:
+            # A second cursor: the read above is still being stepped.
+            conn.executemany("INSERT OR IGNORE INTO user_hunting_marks (user_id, key) VALUES (?, ?)", inserts)
+        done += len(rows)
+        if progress:
+            progress(done, total, time.perf_counter() - started)
+
+    return BackfillReport(done, sum(by_mark.values()), dict(by_mark), time.perf_counter() - started)
+
+
+def format_report(report: BackfillReport) -> str:
+    lines = [
+        f"Evaluated {report.users:,} users in {report.seconds:.2f}s "
+        f"({report.users_per_second:,.0f} users/s); {report.unlocked:,} new unlocks."
+    ]
+    for key, count in sorted(report.by_mark.items()):
+        lines.append(f"  {key}: {count:,}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    from database import DB_PATH
+    from migrations import apply_migrations
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--rebuild-stats", action="store_true", help="recompute the hunt_stats rollup first")
+    args = parser.parse_args()
+
+    def show(done: int, total: int, elapsed: float) -> None:
+        print(f"{done:,}/{total:,} users ({done / elapsed if elapsed else 0:,.0f}/s)")
+
+    conn = sqlite3.connect(args.db)
+    try:
+        apply_migrations(conn)
+        report = backfill_marks(conn, rebuild_stats=args.rebuild_stats, progress=show)
+        conn.commit()
+    finally:
+        conn.close()
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
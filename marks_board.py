@@ -0,0 +1,163 @@
+"""Marks of the Hunt board rendering.
+
+A board is fully determined by which slots are unlocked, and with eleven
+slots there are only 2^11 possible boards. ``MarksBoardCache`` therefore
+memoises the encoded board by unlocked-slot bitmask in a bounded LRU, so a
+repeat view does no image work at all. Badge and board art come decoded from
+the asset registry, and the art files' signatures are part of the cache key,
+so replacing a PNG in ``resources/marks`` is picked up without a restart.
+
+The slot map (mark key -> slot) is read from ``hunting_marks`` once and kept.
+``render_marks_board`` itself is pure Pillow work with picklable arguments,
+so a miss can be rendered in the render pool.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable
+
+from PIL import ImageDraw, ImageFont
+
+from assets import assets
+from image_encode import EncodedImage, encode_image
+from singleflight import SingleFlight
+
+
+RES_MARKS_DIR = os.path.join("resources", "marks")
+BOARD_PATH = os.path.join(RES_MARKS_DIR, "board.png")
+EMPTY_BOARD_FONT = os.path.join("resources", "fonts", "Cinzel-Regular.ttf")
+EMPTY_BOARD_MESSAGE = "Your marks are earned through dedication, not disclosure."
+BOARD_CACHE_SIZE = int(os.getenv("MARKS_BOARD_CACHE_SIZE", "256"))
+
+MARK_SLOTS = {
+    0: (120, 140),
+    1: (320, 140),
+    2: (520, 140),
+    3: (720, 140),
+    4: (120, 340),
+    5: (320, 340),
+    6: (520, 340),
+    7: (720, 340),
+    8: (220, 540),
+    9: (620, 540),
+    10: (420, 540),  # hidden mark slot (example placement)
+}
+
+Badges = tuple[tuple[str, int], ...]
+
+
+def badge_path(key: str) -> str:
+    return os.path.join(RES_MARKS_DIR, f"{key}.png")
+
+
+def load_slot_map(conn: sqlite3.Connection) -> dict[str, int]:
+    return {key: slot for key, slot in conn.execute("SELECT key, slot_index FROM hunting_marks")}
+
+
+def board_badges(unlocked_keys: Iterable[str], slot_map: dict[str, int]) -> Badges:
+    """The (key, slot) pairs that land on the board, in slot order."""
+    badges = {(key, slot_map[key]) for key in unlocked_keys if slot_map.get(key) in MARK_SLOTS}
+    return tuple(sorted(badges, key=lambda badge: badge[1]))
+
+
+def _art_signature(badges: Badges) -> tuple:
+    signature = []
+    for path in (BOARD_PATH, *(badge_path(key) for key, _ in badges)):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def render_marks_board(badges: Badges) -> EncodedImage:
+    if not os.path.exists(BOARD_PATH):
+        raise FileNotFoundError("Missing resources/marks/board.png")
+
+    board = assets.canvas(BOARD_PATH)
+
+    # If nothing unlocked, add the single line of text
+    if not badges:
+        draw = ImageDraw.Draw(board)
+        font = assets.font(EMPTY_BOARD_FONT, 34) if os.path.exists(EMPTY_BOARD_FONT) else ImageFont.load_default()
+
+        # center it
+        w, h = board.size
+        tw, th = draw.textbbox((0, 0), EMPTY_BOARD_MESSAGE, font=font)[2:]
+        x = (w - tw) // 2
+        y = h - 120
+        # subtle outline for readability
+        for ox, oy in [(-2,0),(2,0),(0,-2),(0,2)]:
+            draw.text((x+ox, y+oy), EMPTY_BOARD_MESSAGE, font=font, fill="black")
+        draw.text((x, y), EMPTY_BOARD_MESSAGE, font=font, fill="white")
+    else:
+        # Draw unlocked badges at their slot indexes
+        for key, slot in badges:
+            path = badge_path(key)
+            if not os.path.exists(path):
+                # If badge missing, just skip (so you can add art later)
+                continue
+            board.alpha_composite(assets.image(path), dest=MARK_SLOTS[slot])
+
+    return encode_image(board)
+
+
+class MarksBoardCache:
+    def __init__(self, max_entries: int = BOARD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.slot_map: dict[str, int] | None = None
+        self._boards: OrderedDict[tuple, EncodedImage] = OrderedDict()
+        self._inflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        unlocked_keys: Iterable[str],
+        load_slots: Callable[[], Awaitable[dict[str, int]]],
+        render: Callable[..., Awaitable[EncodedImage]] | None = None,
+    ) -> EncodedImage:
+        """The encoded board for ``unlocked_keys``.
+
+        ``load_slots`` is awaited once to fill the slot map; ``render(fn, *args)``
+        runs a miss (e.g. ``render_pool.run``) and defaults to rendering inline.
+        """
+        if self.slot_map is None:
+            self.slot_map = await load_slots()
+
+        badges = board_badges(unlocked_keys, self.slot_map)
+        mask = 0
+        for _, slot in badges:
+            mask |= 1 << slot
+        key = (mask, _art_signature(badges))
+
+        board = self._boards.get(key)
+        if board is not None:
+            self.hits += 1
+            self._boards.move_to_end(key)
+            return board
+
+        if key not in self._inflight:
+            self.misses += 1
+        return await self._inflight.run(key, self._render, key, badges, render)
+
+    async def _render(self, key: tuple, badges: Badges, render) -> EncodedImage:
+        if render is None:
+            board = render_marks_board(badges)
+        else:
+            board = await render(render_marks_board, badges)
+        self._boards[key] = board
+        while len(self._boards) > self.max_entries:
+            self._boards.popitem(last=False)
+        return board
+
+    def clear(self) -> None:
+        self._boards.clear()
+        self.slot_map = None
+
+
+marks_boards = MarksBoardCache()
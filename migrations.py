@@ -0,0 +1,88 @@
+"""Versioned schema migrations for the Hunter's Ledger database.
+
+``init_schema`` in main.py creates the base tables; everything added after
+that lives here as a numbered step. The applied version is kept in
+``PRAGMA user_version`` so each step runs exactly once per database file.
+New steps are appended to ``MIGRATIONS`` and never edited once shipped.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable
+
+from backlog_keys import add_backlog_name_keys
+from hunt_stats import create_hunt_stats_tables, create_hunt_stats_triggers, rebuild_hunt_stats
+
+
+def _hot_lookup_indexes(conn: sqlite3.Connection) -> None:
+    # Next10 / A–Z pools, /starthunt and the card autocomplete list a user's
+    # games by status; game_name rides along so those reads never touch the table.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_solo_backlogs_user_status
+        ON solo_backlogs (user_id, status, game_name)
+    """)
+    # Hunter lookups by game (join/leave/who/call) and /mosthunted, /nothunted.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_user_games_game_user
+        ON user_games (game_id, user_id)
+    """)
+    # /showmyhunts, /showhunter and /forgethunter.
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_user_games_user
+        ON user_games (user_id, game_id)
+    """)
+    # Give the planner real statistics so it can choose between the
+    # solo_backlogs indexes per query.
+    conn.execute("ANALYZE")
+
+
+def _user_hunt_stats(conn: sqlite3.Connection) -> None:
+    # Rollup read by the marks evaluator, kept current by triggers; seeded
+    # from the existing backlog once here.
+    create_hunt_stats_tables(conn)
+    create_hunt_stats_triggers(conn)
+    rebuild_hunt_stats(conn)
+
+
+def _audit_log_columns(conn: sqlite3.Connection) -> None:
+    # log_command records who ran what and where; older files only have
+    # user, command and game_name.
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(logs)")}
+    if not existing:
+        # No logs table in this file (init_schema creates it with every column).
+        return
+    for column in ("user_id", "location", "extra"):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE logs ADD COLUMN {column} TEXT")
+
+
+def _solo_backlog_name_keys(conn: sqlite3.Connection) -> None:
+    # Goals match items to the backlog on this key instead of normalising
+    # every backlog row in Python.
+    add_backlog_name_keys(conn)
+
+
+# (version, step) pairs, applied in order.
+MIGRATIONS: list[tuple[int, Callable[[sqlite3.Connection], None]]] = [
+    (1, _hot_lookup_indexes),
+    (2, _user_hunt_stats),
+    (3, _audit_log_columns),
+    (4, _solo_backlog_name_keys),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Run every step newer than the file's ``user_version``; returns the new version."""
+    current = schema_version(conn)
+    for version, step in MIGRATIONS:
+        if version <= current:
+            continue
+        step(conn)
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        current = version
+    return current
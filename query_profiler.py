@@ -0,0 +1,242 @@
+"""Per-statement SQLite profiler with query fingerprints and captured plans.
+
+Every connection ``database.Database`` opens — the pools shared by main.py,
+the GoalSystem cog and the other cogs — is attached with sqlite's own hooks:
+
+* the trace callback reports each statement (with its parameters expanded)
+  as it starts. The statement's time runs until the next statement on that
+  connection or the end of the unit of work. That includes stepping through
+  its rows and any Python work between statements, and COMMIT shows up as a
+  statement of its own;
+* the progress handler ticks every ``PROGRESS_STEPS`` virtual-machine
+  instructions, which gives a CPU cost per statement that Python overhead
+  does not inflate.
+
+Statements are grouped by fingerprint: literals become ``?``, IN lists and
+multi-row VALUES collapse, whitespace is normalised. Each fingerprint keeps
+its count, total, max, VM steps and the text of its slowest run. The first
+time a fingerprint takes ``SLOW_QUERY_MS`` or longer, its ``EXPLAIN QUERY
+PLAN`` is captured on the same connection once the unit of work is done.
+The owner-only /slowqueries command dumps the top offenders.
+
+Profiling is off unless ``SQL_PROFILE=1``. It is not free: the trace
+callback is a Python call on every statement (and the parameter expansion
+and fingerprinting that go with it), and the progress handler is another
+every ``PROGRESS_STEPS`` instructions. Turn it on to hunt down a slow
+command, not as a permanent production setting.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+
+SQL_PROFILE = os.getenv("SQL_PROFILE", "0") == "1"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "50"))
+PROGRESS_STEPS = 1000
+MAX_FINGERPRINTS = 2000
+SAMPLE_SQL_CHARS = 2000
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_SPACE = re.compile(r"\s+")
+_COMMA = re.compile(r"\s*,\s*")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_ROWS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+
+_normalised: dict[str, str] = {}
+
+
+def fingerprint(sql: str) -> str:
+    """``sql`` with its literals replaced, so statements differing only in values group together."""
+    # One pass per statement; the rest depends only on the literal-free text,
+    # which repeats, so it is cached.
+    skeleton = _LITERAL.sub("?", sql)
+    text = _normalised.get(skeleton)
+    if text is None:
+        text = _COMMA.sub(", ", _SPACE.sub(" ", skeleton).strip())
+        text = _IN_LIST.sub("IN (?, …)", text)
+        text = _ROWS.sub(r"\1, …", text)
+        if len(_normalised) >= MAX_FINGERPRINTS * 4:
+            _normalised.clear()
+        _normalised[skeleton] = text
+    return text
+
+
+class QueryStats:
+    __slots__ = ("count", "total_s", "max_s", "vm_steps", "slowest_sql", "plan", "plan_pending")
+
+    def __init__(self):
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.vm_steps = 0
+        self.slowest_sql = ""
+        self.plan: str | None = None
+        self.plan_pending = False
+
+
+class _ConnectionState:
+    __slots__ = ("sql", "started", "ticks", "paused", "pending_plans")
+
+    def __init__(self):
+        self.sql: str | None = None
+        self.started = 0.0
+        self.ticks = 0
+        self.paused = False
+        self.pending_plans: list[tuple[str, str]] = []
+
+
+class QueryProfiler:
+    def __init__(self, *, slow_ms: float = SLOW_QUERY_MS, max_fingerprints: int = MAX_FINGERPRINTS):
+        self.slow_s = slow_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self.stats: dict[str, QueryStats] = {}
+        self.overflowed = 0
+        self._lock = threading.Lock()
+        self._states: dict[int, _ConnectionState] = {}
+        self.since = time.time()
+
+    def attach(self, conn: sqlite3.Connection) -> None:
+        state = self._states[id(conn)] = _ConnectionState()
+
+        def trace(sql: str) -> None:
+            if state.paused:
+                return
+            if sql == state.sql:
+                # Trigger programs are reported with their parent statement's text.
+                return
+            now = time.perf_counter()
+            self._close(state, now)
+            state.sql = sql
+            state.started = now
+
+        def progress() -> int:
+            state.ticks += 1
+            return 0
+
+        conn.set_trace_callback(trace)
+        conn.set_progress_handler(progress, PROGRESS_STEPS)
+
+    def begin(self, conn: sqlite3.Connection) -> None:
+        """Start of a unit of work: forget anything traced outside one."""
+        state = self._states.get(id(conn))
+        if state is not None:
+            state.sql = None
+            state.ticks = 0
+
+    def finish(self, conn: sqlite3.Connection) -> None:
+        """End of a unit of work: close the open statement and capture pending plans."""
+        state = self._states.get(id(conn))
+        if state is None:
+            return
+        self._close(state, time.perf_counter())
+        if state.pending_plans:
+            plans, state.pending_plans = state.pending_plans, []
+            state.paused = True
+            try:
+                for key, sql in plans:
+                    self._capture_plan(conn, key, sql)
+            finally:
+                state.paused = False
+
+    def _close(self, state: _ConnectionState, now: float) -> None:
+        sql = state.sql
+        if sql is None:
+            return
+        elapsed = now - state.started
+        steps = state.ticks * PROGRESS_STEPS
+        state.sql = None
+        state.ticks = 0
+
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                if len(self.stats) >= self.max_fingerprints:
+                    self.overflowed += 1
+                    return
+                stats = self.stats[key] = QueryStats()
+            stats.count += 1
+            stats.total_s += elapsed
+            stats.vm_steps += steps
+            if elapsed > stats.max_s:
+                stats.max_s = elapsed
+                stats.slowest_sql = sql[:SAMPLE_SQL_CHARS]
+            if (
+                elapsed >= self.slow_s
+                and stats.plan is None
+                and not stats.plan_pending
+                and sql.lstrip().upper().startswith(_EXPLAINABLE)
+            ):
+                stats.plan_pending = True
+                state.pending_plans.append((key, sql))
+
+    def _capture_plan(self, conn: sqlite3.Connection, key: str, sql: str) -> None:
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            plan = _format_plan((row[0], row[1], row[3]) for row in rows)
+        except sqlite3.Error as e:
+            plan = f"(plan unavailable: {e})"
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is not None:
+                stats.plan = plan
+                stats.plan_pending = False
+
+    def top(self, limit: int = 10, by: str = "total") -> list[tuple[str, QueryStats]]:
+        sort_key = {
+            "total": lambda item: item[1].total_s,
+            "max": lambda item: item[1].max_s,
+            "count": lambda item: item[1].count,
+            "steps": lambda item: item[1].vm_steps,
+        }[by]
+        with self._lock:
+            items = list(self.stats.items())
+        return sorted(items, key=sort_key, reverse=True)[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.overflowed = 0
+            self.since = time.time()
+
+
+def _format_plan(rows: Iterable[tuple[int, int, str]]) -> str:
+    depth: dict[int, int] = {0: -1}
+    lines = []
+    for node, parent, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return "\n".join(lines)
+
+
+def format_report(entries: list[tuple[str, QueryStats]], *, plans: bool = True, width: int | None = None) -> str:
+    """Plain-text dump of ``top()`` entries; ``plans`` adds the slowest text and the plan.
+
+    ``width`` truncates each fingerprint, for chat-sized summaries.
+    """
+    blocks = []
+    for rank, (key, s) in enumerate(entries, 1):
+        avg_ms = s.total_s / s.count * 1000 if s.count else 0.0
+        block = [
+            f"#{rank}  {s.count:,} runs  total {s.total_s * 1000:,.1f} ms  avg {avg_ms:,.2f} ms  "
+            f"max {s.max_s * 1000:,.1f} ms  ~{s.vm_steps:,} vm steps",
+            f"    {key if width is None or len(key) <= width else key[:width] + '…'}",
+        ]
+        if plans:
+            block.append(f"    slowest: {s.slowest_sql}")
+            if s.plan:
+                block.append("    plan:")
+                block.extend(f"      {line}" for line in s.plan.splitlines())
+        blocks.append("\n".join(block))
+    return "\n\n".join(blocks) if blocks else "No statements recorded yet."
+
+
+profiler = QueryProfiler()
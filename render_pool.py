@@ -0,0 +1,175 @@
+"""Process pool for CPU-heavy image rendering.
+
+Pillow work holds the GIL for long stretches, so running it on the event loop
+(or in a thread) stalls every other command. ``RenderPool`` sends render jobs
+to worker processes instead, with:
+
+* a concurrency limit (one job per worker at a time),
+* a bounded queue — once ``max_pending`` jobs are waiting or running, new
+  ones fail fast with ``RenderBusy`` instead of piling up,
+* a per-job timeout. The caller stops waiting, but the job keeps its worker
+  slot until the worker is actually free again, so a slow job can't let
+  more renders in than there are workers,
+* ``RenderMetrics`` for queue depth and render time.
+
+Workers are forked so they inherit the already-decoded assets without
+re-running the bot's main script (which spawn/forkserver would import).
+Forking a process that has threads running can leave a child holding a lock
+it can never release, so the bot calls ``start`` at import time, before the
+database, audit and monitor threads exist; the pool forks every worker
+up front and never forks again.
+
+Render functions must be importable top-level callables that take and return
+picklable values.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, TypeVar
+
+
+T = TypeVar("T")
+
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_MAX_PENDING = int(os.getenv("RENDER_MAX_PENDING", "16"))
+RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "20"))
+
+
+class RenderBusy(Exception):
+    """The render queue is full; the caller should ask the user to retry."""
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class RenderMetrics:
+    def __init__(self, window: int = 256):
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.render_ms: deque[float] = deque(maxlen=window)
+        self.wait_ms: deque[float] = deque(maxlen=window)
+
+    def snapshot(self) -> dict[str, Any]:
+        render = sorted(self.render_ms)
+        wait = sorted(self.wait_ms)
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "render_p50_ms": _percentile(render, 50),
+            "render_p95_ms": _percentile(render, 95),
+            "render_max_ms": render[-1] if render else 0.0,
+            "wait_p95_ms": _percentile(wait, 95),
+        }
+
+
+class RenderPool:
+    def __init__(
+        self,
+        *,
+        workers: int = RENDER_WORKERS,
+        max_pending: int = RENDER_MAX_PENDING,
+        timeout: float = RENDER_TIMEOUT_SECONDS,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.timeout = timeout
+        self.metrics = RenderMetrics()
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(self.workers)
+        self._pending = 0
+
+    def start(self) -> None:
+        """Fork every worker now; call it before the process starts any other thread."""
+        if threading.active_count() > 1:
+            print(f"RenderPool: forking workers with {threading.active_count()} threads running")
+        # With fork, the executor launches all of its workers on the first
+        # submit rather than one per job.
+        self._pool().submit(os.getpid).result()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Created on first use unless start() ran (benchmarks, tools).
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+        return self._executor
+
+    def _job_finished(self, _future: asyncio.Future | None) -> None:
+        self.metrics.running -= 1
+        self._slots.release()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in a worker; raises RenderBusy, TimeoutError or the job's error."""
+        metrics = self.metrics
+        if self._pending >= self.max_pending:
+            metrics.rejected += 1
+            raise RenderBusy(f"{self._pending} renders already queued")
+
+        self._pending += 1
+        metrics.queue_depth += 1
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+        queued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            # Cancelled before a worker slot freed up.
+            self._pending -= 1
+            metrics.queue_depth -= 1
+            raise
+        try:
+            metrics.queue_depth -= 1
+            metrics.running += 1
+            started = time.perf_counter()
+            metrics.wait_ms.append((started - queued_at) * 1000)
+            try:
+                job = asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+            except BaseException:
+                self._job_finished(None)
+                raise
+            # The slot is released when the worker finishes the job, not when
+            # the caller gives up on it (timeout or cancellation).
+            job.add_done_callback(self._job_finished)
+            try:
+                result = await asyncio.wait_for(asyncio.shield(job), self.timeout)
+            except asyncio.TimeoutError:
+                metrics.timed_out += 1
+                raise
+            except Exception:
+                metrics.failed += 1
+                raise
+            metrics.completed += 1
+            metrics.render_ms.append((time.perf_counter() - started) * 1000)
+            return result
+        finally:
+            self._pending -= 1
+
+    def close(self) -> None:
+        if self._executor is not None:
+            # wait=True: a non-waiting shutdown leaves the executor's wakeup
+            # pipe for the interpreter's exit hook, which then writes to it
+            # after it has been closed. Queued jobs are cancelled, so this
+            # only waits for renders already running.
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
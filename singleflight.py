@@ -0,0 +1,45 @@
+"""Collapse concurrent async calls for the same key into one.
+
+Used by the cover and avatar caches so that several cards asking for the same
+download at once share a single fetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: Hashable, fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """Await ``fn(*args)``, or the call already in flight for ``key``."""
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # shield: one waiter being cancelled must not cancel the fetch.
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn(*args)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters see the error; don't warn about it being unretrieved.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
@@ -0,0 +1,47 @@
+"""SteamGridDB cover lookups over the shared async HTTP client.
+
+The lookups return None only when SteamGridDB answered and has nothing for
+the game. A failed request (network error, timeout, 401 without an API key,
+429, 5xx) raises ``FetchError`` instead, so callers don't mistake it for
+"no cover".
+"""
+
+from __future__ import annotations
+
+from urllib.parse import quote
+
+from web_client import get_json
+
+
+API_ROOT = "https://www.steamgriddb.com/api/v2"
+COVER_DIMENSIONS = "600x900"
+
+
+def _headers(api_key: str | None) -> dict[str, str]:
+    return {"Authorization": f"Bearer {api_key}"}
+
+
+async def search_game_id(game_name: str, api_key: str | None) -> int | None:
+    """SteamGridDB id of the best autocomplete match for ``game_name``."""
+    search = await get_json(f"{API_ROOT}/search/autocomplete/{quote(game_name, safe='')}", _headers(api_key))
+    if not search or not search.get("data"):
+        print(f"Game '{game_name}' not found on SteamGridDB.")
+        return None
+    return search["data"][0]["id"]
+
+
+async def fetch_grid_url(game_id: int, api_key: str | None) -> str | None:
+    """URL of the first 600x900 grid for a SteamGridDB game id."""
+    grids = await get_json(f"{API_ROOT}/grids/game/{game_id}?dimensions={COVER_DIMENSIONS}", _headers(api_key))
+    if not grids or not grids.get("data"):
+        print(f"No {COVER_DIMENSIONS} images found for SteamGridDB game {game_id}.")
+        return None
+    return grids["data"][0]["url"]
+
+
+async def fetch_steamgriddb_cover(game_name: str, api_key: str | None) -> str | None:
+    """Fetch a 600x900 game cover URL from SteamGridDB; raises FetchError if a request fails."""
+    game_id = await search_game_id(game_name, api_key)
+    if game_id is None:
+        return None
+    return await fetch_grid_url(game_id, api_key)
@@ -0,0 +1,73 @@
+"""Outlined text and font fitting for the card renderers.
+
+The old outline drew the string once per offset in a (2t+1)² square around
+the position — 48 full rasterisations at the default thickness of 3 — and
+the title font was fitted by reloading the TrueType file at every 2px step.
+
+``draw_outlined_text`` rasterises the glyphs once into a tight mask, dilates
+it with a (2t+1)² max filter (the same square footprint the offset loop
+covered), pastes the outline colour through that, then draws the fill on
+top. The masks are memoised per (text, font, thickness), since the same
+user name and date recur across cards.
+
+``fit_font`` keeps the old step-down rule (base size, then -2px while too
+wide, stopping at ``min_size``) but binary-searches those sizes, with fonts
+coming from the shared asset registry.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageFont
+
+from assets import assets
+
+
+def text_width(text: str, font: ImageFont.FreeTypeFont) -> int:
+    left, _, right, _ = font.getbbox(text)
+    return right - left
+
+
+def fit_font(
+    text: str,
+    font_path: str,
+    base_size: int,
+    max_width: int,
+    *,
+    min_size: int = 40,
+    step: int = 2,
+) -> tuple[ImageFont.FreeTypeFont, int]:
+    """Largest font of base_size, base_size-step, ... that fits max_width (else the smallest tried)."""
+    sizes = [base_size]
+    while sizes[-1] > min_size:
+        sizes.append(sizes[-1] - step)
+
+    # sizes is descending and width grows with size: find the first that fits.
+    lo, hi = 0, len(sizes) - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if text_width(text, assets.font(font_path, sizes[mid])) <= max_width:
+            hi = mid
+        else:
+            lo = mid + 1
+    return assets.font(font_path, sizes[lo]), sizes[lo]
+
+
+@lru_cache(maxsize=256)
+def _outline_masks(text: str, font: ImageFont.FreeTypeFont, thickness: int) -> tuple[Image.Image, tuple[int, int]]:
+    left, top, right, bottom = font.getbbox(text)
+    pad = thickness
+    glyphs = Image.new("L", (right - left + 2 * pad, bottom - top + 2 * pad), 0)
+    ImageDraw.Draw(glyphs).text((pad - left, pad - top), text, font=font, fill=255)
+    outline = glyphs.filter(ImageFilter.MaxFilter(2 * thickness + 1)) if thickness else glyphs
+    return outline, (left - pad, top - pad)
+
+
+def draw_outlined_text(image, draw, position, text, font, fill="white", outline="black", outline_thickness=3):
+    """Draw text with an outline for visibility; ``draw`` must be drawing on ``image``."""
+    x, y = position
+    if text:
+        mask, (dx, dy) = _outline_masks(text, font, outline_thickness)
+        image.paste(ImageColor.getcolor(outline, image.mode), (x + dx, y + dy), mask)
+    draw.text(position, text, font=font, fill=fill)
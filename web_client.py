@@ -0,0 +1,75 @@
+"""Shared async HTTP client.
+
+One ``aiohttp`` session (and so one connection pool with keep-alive) serves
+every outbound request the bot makes outside discord.py itself: avatars,
+SteamGridDB lookups and cover downloads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import aiohttp
+
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5)
+MAX_CONNECTIONS = 20
+
+_session: aiohttp.ClientSession | None = None
+
+
+class FetchError(Exception):
+    """A request that got no usable answer: a transport failure or a non-200 status."""
+
+    def __init__(self, url: str, status: int | None = None, reason: str = ""):
+        super().__init__(f"{url}: {status if status is not None else reason}")
+        self.url = url
+        self.status = status
+
+
+def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            timeout=REQUEST_TIMEOUT,
+            connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS, ttl_dns_cache=300),
+        )
+    return _session
+
+
+async def fetch_bytes(url: str, headers: dict[str, str] | None = None) -> bytes | None:
+    """Body of a 200 response, or None for any other status."""
+    async with get_session().get(url, headers=headers) as response:
+        if response.status != 200:
+            return None
+        return await response.read()
+
+
+async def get_json(url: str, headers: dict[str, str] | None = None) -> Any:
+    """Decoded body of a 200 response; raises FetchError for anything else."""
+    try:
+        async with get_session().get(url, headers=headers) as response:
+            if response.status != 200:
+                raise FetchError(url, response.status)
+            return await response.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        raise FetchError(url, reason=repr(e)) from e
+
+
+async def get_bytes(url: str, headers: dict[str, str] | None = None) -> bytes:
+    """Body of a 200 response; raises FetchError for anything else."""
+    try:
+        async with get_session().get(url, headers=headers) as response:
+            if response.status != 200:
+                raise FetchError(url, response.status)
+            return await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise FetchError(url, reason=repr(e)) from e
+
+
+async def close_session() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None